@@ -0,0 +1,184 @@
+"""Token budget for the messages sent to the LLM."""
+
+import json
+from collections import OrderedDict
+from typing import Any
+
+from loguru import logger
+
+DEFAULT_CONTEXT_WINDOW = 32_768  # Used when the model's limit is unknown
+_MESSAGE_OVERHEAD = 4  # Role/formatting tokens per message
+_IMAGE_TOKENS = 1_000  # Rough cost of an inline image
+_HEAD_MESSAGES = 2  # History messages kept before the elided middle (the first exchange)
+
+
+class ContextBudget:
+    """
+    Keeps LLM requests within the model's context window.
+
+    Token counts are cached per text, so re-checking the growing message list
+    on every tool iteration only tokenizes messages that are new. Tool
+    outputs larger than ``max_tool_result_tokens`` are clipped (head + tail)
+    when they are added. If a request is still over budget, ``fit`` applies
+    these policies in order until it fits:
+
+    1. Replace tool results from earlier iterations with a short placeholder,
+       oldest first.
+    2. Elide the middle of the conversation history, keeping the first
+       exchange and the most recent messages.
+
+    ``fit`` returns a trimmed copy and leaves the original list untouched,
+    so the same messages trim the same way on every iteration.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        context_window: int | None = None,
+        reserve_tokens: int = 4096,
+        max_tool_result_tokens: int = 4000,
+        cache_size: int = 4096,
+    ):
+        self.model = model
+        self.context_window = context_window or self._lookup_context_window(model)
+        self.reserve_tokens = reserve_tokens
+        self.max_tool_result_tokens = max_tool_result_tokens
+        self._cache_size = cache_size
+        self._counts: OrderedDict[str, int] = OrderedDict()
+
+    @staticmethod
+    def _lookup_context_window(model: str) -> int:
+        """Input token limit from LiteLLM's model metadata."""
+        try:
+            import litellm
+            info = litellm.get_model_info(model)
+            return int(info.get("max_input_tokens") or info.get("max_tokens") or DEFAULT_CONTEXT_WINDOW)
+        except Exception:
+            logger.debug(f"Unknown context window for {model}, assuming {DEFAULT_CONTEXT_WINDOW} tokens")
+            return DEFAULT_CONTEXT_WINDOW
+
+    @property
+    def limit(self) -> int:
+        """Tokens available for the prompt (context window minus the completion reserve)."""
+        return max(1024, self.context_window - self.reserve_tokens)
+
+    def count_text(self, text: str) -> int:
+        """Token count of a text, cached (str hashes are memoized, so lookups are cheap)."""
+        if not text:
+            return 0
+        count = self._counts.get(text)
+        if count is not None:
+            self._counts.move_to_end(text)
+            return count
+        try:
+            import litellm
+            count = litellm.token_counter(model=self.model, text=text)
+        except Exception:
+            count = len(text) // 4 + 1
+        self._counts[text] = count
+        if len(self._counts) > self._cache_size:
+            self._counts.popitem(last=False)
+        return count
+
+    def count_message(self, msg: dict[str, Any]) -> int:
+        tokens = _MESSAGE_OVERHEAD
+        content = msg.get("content")
+        if isinstance(content, str):
+            tokens += self.count_text(content)
+        elif isinstance(content, list):
+            for block in content:
+                if block.get("type") == "text":
+                    tokens += self.count_text(block.get("text", ""))
+                else:
+                    tokens += _IMAGE_TOKENS
+        if msg.get("tool_calls"):
+            tokens += self.count_text(json.dumps(msg["tool_calls"]))
+        if msg.get("reasoning_content"):
+            tokens += self.count_text(msg["reasoning_content"])
+        return tokens
+
+    def count(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None) -> int:
+        """Approximate prompt tokens of a request."""
+        total = sum(self.count_message(m) for m in messages)
+        if tools:
+            total += self.count_text(json.dumps(tools))
+        return total
+
+    def clip_tool_result(self, text: str) -> str:
+        """Clip a tool output to max_tool_result_tokens, keeping its head and tail."""
+        tokens = self.count_text(text)
+        if tokens <= self.max_tool_result_tokens:
+            return text
+        keep = int(len(text) * self.max_tool_result_tokens / tokens)
+        head = keep * 2 // 3
+        tail = keep - head
+        return f"{text[:head]}\n\n... ({tokens - self.max_tool_result_tokens} tokens truncated) ...\n\n{text[-tail:]}"
+
+    def fit(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        turn_start: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return messages trimmed to fit the budget (the input itself if it already fits).
+
+        Args:
+            messages: Full message list (system prompt first).
+            tools: Tool definitions sent with the request.
+            turn_start: Index of the current user message; history before it
+                may be elided. Defaults to the last user message.
+        """
+        total = self.count(messages, tools)
+        if total <= self.limit:
+            return messages
+
+        result = list(messages)
+        if turn_start is None:
+            turn_start = next((i for i in range(len(result) - 1, -1, -1) if result[i].get("role") == "user"), 0)
+        last_assistant = next(
+            (i for i in range(len(result) - 1, -1, -1) if result[i].get("role") == "assistant"), -1
+        )
+
+        # 1. Tool results from earlier iterations
+        for i in range(len(result)):
+            if total <= self.limit:
+                break
+            msg = result[i]
+            if msg.get("role") != "tool" or i >= last_assistant:
+                continue
+            before = self.count_message(msg)
+            placeholder = {**msg, "content": f"[{msg.get('name', 'tool')} result omitted to fit the context window]"}
+            after = self.count_message(placeholder)
+            if after < before:
+                result[i] = placeholder
+                total -= before - after
+
+        # 2. Middle of the history (between the first exchange and the current turn)
+        first = 1 if result and result[0].get("role") == "system" else 0
+        start = min(first + _HEAD_MESSAGES, turn_start)
+        end = start
+        note_tokens = self.count_text(_elision_note(len(result)))  # upper bound for the note added below
+        while end < turn_start and total + note_tokens > self.limit:
+            total -= self.count_message(result[end])
+            end += 1
+        if end > start:
+            # Resume at a user message so roles keep alternating
+            while end < turn_start and result[end].get("role") != "user":
+                total -= self.count_message(result[end])
+                end += 1
+            dropped = end - start
+            if end < len(result) and isinstance(result[end].get("content"), str):
+                note = _elision_note(dropped)
+                result[end] = {**result[end], "content": note + result[end]["content"]}
+                total += self.count_text(note)
+            result = result[:start] + result[end:]
+            logger.info(f"Context budget: elided {dropped} history messages ({self.limit} token limit)")
+
+        if total > self.limit:
+            logger.warning(f"Request still exceeds the context budget after trimming ({total} > {self.limit} tokens)")
+        return result
+
+
+def _elision_note(dropped: int) -> str:
+    return f"[{dropped} earlier messages omitted to fit the context window]\n\n"
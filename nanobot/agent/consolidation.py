@@ -0,0 +1,80 @@
+"""Scheduling of background memory consolidation."""
+
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+Job = Callable[[], Awaitable[None]]
+
+
+class ConsolidationScheduler:
+    """
+    Runs memory consolidation jobs with at most one in flight per session.
+
+    ``request`` is for the per-message trigger: the job starts after
+    ``debounce`` seconds, and further requests for the same session before
+    it starts are folded into that run (the job reads the session when it
+    starts, so it picks up every message that arrived meanwhile). A request
+    made while a job is running waits for it, so consolidations of one
+    session never overlap. ``submit`` queues a job without debouncing or
+    folding (e.g. archiving a conversation on /new).
+    """
+
+    def __init__(self, debounce: float = 5.0):
+        self.debounce = debounce
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refs: dict[str, int] = {}
+        self._waiting: dict[str, Job] = {}  # Debounced job per session that has not started yet
+        self._tasks: set[asyncio.Task] = set()
+        self.runs = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    def request(self, key: str, job: Job) -> None:
+        """Schedule a debounced consolidation for ``key`` (folded into one already waiting)."""
+        folded = key in self._waiting
+        self._waiting[key] = job
+        if not folded:
+            self._spawn(key, self._debounced(key))
+
+    def submit(self, key: str, job: Job) -> None:
+        """Run ``job`` as soon as no other consolidation of ``key`` is in flight."""
+        self._spawn(key, self._locked(key, job))
+
+    def _spawn(self, key: str, coro: Awaitable[None]) -> None:
+        self._refs[key] = self._refs.get(key, 0) + 1
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(lambda t: self._done(key, t))
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._refs[key] -= 1
+        if not self._refs[key]:
+            del self._refs[key]
+            self._locks.pop(key, None)
+
+    async def _debounced(self, key: str) -> None:
+        await asyncio.sleep(self.debounce)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            job = self._waiting.pop(key)  # Later requests start a new debounce window
+            await self._run(key, job)
+
+    async def _locked(self, key: str, job: Job) -> None:
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            await self._run(key, job)
+
+    async def _run(self, key: str, job: Job) -> None:
+        self.runs += 1
+        try:
+            await job()
+        except Exception as e:
+            logger.error(f"Memory consolidation for {key} failed: {e}")
+
+    async def drain(self) -> None:
+        """Wait for every scheduled job (shutdown, tests)."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
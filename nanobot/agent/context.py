@@ -1,5 +1,6 @@
 """Context builder for assembling agent prompts."""
 
+import asyncio
 import base64
 import mimetypes
 import platform
@@ -13,6 +14,8 @@ from nanobot.agent.skills import SkillsLoader
 from nanobot.config.loader import load_config
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.prompt_library import PromptLibrary
+from nanobot.utils.helpers import file_signature
+from nanobot.utils.tracing import get_tracer
 from loguru import logger
 
 
@@ -22,12 +25,21 @@ class ContextBuilder:
     
     Assembles bootstrap files, memory, skills, and conversation history
     into a coherent prompt for the LLM.
+
+    With ``prompt_layout="cache"`` content is ordered from most stable to
+    most volatile so providers can cache the prompt prefix: the system
+    message is a list of text blocks (identity + bootstrap + skills, then
+    memory), and the current time and session info are appended to the
+    current user message instead of sitting at the top of the prompt.
+    The default ``prompt_layout="classic"`` keeps a single system prompt
+    string.
     """
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path, memory):
+    def __init__(self, workspace: Path, memory, prompt_layout: str = "classic"):
         self.workspace = workspace
+        self.prompt_layout = prompt_layout
         self.config = load_config()
         
         
@@ -37,34 +49,65 @@ class ContextBuilder:
 
         self.prompt_library = PromptLibrary(workspace)
 
+        self._bootstrap: tuple[tuple, str] | None = None  # (file signatures, rendered section)
+
     
-    def build_system_prompt(self, skill_names: list[str] | None = None, query : str | None = None) -> str:
+    async def build_system_prompt(self, skill_names: list[str] | None = None, query : str | None = None) -> str:
         """
         Build the system prompt from bootstrap files, memory, and skills.
         
         Args:
             skill_names: Optional list of skills to include.
+            query: Current user message, used to retrieve relevant memory.
         
         Returns:
             Complete system prompt.
         """
-        parts = []
-        
-        # Core identity
-        parts.append(self._get_identity())
-        
-        # Bootstrap files
-        bootstrap = self._load_bootstrap_files()
-        if bootstrap:
-            parts.append(bootstrap)
-        
+        memory_task = await self._start_memory_fetch(query)
+        parts = [self._get_identity(), *self._bootstrap_parts()]
+        skills = self._skills_parts()
+
         # Memory context now uses supermemory for enhanced capabilities
         # Add current query to memory for context
-
-        memory = self.memory.get_context(query=query)
+        memory = await memory_task
         if memory:
-            parts.append(f"# Memory\n\n{memory}")
-                        
+            parts.append(memory)
+        
+        parts.extend(skills)
+        return "\n\n---\n\n".join(parts)
+
+    async def build_system_blocks(self, query: str | None = None) -> list[str]:
+        """
+        Build the system prompt as [stable prefix, memory] for the cache layout.
+
+        The prefix (identity without the clock, bootstrap files, skills) only
+        changes when workspace files change; memory follows it so a memory
+        update does not invalidate the cached prefix.
+        """
+        memory_task = await self._start_memory_fetch(query)
+        stable = "\n\n---\n\n".join(
+            [self._get_identity(with_time=False), *self._bootstrap_parts(), *self._skills_parts()]
+        )
+        memory = await memory_task
+        return [stable, memory] if memory else [stable]
+
+    def _bootstrap_parts(self) -> list[str]:
+        bootstrap = self._load_bootstrap_files()
+        return [bootstrap] if bootstrap else []
+
+    async def _start_memory_fetch(self, query: str | None) -> asyncio.Task[str]:
+        """Start retrieving memory so a remote backend's round-trip overlaps the rest of prompt assembly."""
+        task = asyncio.ensure_future(self._memory_section(query))
+        await asyncio.sleep(0)  # Let the fetch issue its request before the caller's synchronous work
+        return task
+
+    async def _memory_section(self, query: str | None) -> str:
+        with get_tracer().span("memory_fetch", backend=type(self.memory).__name__):
+            memory = await self.memory.get_context(query=query)
+        return f"# Memory\n\n{memory}" if memory else ""
+
+    def _skills_parts(self) -> list[str]:
+        parts = []
         # Skills - progressive loading
         # 1. Always-loaded skills: include full content
         always_skills = self.skills.get_always_skills()
@@ -77,14 +120,16 @@ class ContextBuilder:
         skills_summary = self.skills.build_skills_summary()
         if skills_summary:
             parts.append(self.prompt_library.skill_prompt(skills_summary))
-        
-        return "\n\n---\n\n".join(parts)
+        return parts
+
+    @staticmethod
+    def _current_time() -> tuple[str, str]:
+        return datetime.now().strftime("%Y-%m-%d %H:%M (%A)"), _time.strftime("%Z") or "UTC"
     
-    def _get_identity(self) -> str:
+    def _get_identity(self, with_time: bool = True) -> str:
         """Get the core identity section."""
 
-        now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        tz = _time.strftime("%Z") or "UTC"
+        now, tz = self._current_time() if with_time else (None, None)
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
@@ -97,18 +142,24 @@ class ContextBuilder:
         return self.prompt_library.build_identity_prompt(now, tz, runtime)
 
     def _load_bootstrap_files(self) -> str:
-        """Load all bootstrap files from workspace."""
+        """Load all bootstrap files from workspace (re-read only when one changed on disk)."""
+        signatures = tuple(file_signature(self.workspace / f) for f in self.BOOTSTRAP_FILES)
+        if self._bootstrap and self._bootstrap[0] == signatures:
+            return self._bootstrap[1]
+
         parts = []
         
-        for filename in self.BOOTSTRAP_FILES:
+        for filename, sig in zip(self.BOOTSTRAP_FILES, signatures):
             file_path = self.workspace / filename
-            if file_path.exists():
+            if sig is not None:
                 content = file_path.read_text(encoding="utf-8")
                 parts.append(f"## {filename}\n\n{content}")
         
-        return "\n\n".join(parts) if parts else ""
+        bootstrap = "\n\n".join(parts) if parts else ""
+        self._bootstrap = (signatures, bootstrap)
+        return bootstrap
     
-    def build_messages(
+    async def build_messages(
         self,
         history: list[dict[str, Any]],
         current_message: str,
@@ -133,21 +184,37 @@ class ContextBuilder:
         """
         messages = []
 
-        # System prompt
-        system_prompt = self.build_system_prompt(skill_names, query=current_message)
-        if channel and chat_id:
-            system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
-        messages.append({"role": "system", "content": system_prompt})
+        session_info = f"## Current Session\nChannel: {channel}\nChat ID: {chat_id}" if channel and chat_id else ""
+
+        # Current message (with optional image attachments)
+        user_content = self._build_user_content(current_message, media)
+
+        if self.prompt_layout == "cache":
+            blocks = await self.build_system_blocks(query=current_message)
+            messages.append({"role": "system", "content": [{"type": "text", "text": b} for b in blocks]})
+            now, tz = self._current_time()
+            runtime = "\n\n".join(p for p in (f"## Current Time\n{now} ({tz})", session_info) if p)
+            user_content = self._append_text(user_content, runtime)
+        else:
+            system_prompt = await self.build_system_prompt(skill_names, query=current_message)
+            if session_info:
+                system_prompt += f"\n\n{session_info}"
+            messages.append({"role": "system", "content": system_prompt})
 
         # History
         messages.extend(history)
 
-        # Current message (with optional image attachments)
-        user_content = self._build_user_content(current_message, media)
         messages.append({"role": "user", "content": user_content})
 
         return messages
 
+    @staticmethod
+    def _append_text(content: str | list[dict[str, Any]], text: str) -> str | list[dict[str, Any]]:
+        """Append a trailing text section to user content (plain string or content blocks)."""
+        if isinstance(content, str):
+            return f"{content}\n\n---\n\n{text}"
+        return content + [{"type": "text", "text": text}]
+
     def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
         """Build user message content with optional base64-encoded images."""
         if not media:
@@ -1,32 +1,46 @@
 """Agent loop: the core processing engine."""
 
 import asyncio
-from contextlib import AsyncExitStack
-import inspect
+from contextlib import AsyncExitStack, asynccontextmanager
 import json
 import json_repair
+import time
+import uuid
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.cache import CachingProvider, force_response_cache
+from nanobot.providers.router import RoutingProvider
+from nanobot.providers.scheduler import Priority, ProviderScheduler, llm_priority, set_priority
+from nanobot.agent.budget import ContextBudget
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.search import SearchFilesTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.web_cache import WebCache
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.subagent import SubagentManager
 from nanobot.session.manager import Session, SessionManager
 from nanobot.agent.memory import MemoryStore
+from nanobot.agent.consolidation import ConsolidationScheduler
 from nanobot.config import load_config
+from nanobot.utils.http import get_http_pool
+from nanobot.utils.tracing import current_span, detach_span, get_tracer
 from nanobot.agent.prompt_library import PromptLibrary
 
+if TYPE_CHECKING:
+    from nanobot.config.schema import ExecToolConfig, MemoryConfig, WebFetchConfig
+    from nanobot.cron.service import CronService
+
 class AgentLoop:
     """
     The agent loop is the core processing engine.
@@ -51,12 +65,23 @@ class AgentLoop:
         memory_window: int = 50,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
+        web_fetch_config: "WebFetchConfig | None" = None,
+        web_cache: WebCache | None = None,
         cron_service: "CronService | None" = None,
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
         mcp_servers: dict | None = None,
+        max_concurrency: int = 4,
+        max_parallel_tools: int = 4,
+        stream: bool = False,
+        stream_interval: float = 1.0,
+        prompt_layout: str = "classic",
+        context_window_tokens: int | None = None,
+        max_tool_result_tokens: int = 4000,
+        memory_config: "MemoryConfig | None" = None,
+        consolidation_debounce: float = 5.0,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, MemoryConfig, WebFetchConfig
         from nanobot.cron.service import CronService
         self.bus = bus
         self.provider = provider
@@ -68,16 +93,29 @@ class AgentLoop:
         self.memory_window = memory_window
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.web_cache = web_cache
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_parallel_tools = max_parallel_tools
+        self.stream = stream
+        self.stream_interval = stream_interval
 
         if load_config().supermemory.api_key:
             from nanobot.agent.super_memory import SupermemoryStore
             self.memory = SupermemoryStore(workspace)
         else:
-            self.memory = MemoryStore(workspace)
-
-        self.context = ContextBuilder(workspace, self.memory)
+            self.memory = self._make_local_memory(workspace, memory_config or MemoryConfig())
+
+        self.context = ContextBuilder(workspace, self.memory, prompt_layout=prompt_layout)
+        self.consolidation = ConsolidationScheduler(debounce=consolidation_debounce)
+        self.budget = ContextBudget(
+            self.model,
+            context_window=context_window_tokens,
+            reserve_tokens=max_tokens,
+            max_tool_result_tokens=max_tool_result_tokens,
+        )
         self.sessions = session_manager or SessionManager(workspace)
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
@@ -89,7 +127,11 @@ class AgentLoop:
             max_tokens=self.max_tokens,
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
+            web_fetch_config=self.web_fetch_config,
+            web_cache=web_cache,
             restrict_to_workspace=restrict_to_workspace,
+            max_parallel_tools=max_parallel_tools,
+            budget=self.budget,
         )
         
         
@@ -97,9 +139,27 @@ class AgentLoop:
         self._mcp_servers = mcp_servers or {}
         self._mcp_stack: AsyncExitStack | None = None
         self._mcp_connected = False
+        self._memory_worker_started = False
+        # Worker pool: different sessions run in parallel, same session stays ordered
+        self._concurrency = asyncio.Semaphore(self.max_concurrency)
+        self._session_locks: dict[str, asyncio.Lock] = {}
+        self._session_pending: dict[str, int] = {}
+        self._active_tasks: set[asyncio.Task[None]] = set()
         self.prompt_library = PromptLibrary(workspace)
         self._register_default_tools()
     
+    @staticmethod
+    def _make_local_memory(workspace: Path, config: "MemoryConfig") -> MemoryStore:
+        if config.backend == "vector":
+            from nanobot.agent.vector_memory import HashingEmbedder, VectorMemoryStore
+            return VectorMemoryStore(
+                workspace,
+                embedder=HashingEmbedder(config.embedding_dim),
+                top_k=config.top_k,
+                max_chunk_chars=config.max_chunk_chars,
+            )
+        return MemoryStore(workspace)
+
     def _register_default_tools(self) -> None:
         """Register the default set of tools."""
         # File tools (restrict to workspace if configured)
@@ -108,17 +168,27 @@ class AgentLoop:
         self.tools.register(WriteFileTool(allowed_dir=allowed_dir))
         self.tools.register(EditFileTool(allowed_dir=allowed_dir))
         self.tools.register(ListDirTool(allowed_dir=allowed_dir))
+        self.tools.register(SearchFilesTool(workspace=self.workspace, allowed_dir=allowed_dir))
         
         # Shell tool
         self.tools.register(ExecTool(
             working_dir=str(self.workspace),
             timeout=self.exec_config.timeout,
             restrict_to_workspace=self.restrict_to_workspace,
+            max_output_bytes=self.exec_config.max_output_bytes,
+            kill_after_bytes=self.exec_config.kill_after_bytes,
+            persistent=self.exec_config.persistent,
+            max_shells=self.exec_config.max_shells,
+            shell_idle_timeout=self.exec_config.shell_idle_timeout,
         ))
         
         # Web tools
-        self.tools.register(WebSearchTool(api_key=self.brave_api_key))
-        self.tools.register(WebFetchTool())
+        self.tools.register(WebSearchTool(api_key=self.brave_api_key, cache=self.web_cache))
+        self.tools.register(WebFetchTool(
+            cache=self.web_cache,
+            max_bytes=self.web_fetch_config.max_bytes,
+            extract_timeout=self.web_fetch_config.extract_timeout,
+        ))
         
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
@@ -132,6 +202,13 @@ class AgentLoop:
         if self.cron_service:
             self.tools.register(CronTool(self.cron_service))
     
+    def _start_memory_worker(self) -> None:
+        """Start background replay of queued memory uploads (Supermemory backend only)."""
+        start = getattr(self.memory, "start", None)
+        if start is not None and not self._memory_worker_started:
+            self._memory_worker_started = True
+            start()
+
     async def _connect_mcp(self) -> None:
         """Connect to configured MCP servers (one-time, lazy)."""
         if self._mcp_connected or not self._mcp_servers:
@@ -142,7 +219,7 @@ class AgentLoop:
         await self._mcp_stack.__aenter__()
         await connect_mcp_servers(self._mcp_servers, self.tools, self._mcp_stack)
 
-    def _set_tool_context(self, channel: str, chat_id: str) -> None:
+    def _set_tool_context(self, channel: str, chat_id: str, session_key: str | None = None) -> None:
         """Update context for all tools that need routing info."""
         if message_tool := self.tools.get("message"):
             if isinstance(message_tool, MessageTool):
@@ -156,31 +233,84 @@ class AgentLoop:
             if isinstance(cron_tool, CronTool):
                 cron_tool.set_context(channel, chat_id)
 
-    async def _run_agent_loop(self, initial_messages: list[dict]) -> tuple[str | None, list[str]]:
+        if exec_tool := self.tools.get("exec"):
+            if isinstance(exec_tool, ExecTool):
+                exec_tool.set_session(session_key or f"{channel}:{chat_id}")
+
+    async def _chat_streaming(
+        self,
+        messages: list[dict],
+        tools: list[dict],
+        on_progress: Callable[[str], Awaitable[None]],
+    ) -> LLMResponse:
+        """Call the provider in streaming mode, reporting the text generated so far."""
+        text = ""
+        response: LLMResponse | None = None
+        started = time.monotonic()
+        async for chunk in self.provider.chat_stream(
+            messages=messages,
+            tools=tools,
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+        ):
+            if chunk.delta:
+                if not text and (span := current_span()):
+                    span.set(ttft=round(time.monotonic() - started, 3))
+                text += chunk.delta
+                await on_progress(text)
+            if chunk.response:
+                response = chunk.response
+        return response or LLMResponse(content=text or None)
+
+    async def _run_agent_loop(
+        self,
+        initial_messages: list[dict],
+        on_progress: Callable[[str], Awaitable[None]] | None = None,
+    ) -> tuple[str | None, list[str]]:
         """
         Run the agent iteration loop.
 
         Args:
             initial_messages: Starting messages for the LLM conversation.
+            on_progress: If set, responses are streamed and this is called with
+                the current iteration's text as it grows.
 
         Returns:
             Tuple of (final_content, list_of_tools_used).
         """
+        if on_progress and self.exec_config.stream_output:
+            if isinstance(exec_tool := self.tools.get("exec"), ExecTool):
+                exec_tool.set_output_callback(on_progress)
+
         messages = initial_messages
+        turn_start = len(initial_messages) - 1  # The current user message; history precedes it
         iteration = 0
         final_content = None
         tools_used: list[str] = []
+        usage: dict[str, int] = {}
 
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            tool_defs = self.tools.get_definitions()
+            request = self.budget.fit(messages, tool_defs, turn_start=turn_start)
+            with get_tracer().span("llm", model=self.model, iteration=iteration, stream=bool(on_progress)) as span:
+                if on_progress:
+                    response = await self._chat_streaming(request, tool_defs, on_progress)
+                else:
+                    response = await self.provider.chat(
+                        messages=request,
+                        tools=tool_defs,
+                        model=self.model,
+                        temperature=self.temperature,
+                        max_tokens=self.max_tokens,
+                    )
+                span.set(finish_reason=response.finish_reason, tool_calls=len(response.tool_calls), **response.usage)
+            if response.usage:
+                logger.debug(f"LLM usage: {response.usage}")
+                for name, count in response.usage.items():
+                    usage[name] = usage.get(name, 0) + count
 
             if response.has_tool_calls:
                 tool_call_dicts = [
@@ -203,22 +333,29 @@ class AgentLoop:
                     tools_used.append(tool_call.name)
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                results = await self.tools.execute_many(
+                    [(tc.name, tc.arguments) for tc in response.tool_calls],
+                    max_parallel=self.max_parallel_tools,
+                )
+                for tool_call, result in zip(response.tool_calls, results):
                     messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
+                        messages, tool_call.id, tool_call.name, self.budget.clip_tool_result(result)
                     )
                 messages.append({"role": "user", "content": "Reflect on the results and decide next steps."})
             else:
                 final_content = response.content
                 break
 
+        if span := current_span():
+            span.set(iterations=iteration, tools=len(tools_used), **usage)
         return final_content, tools_used
 
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """Run the agent loop, dispatching messages from the bus to concurrent workers."""
         self._running = True
+        self._start_memory_worker()
         await self._connect_mcp()
-        logger.info("Agent loop started")
+        logger.info(f"Agent loop started (max_concurrency={self.max_concurrency})")
 
         while self._running:
             try:
@@ -226,22 +363,72 @@ class AgentLoop:
                     self.bus.consume_inbound(),
                     timeout=1.0
                 )
+            except asyncio.TimeoutError:
+                continue
+
+            task = asyncio.create_task(self._dispatch(msg))
+            self._active_tasks.add(task)
+            task.add_done_callback(self._active_tasks.discard)
+
+    @staticmethod
+    def _session_key_for(msg: InboundMessage) -> str:
+        """Session key a message will be processed under (system messages route via chat_id)."""
+        if msg.channel == "system":
+            return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+        return msg.session_key
+
+    @asynccontextmanager
+    async def _session_slot(self, key: str):
+        """
+        Acquire the per-session lock, then a worker slot.
+
+        Waiting on the session lock does not hold a worker slot, so a busy
+        session cannot starve others. Locks are dropped once no task needs them.
+        """
+        lock = self._session_locks.get(key)
+        if lock is None:
+            lock = self._session_locks[key] = asyncio.Lock()
+        self._session_pending[key] = self._session_pending.get(key, 0) + 1
+        try:
+            async with lock, self._concurrency:
+                yield
+        finally:
+            self._session_pending[key] -= 1
+            if not self._session_pending[key]:
+                del self._session_pending[key]
+                self._session_locks.pop(key, None)
+
+    async def _dispatch(self, msg: InboundMessage) -> None:
+        """Process one inbound message in its session slot and publish the reply."""
+        key = self._session_key_for(msg)
+        tracer = get_tracer()
+        arrived = msg.timestamp.timestamp()
+        with tracer.span("turn", start=arrived, channel=msg.channel, session=key):
+            async with self._session_slot(key):
+                tracer.record("queue_wait", arrived)  # Bus queue, session lock and worker slot
+                stream_id = uuid.uuid4().hex[:12] if self.stream else None
                 try:
-                    response = await self._process_message(msg)
+                    response = await self._process_message(msg, stream_id=stream_id)
                     if response:
-                        await self.bus.publish_outbound(response)
+                        with tracer.span("dispatch"):
+                            await self.bus.publish_outbound(response)
                 except Exception as e:
                     logger.error(f"Error processing message: {e}")
                     await self.bus.publish_outbound(OutboundMessage(
                         channel=msg.channel,
                         chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}"
+                        content=f"Sorry, I encountered an error: {str(e)}",
+                        metadata=msg.metadata or {},
+                        stream_id=stream_id,  # Replaces a preview left by a turn that failed mid-stream
                     ))
-            except asyncio.TimeoutError:
-                continue
     
     async def close_mcp(self) -> None:
-        """Close MCP connections."""
+        """Close MCP connections (and stop background memory replay and persistent shells)."""
+        if stop := getattr(self.memory, "stop", None):
+            await stop()
+        exec_tool = self.tools.get("exec")
+        if isinstance(exec_tool, ExecTool) and exec_tool.shells is not None:
+            exec_tool.shells.close()
         if self._mcp_stack:
             try:
                 await self._mcp_stack.aclose()
@@ -249,35 +436,107 @@ class AgentLoop:
                 pass  # MCP SDK cancel scope cleanup is noisy but harmless
             self._mcp_stack = None
 
-    def stop(self) -> None:
-        """Stop the agent loop."""
+    def _status_report(self) -> str:
+        """Runtime statistics for the /status command."""
+        sessions = self.sessions.cache_stats()
+        http = get_http_pool().stats()
+        report = (
+            f"🐈 nanobot status\n"
+            f"Model: {self.model}\n"
+            f"Sessions cached: {sessions['sessions']} ({sessions['hits']} hits, {sessions['misses']} misses)\n"
+            f"HTTP: {http['requests']} requests, {http['connections_opened']} connections opened, "
+            f"{http['open_connections']} open, reuse {http['reuse_ratio']:.0%}"
+            f"{' (HTTP/2)' if http['http2'] else ''}"
+        )
+        if self.web_cache:
+            wc = self.web_cache.stats
+            report += f"\nWeb cache: {wc['hits']} hits, {wc['misses']} misses, {wc['revalidated']} revalidated"
+        if outbox := getattr(self.memory, "outbox", None):
+            ob = outbox.stats()
+            report += (f"\nMemory outbox: {ob['pending']} pending (oldest {ob['oldest_age']:.0f}s), "
+                       f"{ob['sent']} replayed, {ob['dropped']} dropped")
+        provider = self.provider
+        if isinstance(provider, CachingProvider):
+            cs = provider.cache.stats()
+            report += (f"\nLLM cache: {cs['hits']} hits, {cs['misses']} misses ({cs['hit_rate']:.0%}), "
+                       f"{provider.bypassed} not cacheable, {cs['entries']} entries")
+            provider = provider.provider
+        if isinstance(provider, ProviderScheduler):
+            ps = provider.stats()
+            queued = ", ".join(f"{n} {name}" for name, n in ps["queued"].items())
+            report += (f"\nLLM: {ps['active']} in flight, queued {queued}; {ps['requests']} requests, "
+                       f"{ps['retries']} retries ({ps['rate_limited']} rate-limited), {ps['coalesced']} coalesced, "
+                       f"wait avg {ps['avg_wait']:.2f}s max {ps['max_wait']:.2f}s")
+            provider = provider.provider
+        if isinstance(provider, RoutingProvider):
+            for b in provider.stats():
+                latency = f"p50 {b['p50']:.1f}s p95 {b['p95']:.1f}s" if b["p50"] is not None else "no data"
+                report += (f"\n  {b['name']} ({b['model']}): {b['state']}, {latency}, "
+                           f"{b['error_rate']:.0%} errors, {b['requests']} requests, {b['hedges']} hedged")
+        return report
+
+    async def stop(self) -> None:
+        """Stop the agent loop: cancel in-flight turns, then finish pending memory consolidation."""
         self._running = False
         logger.info("Agent loop stopping")
+        while self._active_tasks:
+            tasks = list(self._active_tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await self.consolidation.drain()
     
 
     async def run_command(self, command: str, session : Session, msg : InboundMessage, clear_session : bool) -> OutboundMessage:
+        session.ensure_loaded()
         messages_to_archive = session.messages.copy()
         if clear_session:
             session.clear()
             self.sessions.save(session)
             self.sessions.invalidate(session.key)
+            if isinstance(exec_tool := self.tools.get("exec"), ExecTool) and exec_tool.shells:
+                exec_tool.shells.discard(session.key)  # New conversation, fresh shell
 
-        async def _consolidate_and_cleanup():
-            temp_session = Session(key=session.key)
-            temp_session.messages = messages_to_archive
-            await self._consolidate_memory(temp_session, archive_all=True)
-
-        asyncio.create_task(_consolidate_and_cleanup())
+        temp_session = Session(key=session.key)
+        temp_session.messages = messages_to_archive
+        self.consolidation.submit(session.key, lambda: self._consolidate_memory(temp_session, archive_all=True))
         return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                             content="New session started. Memory consolidation in progress.")
 
-    async def _process_message(self, msg: InboundMessage, session_key: str | None = None) -> OutboundMessage | None:
+    def _stream_publisher(self, msg: InboundMessage, stream_id: str) -> Callable[[str], Awaitable[None]]:
+        """Build a callback that publishes partial replies, at most once per stream_interval."""
+        last_sent = 0.0
+
+        async def _publish(text: str) -> None:
+            nonlocal last_sent
+            now = time.monotonic()
+            if now - last_sent < self.stream_interval:
+                return
+            last_sent = now
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=text,
+                metadata=msg.metadata or {},
+                stream_id=stream_id,
+                partial=True,
+            ))
+
+        return _publish
+
+    async def _process_message(
+        self,
+        msg: InboundMessage,
+        session_key: str | None = None,
+        stream_id: str | None = None,
+    ) -> OutboundMessage | None:
         """
         Process a single inbound message.
         
         Args:
             msg: The inbound message to process.
             session_key: Override session key (used by process_direct).
+            stream_id: If set, publish partial replies to the bus under this id while generating.
         
         Returns:
             The response message, or None if no response needed.
@@ -290,7 +549,9 @@ class AgentLoop:
         logger.info(f"Processing message from {msg.channel}:{msg.sender_id}: {preview}")
 
         key = session_key or msg.session_key
-        session = self.sessions.get_or_create(key)
+        tracer = get_tracer()
+        with tracer.span("session_load"):
+            session = self.sessions.get_or_create(key)
         
         # Handle slash commands
         cmd = msg.content.strip().lower()
@@ -304,24 +565,14 @@ class AgentLoop:
             # Capture messages before clearing (avoid race condition with background task)
             if isinstance(self.memory, SupermemoryStore):
                 try:
-                    upload_result = self.memory.update_conversation(messages, session)
-                    response = (
-                        await upload_result
-                        if inspect.isawaitable(upload_result)
-                        else upload_result
-                    )
+                    response = await self.memory.update_conversation(messages, session)
                     
                     if response:
                         logger.info(f"Conversation uploaded to Supermemory for session {session.key}")
-                        async def _clear_failed_sessions():
-                            replay_result = self.memory.clear_failed_sessions()
-                            if inspect.isawaitable(replay_result):
-                                await replay_result
-
-                        asyncio.create_task(_clear_failed_sessions())
                         return await self.run_command(cmd, session, msg, clear_session=True)
                     else:
-                        logger.warning(f"Failed to update conversation in Supermemory for session {session.key}, running backup consolidation")
+                        logger.warning(f"Failed to update conversation in Supermemory for session {session.key} "
+                                       f"(queued for replay), running backup consolidation")
                         return await self.run_command(cmd, session, msg, clear_session=False)
 
                 except Exception as e:
@@ -332,20 +583,26 @@ class AgentLoop:
 
         if cmd == "/help":
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
-                                  content="🐈 nanobot commands:\n/new — Start a new conversation\n/help — Show available commands")
-        
-        if isinstance(self.memory, MemoryStore) and len(session.messages) > self.memory_window:
-            asyncio.create_task(self._consolidate_memory(session))
+                                  content="🐈 nanobot commands:\n/new — Start a new conversation\n"
+                                          "/status — Show runtime statistics\n/help — Show available commands")
 
-        self._set_tool_context(msg.channel, msg.chat_id)
-        initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
-            current_message=msg.content,
-            media=msg.media if msg.media else None,
-            channel=msg.channel,
-            chat_id=msg.chat_id,
-        )
-        final_content, tools_used = await self._run_agent_loop(initial_messages)
+        if cmd == "/status":
+            return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id, content=self._status_report())
+        
+        if isinstance(self.memory, MemoryStore) and session.message_count - session.last_consolidated > self.memory_window:
+            self.consolidation.request(key, lambda: self._consolidate_memory(session))
+
+        self._set_tool_context(msg.channel, msg.chat_id, key)
+        with tracer.span("prompt_build"):
+            initial_messages = await self.context.build_messages(
+                history=session.get_history(max_messages=self.memory_window),
+                current_message=msg.content,
+                media=msg.media if msg.media else None,
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+            )
+        on_progress = self._stream_publisher(msg, stream_id) if stream_id else None
+        final_content, tools_used = await self._run_agent_loop(initial_messages, on_progress)
 
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -356,13 +613,15 @@ class AgentLoop:
         session.add_message("user", msg.content)
         session.add_message("assistant", final_content,
                             tools_used=tools_used if tools_used else None)
-        self.sessions.save(session)
+        with tracer.span("session_save"):
+            self.sessions.save(session)
         
         return OutboundMessage(
             channel=msg.channel,
             chat_id=msg.chat_id,
             content=final_content,
             metadata=msg.metadata or {},  # Pass through for channel-specific needs (e.g. Slack thread_ts)
+            stream_id=stream_id,
         )
     
     async def _process_system_message(self, msg: InboundMessage) -> OutboundMessage | None:
@@ -386,8 +645,8 @@ class AgentLoop:
         
         session_key = f"{origin_channel}:{origin_chat_id}"
         session = self.sessions.get_or_create(session_key)
-        self._set_tool_context(origin_channel, origin_chat_id)
-        initial_messages = self.context.build_messages(
+        self._set_tool_context(origin_channel, origin_chat_id, session_key)
+        initial_messages = await self.context.build_messages(
             history=session.get_history(max_messages=self.memory_window),
             current_message=msg.content,
             channel=origin_channel,
@@ -415,6 +674,9 @@ class AgentLoop:
             archive_all: If True, clear all messages and reset session (for /new command).
                        If False, only write to files without modifying session.
         """
+        set_priority(Priority.BACKGROUND)  # Runs in its own task (see ConsolidationScheduler)
+        force_response_cache()  # Same input, same summary: reuse it if the cache is enabled
+        detach_span()  # Not part of the turn that scheduled it
 
         if archive_all:
             old_messages = session.messages
@@ -422,19 +684,22 @@ class AgentLoop:
             logger.info(f"Memory consolidation (archive_all): {len(session.messages)} total messages archived")
         else:
             keep_count = self.memory_window // 2
-            if len(session.messages) <= keep_count:
-                logger.debug(f"Session {session.key}: No consolidation needed (messages={len(session.messages)}, keep={keep_count})")
+            total = session.message_count
+            if total <= keep_count:
+                logger.debug(f"Session {session.key}: No consolidation needed (messages={total}, keep={keep_count})")
                 return
 
-            messages_to_process = len(session.messages) - session.last_consolidated
+            messages_to_process = total - session.last_consolidated
             if messages_to_process <= 0:
-                logger.debug(f"Session {session.key}: No new messages to consolidate (last_consolidated={session.last_consolidated}, total={len(session.messages)})")
+                logger.debug(f"Session {session.key}: No new messages to consolidate (last_consolidated={session.last_consolidated}, total={total})")
                 return
 
-            old_messages = session.messages[session.last_consolidated:-keep_count]
+            # Fixed before the LLM call: messages added meanwhile are left for the next run
+            end = total - keep_count
+            old_messages = session.window(session.last_consolidated, end)
             if not old_messages:
                 return
-            logger.info(f"Memory consolidation started: {len(session.messages)} total, {len(old_messages)} new to consolidate, {keep_count} keep")
+            logger.info(f"Memory consolidation started: {total} total, {len(old_messages)} new to consolidate, {keep_count} keep")
 
         lines = []
         conversation : str | None = None
@@ -457,21 +722,28 @@ class AgentLoop:
         
         from nanobot.agent.super_memory import SupermemoryStore
         if isinstance(self.memory, SupermemoryStore):
-            current_memory = self.memory.get_user_long_term_memory()
-            default_history_prompt = supermemory_history_prompt
+            current_memory = await self.memory.get_user_long_term_memory()
+            prompt = self.prompt_library.history_prompt(supermemory_history_prompt, current_memory, conversation)
         else:
-            current_memory = self.memory.read_long_term()
-
-        prompt = self.prompt_library.history_prompt(default_history_prompt, current_memory, conversation)
+            # Only the section outline and the sections related to this conversation are sent,
+            # so the prompt grows with the conversation rather than with MEMORY.md
+            prompt = self.prompt_library.memory_patch_prompt(
+                default_history_prompt,
+                self.memory.section_outline(),
+                self.memory.relevant_sections(conversation),
+                conversation,
+            )
         
         try:
-            response = await self.provider.chat(
-                messages=[
-                    {"role": "system", "content": "You are a memory consolidation agent. Respond only with valid JSON."},
-                    {"role": "user", "content": prompt},
-                ],
-                model=self.model,
-            )
+            with get_tracer().span("llm", model=self.model, purpose="consolidation", session=session.key) as span:
+                response = await self.provider.chat(
+                    messages=[
+                        {"role": "system", "content": "You are a memory consolidation agent. Respond only with valid JSON."},
+                        {"role": "user", "content": prompt},
+                    ],
+                    model=self.model,
+                )
+                span.set(finish_reason=response.finish_reason, **response.usage)
             text = (response.content or "").strip()
             if not text:
                 logger.warning("Memory consolidation: LLM returned empty response, skipping")
@@ -485,21 +757,21 @@ class AgentLoop:
 
             if (isinstance(self.memory, SupermemoryStore)):
                 if entry := result.get("memory_update"):
-                    self.memory.add_memory(entry)
+                    await self.memory.add_memory(entry)
                 if entry := result.get("history_entry"):
-                    self.memory.add_memory(entry)
+                    await self.memory.add_memory(entry)
             else:
-                 if entry := result.get("history_entry"):
+                if entry := result.get("history_entry"):
                     self.memory.append_history(entry)
-                 if update := result.get("memory_update"):
-                    if update != current_memory:
-                        self.memory.write_long_term(update)
+                if isinstance(patches := result.get("memory_patches"), list):
+                    applied = self.memory.apply_patches(patches)
+                    logger.debug(f"Memory consolidation: {applied}/{len(patches)} memory patches applied")
 
             if archive_all:
                 session.last_consolidated = 0
             else:
-                session.last_consolidated = len(session.messages) - keep_count
-            logger.info(f"Memory consolidation done: {len(session.messages)} messages, last_consolidated={session.last_consolidated}")
+                session.last_consolidated = end
+            logger.info(f"Memory consolidation done: {session.message_count} messages, last_consolidated={session.last_consolidated}")
         except Exception as e:
             logger.error(f"Memory consolidation failed: {e}")
 
@@ -523,6 +795,7 @@ class AgentLoop:
         Returns:
             The agent's response.
         """
+        self._start_memory_worker()
         await self._connect_mcp()
 
         msg = InboundMessage(
@@ -532,7 +805,15 @@ class AgentLoop:
             content=content
         )
         
-        response = await self._process_message(msg, session_key=session_key)
+        # Scheduled turns nobody is waiting on yield the provider to interactive ones
+        background = session_key.startswith(("cron:", "heartbeat"))
+        tracer = get_tracer()
+        arrived = msg.timestamp.timestamp()
+        with llm_priority(Priority.BACKGROUND if background else Priority.INTERACTIVE), \
+                tracer.span("turn", start=arrived, channel=channel, session=session_key):
+            async with self._session_slot(session_key):
+                tracer.record("queue_wait", arrived)
+                response = await self._process_message(msg, session_key=session_key)
         response_content = response.content if response else ""
         
         return response_content 
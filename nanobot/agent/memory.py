@@ -1,7 +1,29 @@
 """Memory system for persistent agent memory."""
 
+import re
 from pathlib import Path
-from nanobot.utils.helpers import ensure_dir
+from typing import Any
+
+from nanobot.utils.helpers import atomic_write_text, ensure_dir, file_signature
+
+_SECTION_RE = re.compile(r"^## +(.+?)\s*$", re.MULTILINE)
+_WORD_RE = re.compile(r"\w{3,}")
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})", re.MULTILINE)
+
+
+def _section_headings(text: str) -> list[re.Match]:
+    """``## `` headings of a markdown text, ignoring those inside fenced code blocks."""
+    fenced: list[tuple[int, int]] = []
+    opening: re.Match | None = None
+    for m in _FENCE_RE.finditer(text):
+        if opening is None:
+            opening = m
+        elif m.group(1)[0] == opening.group(1)[0] and len(m.group(1)) >= len(opening.group(1)):
+            fenced.append((opening.start(), m.end()))
+            opening = None
+    if opening is not None:  # Unclosed fence runs to the end
+        fenced.append((opening.start(), len(text)))
+    return [m for m in _SECTION_RE.finditer(text) if not any(a <= m.start() < b for a, b in fenced)]
 
 
 class MemoryStore:
@@ -11,14 +33,96 @@ class MemoryStore:
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
         self.history_file = self.memory_dir / "HISTORY.md"
+        self._long_term: tuple[tuple[int, int], str] | None = None  # (signature, content) of MEMORY.md
 
     def read_long_term(self) -> str:
-        if self.memory_file.exists():
-            return self.memory_file.read_text(encoding="utf-8")
-        return ""
+        sig = file_signature(self.memory_file)
+        if sig is None:
+            return ""
+        if self._long_term is None or self._long_term[0] != sig:
+            self._long_term = (sig, self.memory_file.read_text(encoding="utf-8"))
+        return self._long_term[1]
 
     def write_long_term(self, content: str) -> None:
-        self.memory_file.write_text(content, encoding="utf-8")
+        atomic_write_text(self.memory_file, content)
+
+    def read_sections(self) -> tuple[str, dict[str, str]]:
+        """Split MEMORY.md into the preamble and its ``## `` sections (title -> body), in order."""
+        text = self.read_long_term()
+        matches = _section_headings(text)
+        preamble = text[: matches[0].start()] if matches else text
+        sections: dict[str, str] = {}
+        for i, m in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            body = text[m.end():end].strip("\n")
+            title = m.group(1)
+            sections[title] = f"{sections[title]}\n{body}" if title in sections else body
+        return preamble.strip("\n"), sections
+
+    def write_sections(self, preamble: str, sections: dict[str, str]) -> None:
+        parts = [preamble] if preamble else []
+        parts += [f"## {title}\n\n{body.strip()}" if body.strip() else f"## {title}" for title, body in sections.items()]
+        self.write_long_term("\n\n".join(parts) + "\n")
+
+    def section_outline(self) -> str:
+        """One line per section with its size, so a consolidation prompt can address sections without their text."""
+        _, sections = self.read_sections()
+        return "\n".join(f"- {title} ({len(body.splitlines())} lines)" for title, body in sections.items())
+
+    def relevant_sections(self, text: str, max_chars: int = 2000) -> str:
+        """Sections sharing the most words with ``text``, up to max_chars (for dedupe/corrections)."""
+        _, sections = self.read_sections()
+        words = set(w.lower() for w in _WORD_RE.findall(text))
+        scored = sorted(
+            ((len(words & set(w.lower() for w in _WORD_RE.findall(body))), title, body) for title, body in sections.items()),
+            key=lambda x: -x[0],
+        )
+        out, used = [], 0
+        for score, title, body in scored:
+            block = f"## {title}\n{body}"
+            if score == 0 or used + len(block) > max_chars:
+                continue
+            out.append(block)
+            used += len(block)
+        return "\n\n".join(out)
+
+    def apply_patches(self, patches: list[dict[str, Any]]) -> int:
+        """
+        Apply section-addressed edits to MEMORY.md. Returns how many changed something.
+
+        Each patch names a ``section`` and an ``op``:
+        ``add`` appends ``content`` lines not already present (creating the section),
+        ``replace`` swaps ``old`` for ``new`` (appending ``new`` if ``old`` is gone),
+        ``remove`` deletes ``old``.
+        """
+        preamble, sections = self.read_sections()
+        applied = 0
+        for patch in patches:
+            if not isinstance(patch, dict) or not (title := str(patch.get("section") or "").strip()):
+                continue
+            op = patch.get("op", "add")
+            body = sections.get(title, "")
+            if _is_placeholder(body):
+                body = ""
+            if op == "add":
+                existing = {line.strip() for line in body.splitlines()}
+                new = [line for line in str(patch.get("content") or "").splitlines()
+                       if line.strip() and line.strip() not in existing]
+                if not new:
+                    continue
+                body = "\n".join(filter(None, [body.rstrip(), *new]))
+            elif op == "replace" and patch.get("new"):
+                old, new_text = str(patch.get("old") or ""), str(patch["new"])
+                body = body.replace(old, new_text, 1) if old and old in body else "\n".join(filter(None, [body.rstrip(), new_text]))
+            elif op == "remove" and (old := str(patch.get("old") or "")) and old in body:
+                body = "\n".join(line for line in body.replace(old, "", 1).splitlines() if line.strip())
+            else:
+                continue
+            sections[title] = body
+            applied += 1
+        if applied:
+            self.write_sections(preamble, sections)
+        return applied
 
     def append_history(self, entry: str) -> None:
         with open(self.history_file, "a", encoding="utf-8") as f:
@@ -28,6 +132,11 @@ class MemoryStore:
         long_term = self.read_long_term()
         return f"## Long-term Memory\n{long_term}" if long_term else ""
 
-    def get_context(self, query: str = None) -> str:
+    async def get_context(self, query: str = None) -> str:
         """Get memory context. Query param ignored for local storage."""
-        return self.get_memory_context()
\ No newline at end of file
+        return self.get_memory_context()
+
+def _is_placeholder(body: str) -> bool:
+    """Template text like "(Things to remember)" from a fresh workspace."""
+    text = body.strip()
+    return text.startswith("(") and text.endswith(")") and "\n" not in text
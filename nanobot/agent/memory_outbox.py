@@ -0,0 +1,210 @@
+"""Durable queue of conversation uploads that failed, replayed in the background."""
+
+import asyncio
+import json
+import random
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    messages TEXT NOT NULL,
+    message_count INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (next_attempt);
+"""
+
+
+class MemoryOutbox:
+    """
+    Bounded on-disk outbox for conversations the memory API did not accept.
+
+    Entries live in SQLite so they survive restarts. A background worker
+    sends due entries in batches (several conversations' messages merged
+    into one request, up to ``batch_size`` entries or ``max_batch_messages``
+    messages), with at most ``concurrency`` requests in flight. A failed
+    batch is retried after an exponential backoff with jitter. When the
+    queue holds ``max_items`` entries the oldest are dropped.
+
+    ``send`` receives a list of messages and raises on failure.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        send: Callable[[list[dict[str, Any]]], Awaitable[None]],
+        max_items: int = 1000,
+        batch_size: int = 20,
+        max_batch_messages: int = 1000,
+        concurrency: int = 4,
+        base_delay: float = 2.0,
+        max_delay: float = 600.0,
+    ):
+        self.send = send
+        self.max_items = max_items
+        self.batch_size = max(1, batch_size)
+        self.max_batch_messages = max_batch_messages
+        self.concurrency = max(1, concurrency)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        ensure_dir(db_path.parent)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_SCHEMA)
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.sent = 0
+        self.failed_attempts = 0
+        self.dropped = 0
+
+    def put(self, key: str, messages: list[dict[str, Any]]) -> None:
+        """Queue a conversation for delivery (dropping the oldest entries beyond max_items)."""
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO outbox (key, messages, message_count, created_at, next_attempt) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(messages, ensure_ascii=False), len(messages), now, now),
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0] - self.max_items
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM outbox WHERE id IN (SELECT id FROM outbox ORDER BY id LIMIT ?)", (overflow,)
+                )
+                self.dropped += overflow
+                logger.warning(f"Memory outbox full, dropped {overflow} oldest conversations")
+        self.wake()
+
+    def import_jsonl(self, directory: Path) -> int:
+        """Move session files from the old failed_sessions directory into the outbox."""
+        imported = 0
+        for path in sorted(directory.glob("*.jsonl")):
+            try:
+                with path.open(encoding="utf-8") as f:
+                    raw = [json.loads(line) for line in f if line.strip()]
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable failed session {path}: {e}")
+                continue
+            messages = [m for m in raw if m.get("_type") != "metadata"]
+            if messages:
+                self.put(path.stem, messages)
+                imported += 1
+            path.unlink()
+            path.with_suffix(".meta.json").unlink(missing_ok=True)
+        if imported:
+            logger.info(f"Moved {imported} failed sessions into the memory outbox")
+        return imported
+
+    def wake(self) -> None:
+        """Make the worker look at the queue now (new entry, or the API is reachable again)."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return random.uniform(delay / 2, delay)
+
+    async def drain_once(self) -> int:
+        """Send every entry that is due. Returns the number of conversations delivered."""
+        rows = self._conn.execute(
+            "SELECT id, messages, message_count, attempts FROM outbox WHERE next_attempt <= ? ORDER BY id LIMIT ?",
+            (time.time(), self.batch_size * self.concurrency),
+        ).fetchall()
+        if not rows:
+            return 0
+
+        batches: list[list[tuple]] = [[]]
+        count = 0
+        for row in rows:
+            if batches[-1] and (len(batches[-1]) >= self.batch_size or count + row[2] > self.max_batch_messages):
+                batches.append([])
+                count = 0
+            batches[-1].append(row)
+            count += row[2]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(batch: list[tuple]) -> int:
+            messages = [m for row in batch for m in json.loads(row[1])]
+            async with semaphore:
+                try:
+                    await self.send(messages)
+                except Exception as e:
+                    self.failed_attempts += 1
+                    now = time.time()
+                    with self._conn:
+                        self._conn.executemany(
+                            "UPDATE outbox SET attempts = ?, next_attempt = ? WHERE id = ?",
+                            [(row[3] + 1, now + self._backoff(row[3] + 1), row[0]) for row in batch],
+                        )
+                    logger.debug(f"Memory outbox: batch of {len(batch)} failed ({e!r}), will retry")
+                    return 0
+            with self._conn:
+                self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(row[0],) for row in batch])
+            self.sent += len(batch)
+            return len(batch)
+
+        delivered = sum(await asyncio.gather(*(deliver(b) for b in batches)))
+        if delivered:
+            logger.info(f"Memory outbox: delivered {delivered} queued conversations")
+        return delivered
+
+    def _next_due_in(self) -> float | None:
+        row = self._conn.execute("SELECT MIN(next_attempt) FROM outbox").fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delivered = await self.drain_once()
+            except Exception as e:
+                logger.error(f"Memory outbox worker error: {e}")
+                delivered = 0
+            wait = self._next_due_in()
+            if delivered and wait == 0:
+                continue  # More is due right away
+            timeout = self.max_delay if wait is None else min(max(wait, 1.0), self.max_delay)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self) -> None:
+        """Start the background worker (idempotent; needs a running event loop)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        """Backlog size and age of the oldest entry, plus delivery counters."""
+        pending, oldest, retries = self._conn.execute(
+            "SELECT COUNT(*), MIN(created_at), MAX(attempts) FROM outbox"
+        ).fetchone()
+        return {
+            "pending": pending,
+            "oldest_age": time.time() - oldest if oldest is not None else 0.0,
+            "max_attempts": retries or 0,
+            "sent": self.sent,
+            "failed_attempts": self.failed_attempts,
+            "dropped": self.dropped,
+        }
@@ -25,6 +25,29 @@ class PromptLibrary:
                 Respond with ONLY valid JSON, no markdown fences.
                 """
     
+    def memory_patch_prompt(self, default_history_prompt, outline, excerpts, conversation) -> str:
+        return f"""You are a memory consolidation agent. Process this conversation and return a JSON object with exactly two keys:
+
+                1. "history_entry": {default_history_prompt}
+
+                2. "memory_patches": A list of edits to long-term memory for new or changed facts: user location, preferences, personal info, habits, project context, technical decisions, tools/services used. Each edit is one of:
+                   {{"op": "add", "section": "<section title>", "content": "- new fact"}}
+                   {{"op": "replace", "section": "<section title>", "old": "<exact existing text>", "new": "<corrected text>"}}
+                   {{"op": "remove", "section": "<section title>", "old": "<exact existing text>"}}
+                   Prefer existing sections; a new section title creates it. Do not repeat facts already in memory. If nothing new, return [].
+
+                ## Memory Sections
+                {outline or "(none yet)"}
+
+                ## Related Existing Memory
+                {excerpts or "(none)"}
+
+                ## Conversation to Process
+                {conversation}
+
+                Respond with ONLY valid JSON, no markdown fences.
+                """
+
     def skill_prompt(self, skills_summary) -> str:
         return f"""# Skills
 
@@ -34,6 +57,11 @@ class PromptLibrary:
                 {skills_summary}
                 """
     
+    @staticmethod
+    def _time_section(now, tz) -> str:
+        # Omitted (now=None) when the time is sent after the cacheable prompt prefix instead
+        return f"## Current Time\n        {now} ({tz})\n\n        " if now else ""
+
     def build_identity_prompt(self, now, tz, runtime) -> str:
 
         return f"""# nanobot 🐈
@@ -45,16 +73,13 @@ class PromptLibrary:
         - Send messages to users on chat channels
         - Spawn subagents for complex background tasks
 
-        ## Current Time
-        {now} ({tz})
-
-        ## Runtime
+        {self._time_section(now, tz)}## Runtime
         {runtime}
 
         ## Workspace
         Your workspace is at: {self.workspace_path}
         - Long-term memory: {self.workspace_path}/memory/MEMORY.md
-        - History log: {self.workspace_path}/memory/HISTORY.md (grep-searchable)
+        - History log: {self.workspace_path}/memory/HISTORY.md (searchable with search_files)
         - Custom skills: {self.workspace_path}/skills/{{skill-name}}/SKILL.md
 
         IMPORTANT: When responding to direct questions or conversations, reply directly with your text response.
@@ -63,7 +88,7 @@ class PromptLibrary:
 
         Always be helpful, accurate, and concise. When using tools, think step by step: what you know, what you need, and why you chose this tool.
         When remembering something important, write to {self.workspace_path}/memory/MEMORY.md
-        To recall past events, grep {self.workspace_path}/memory/HISTORY.md"""
+        To recall past events, use search_files on memory/HISTORY.md"""
 
     
     def build_identity_prompt_supermemory(self, now, tz, runtime) -> str:
@@ -80,10 +105,7 @@ class PromptLibrary:
         - Send messages to users on chat channels
         - Spawn subagents for complex background tasks
 
-        ## Current Time
-        {now} ({tz})
-
-        ## Runtime
+        {self._time_section(now, tz)}## Runtime
         {runtime}
 
         ## Workspace
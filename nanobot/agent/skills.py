@@ -4,8 +4,11 @@ import json
 import os
 import re
 import shutil
+import time
 from pathlib import Path
 
+from nanobot.utils.helpers import file_signature
+
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
@@ -16,12 +19,27 @@ class SkillsLoader:
     
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+
+    SKILL.md contents and parsed frontmatter are cached per file and reused
+    while the file's mtime and size are unchanged. The skills summary and the
+    always-on skill list are cached on a fingerprint of all skill files plus
+    the PATH and environment variables they depend on. Binary lookups are
+    re-checked every ``WHICH_TTL`` seconds, so a tool installed while the
+    agent runs makes its skill available without a restart.
     """
+
+    WHICH_TTL = 60.0
     
     def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        # path -> (signature, content, frontmatter, nanobot metadata)
+        self._files: dict[Path, tuple[tuple[int, int], str, dict | None, dict]] = {}
+        self._which: dict[tuple[str, str], tuple[float, bool]] = {}  # (binary, PATH) -> (checked at, found)
+        self._which_generation = 0  # Bumped when a re-check finds a binary appeared or vanished
+        self._summary: tuple[tuple, str] | None = None
+        self._always: tuple[tuple, list[str]] | None = None
     
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -66,18 +84,64 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-        
-        # Check built-in
+        entry = self._load_entry(name)
+        return entry[1] if entry else None
+
+    def _load_entry(self, name: str) -> tuple[tuple[int, int], str, dict | None, dict] | None:
+        """Return the cached (signature, content, frontmatter, nanobot metadata) of a skill, re-reading it only if changed."""
+        # Check workspace first, then built-in
+        candidates = [self.workspace_skills / name / "SKILL.md"]
         if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-        
+            candidates.append(self.builtin_skills / name / "SKILL.md")
+
+        for path in candidates:
+            sig = file_signature(path)
+            if sig is None:
+                continue
+            cached = self._files.get(path)
+            if cached and cached[0] == sig:
+                return cached
+            content = path.read_text(encoding="utf-8")
+            frontmatter = self._parse_frontmatter(content)
+            entry = (sig, content, frontmatter, self._parse_nanobot_metadata((frontmatter or {}).get("metadata", "")))
+            self._files[path] = entry
+            return entry
+
         return None
+
+    def _fingerprint(self) -> tuple:
+        """
+        Cheap fingerprint of everything the summary depends on: skill files
+        (stat only, no reads), PATH, and the env vars skills require.
+        """
+        files = []
+        for root in (self.workspace_skills, self.builtin_skills):
+            if not root or not root.is_dir():
+                continue
+            for entry in os.scandir(root):
+                try:
+                    st = os.stat(os.path.join(entry.path, "SKILL.md"))
+                except OSError:
+                    continue
+                files.append((entry.path, st.st_mtime_ns, st.st_size))
+        env_names = {
+            env for *_, skill_meta in self._files.values()
+            for env in skill_meta.get("requires", {}).get("env", [])
+        }
+        env = tuple(sorted((e, bool(os.environ.get(e))) for e in env_names))
+        self._recheck_binaries()
+        return tuple(sorted(files)), os.environ.get("PATH", ""), env, self._which_generation
+
+    def _recheck_binaries(self) -> None:
+        """Repeat lookups older than WHICH_TTL; a changed result invalidates the cached summary."""
+        now = time.monotonic()
+        for (name, path), (checked, found) in list(self._which.items()):
+            if now - checked < self.WHICH_TTL:
+                continue
+            now_found = shutil.which(name, path=path) is not None
+            self._which[(name, path)] = (now, now_found)
+            if now_found != found:
+                self._which_generation += 1
     
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
@@ -108,6 +172,15 @@ class SkillsLoader:
         Returns:
             XML-formatted skills summary.
         """
+        fingerprint = self._fingerprint()
+        if self._summary and self._summary[0] == fingerprint:
+            return self._summary[1]
+
+        summary = self._build_skills_summary()
+        self._summary = (self._fingerprint(), summary)  # after the build, which loads every skill
+        return summary
+
+    def _build_skills_summary(self) -> str:
         all_skills = self.list_skills(filter_unavailable=False)
         if not all_skills:
             return ""
@@ -144,7 +217,7 @@ class SkillsLoader:
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._has_binary(b):
                 missing.append(f"CLI: {b}")
         for env in requires.get("env", []):
             if not os.environ.get(env):
@@ -178,27 +251,42 @@ class SkillsLoader:
         """Check if skill requirements are met (bins, env vars)."""
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._has_binary(b):
                 return False
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 return False
         return True
     
+    def _has_binary(self, name: str) -> bool:
+        """shutil.which, memoized per PATH value for up to WHICH_TTL seconds."""
+        path = os.environ.get("PATH", "")
+        cached = self._which.get((name, path))
+        if cached and time.monotonic() - cached[0] < self.WHICH_TTL:
+            return cached[1]
+        found = shutil.which(name, path=path) is not None
+        self._which[(name, path)] = (time.monotonic(), found)
+        return found
+
     def _get_skill_meta(self, name: str) -> dict:
         """Get nanobot metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_nanobot_metadata(meta.get("metadata", ""))
+        entry = self._load_entry(name)
+        return entry[3] if entry else {}
     
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
+        fingerprint = self._fingerprint()
+        if self._always and self._always[0] == fingerprint:
+            return list(self._always[1])
+
         result = []
         for s in self.list_skills(filter_unavailable=True):
             meta = self.get_skill_metadata(s["name"]) or {}
             skill_meta = self._parse_nanobot_metadata(meta.get("metadata", ""))
             if skill_meta.get("always") or meta.get("always"):
                 result.append(s["name"])
-        return result
+        self._always = (self._fingerprint(), result)
+        return list(result)
     
     def get_skill_metadata(self, name: str) -> dict | None:
         """
@@ -210,10 +298,12 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
-            return None
-        
+        entry = self._load_entry(name)
+        return dict(entry[2]) if entry and entry[2] is not None else None
+
+    @staticmethod
+    def _parse_frontmatter(content: str) -> dict | None:
+        """Parse the simple YAML frontmatter of a SKILL.md."""
         if content.startswith("---"):
             match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
             if match:
@@ -4,17 +4,25 @@ import asyncio
 import json
 import uuid
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
+from nanobot.providers.scheduler import Priority, set_priority
+from nanobot.utils.tracing import detach_span
+from nanobot.agent.budget import ContextBudget
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
+from nanobot.agent.tools.search import SearchFilesTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.web_cache import WebCache
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ExecToolConfig, WebFetchConfig
 
 
 class SubagentManager:
@@ -36,9 +44,13 @@ class SubagentManager:
         max_tokens: int = 4096,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
+        web_fetch_config: "WebFetchConfig | None" = None,
+        web_cache: WebCache | None = None,
         restrict_to_workspace: bool = False,
+        max_parallel_tools: int = 4,
+        budget: ContextBudget | None = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, WebFetchConfig
         self.provider = provider
         self.workspace = workspace
         self.bus = bus
@@ -47,7 +59,11 @@ class SubagentManager:
         self.max_tokens = max_tokens
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.web_fetch_config = web_fetch_config or WebFetchConfig()
+        self.web_cache = web_cache
         self.restrict_to_workspace = restrict_to_workspace
+        self.max_parallel_tools = max_parallel_tools
+        self.budget = budget or ContextBudget(self.model, reserve_tokens=max_tokens)
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
     
     async def spawn(
@@ -98,6 +114,8 @@ class SubagentManager:
     ) -> None:
         """Execute the subagent task and announce the result."""
         logger.info(f"Subagent [{task_id}] starting task: {label}")
+        set_priority(Priority.SUBAGENT)  # Own task, so this does not touch the spawning turn
+        detach_span()  # Outlives the turn that spawned it: trace separately
         
         try:
             # Build subagent tools (no message tool, no spawn tool)
@@ -107,13 +125,20 @@ class SubagentManager:
             tools.register(WriteFileTool(allowed_dir=allowed_dir))
             tools.register(EditFileTool(allowed_dir=allowed_dir))
             tools.register(ListDirTool(allowed_dir=allowed_dir))
+            tools.register(SearchFilesTool(workspace=self.workspace, allowed_dir=allowed_dir))
             tools.register(ExecTool(
                 working_dir=str(self.workspace),
                 timeout=self.exec_config.timeout,
                 restrict_to_workspace=self.restrict_to_workspace,
+                max_output_bytes=self.exec_config.max_output_bytes,
+                kill_after_bytes=self.exec_config.kill_after_bytes,
+            ))
+            tools.register(WebSearchTool(api_key=self.brave_api_key, cache=self.web_cache))
+            tools.register(WebFetchTool(
+                cache=self.web_cache,
+                max_bytes=self.web_fetch_config.max_bytes,
+                extract_timeout=self.web_fetch_config.extract_timeout,
             ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
             
             # Build messages with subagent-specific prompt
             system_prompt = self._build_subagent_prompt(task)
@@ -130,9 +155,10 @@ class SubagentManager:
             while iteration < max_iterations:
                 iteration += 1
                 
+                tool_defs = tools.get_definitions()
                 response = await self.provider.chat(
-                    messages=messages,
-                    tools=tools.get_definitions(),
+                    messages=self.budget.fit(messages, tool_defs, turn_start=1),
+                    tools=tool_defs,
                     model=self.model,
                     temperature=self.temperature,
                     max_tokens=self.max_tokens,
@@ -161,12 +187,16 @@ class SubagentManager:
                     for tool_call in response.tool_calls:
                         args_str = json.dumps(tool_call.arguments)
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                    results = await tools.execute_many(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls],
+                        max_parallel=self.max_parallel_tools,
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
                             "name": tool_call.name,
-                            "content": result,
+                            "content": self.budget.clip_tool_result(result),
                         })
                 else:
                     final_result = response.content
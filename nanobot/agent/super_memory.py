@@ -1,20 +1,22 @@
 from nanobot.agent.memory import MemoryStore
 
 try:
-    from supermemory import Supermemory
+    from supermemory import AsyncSupermemory
 except ImportError:
-    Supermemory = None
+    AsyncSupermemory = None
 
 from nanobot.config.loader import load_config
+from nanobot.config.schema import SupermemoryConfig
 from loguru import logger
 from pathlib import Path
-from typing import List
-import requests
-from nanobot.session import Session, SessionManager
-from nanobot.utils.helpers import ensure_dir
-import json
+from typing import Any, Awaitable, Callable, List
+from collections import OrderedDict
+from nanobot.agent.memory_outbox import MemoryOutbox
+from nanobot.session import Session
+from nanobot.utils.breaker import CircuitBreaker
+from nanobot.utils.http import get_http_pool
 import asyncio
-import inspect
+import time
 
 """
 Intelligent memory system using https://supermemory.ai
@@ -22,62 +24,71 @@ Intelligent memory system using https://supermemory.ai
 class SupermemoryStore():
     """
     Agent memory using Supermemory for persistent, searchable, and structured memory.
+
+    All API calls are async, bounded by ``timeout`` and guarded by a circuit
+    breaker: after repeated failures calls fail fast to the local
+    :class:`MemoryStore` until the API recovers. The profile is cached for
+    ``profile_ttl`` seconds per container tag and query results are kept in
+    an LRU for the same time, so most prompts need no round-trip at all.
     """
-    def __init__(self, workspace: Path):
-        if Supermemory is None:
+    def __init__(self, workspace: Path, config: SupermemoryConfig | None = None):
+        if AsyncSupermemory is None:
             raise ImportError("Supermemory library is not installed."
                               "Please install it with `pip install supermemory`.")
 
-        config = load_config()
-        self.api_key = config.supermemory.api_key
-        self.container_tag = config.supermemory.container_tag or "nanobot_memory"
-        self.supermemory_client = Supermemory(api_key=self.api_key)
+        config = config or load_config().supermemory
+        self.api_key = config.api_key
+        self.container_tag = config.container_tag or "nanobot_memory"
+        self.timeout = config.timeout
+        self.profile_ttl = config.profile_ttl
+        self.cache_size = config.cache_size
+        # Retries are left to the breaker; the SDK's own backoff would hold up the prompt
+        self.supermemory_client = AsyncSupermemory(api_key=self.api_key, timeout=self.timeout, max_retries=0)
+        self.breaker = CircuitBreaker(config.failure_threshold, config.reset_timeout)
         self.alternative_memory = MemoryStore(workspace)  # Fallback to local file-based memory
         self.base_url = "https://api.supermemory.ai/v4"
-        self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "failed_sessions")
-        self.session_manager = SessionManager(workspace)
-
-    @staticmethod
-    async def _maybe_await(value):
-        if inspect.isawaitable(value):
-            return await value
-        return value
-
-
-    async def clear_failed_sessions(self):
-        """Clear all failed sessions from the failed_sessions directory."""
-
-        i = 0
-
-        for session_file in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # parse session file and extract messages 
-                with session_file.open("r") as file:
-                    raw = [json.loads(line) for line in file]
-                    messages = [m for m in raw if m.get("_type") != "metadata"]
-                
-                if i % 3 == 0:
-                    # Tests may monkeypatch asyncio.sleep with a sync stub.
-                    await self._maybe_await(asyncio.sleep(2))
-                
-                success = await self._maybe_await(
-                    self.update_conversation(messages, None)
-                )  # Pass None for session since we're not saving failed sessions here
-
-                if success:
-                    logger.info(f"Parsed messages from failed session file: {session_file}")
-                    session_file.unlink()
-                else:    
-                    logger.info(f"Failed replay for session file: {session_file}. Keeping for next attempt")
-                
-                i += 1
-        
-            except Exception as e:
-                logger.error(f"Error deleting failed session file {session_file}: {e}")
-        
-    
-
-    async def update_conversation(self,messages: List[dict],session: Session | None) -> bool:
+        self.sessions_dir = Path.home() / ".nanobot" / "failed_sessions"  # Pre-outbox location, imported on start
+        self.outbox = MemoryOutbox(
+            Path.home() / ".nanobot" / "memory_outbox.db",
+            send=self._post_conversation,
+            max_items=config.outbox_max_items,
+            batch_size=config.outbox_batch_size,
+            concurrency=config.outbox_concurrency,
+        )
+        self._profiles: dict[str, tuple[float, Any]] = {}  # container tag -> (fetched at, profile)
+        self._queries: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+
+    async def _call(self, name: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run an API call under the timeout and circuit breaker. Raises on failure or open circuit."""
+        if not self.breaker.allow():
+            raise ConnectionError(f"Supermemory circuit open, skipping {name}")
+        try:
+            result = await asyncio.wait_for(fn(), timeout=self.timeout)
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            if self.breaker.state != "closed":
+                logger.warning(f"Supermemory unavailable, using local memory for {self.breaker.reset_timeout:.0f}s")
+            raise
+        self.breaker.record_success()
+        return result
+
+    def _invalidate(self) -> None:
+        """Drop cached profile and query results after new memories were written."""
+        self._profiles.pop(self.container_tag, None)
+        self._queries.clear()
+
+    def start(self) -> None:
+        """Start replaying queued conversations in the background (needs a running event loop)."""
+        self.outbox.import_jsonl(self.sessions_dir)
+        self.outbox.start()
+
+    async def stop(self) -> None:
+        await self.outbox.stop()
+
+    async def _post_conversation(self, messages: List[dict]) -> None:
         url = f"{self.base_url}/conversations"
 
         payload = {
@@ -90,92 +101,108 @@ class SupermemoryStore():
             "Content-Type": "application/json",
         }
 
-        try:
-            response = await asyncio.to_thread(
-                requests.post,
-                url,
-                json=payload,
-                headers=headers,
-            )
-
+        async def post():
+            response = await get_http_pool().client.post(url, json=payload, headers=headers, timeout=self.timeout)
             if response.status_code != 200:
-                logger.error(f"Failed to update conversation in Supermemory: "f"{response.status_code} - {response.text}")
                 raise Exception(f"Supermemory API error: " f"{response.status_code} - {response.text}")
+
+        await self._call("update_conversation", post)
+        self._invalidate()
+
+    async def update_conversation(self,messages: List[dict],session: Session | None) -> bool:
+        """Upload a conversation; on failure it is queued in the outbox and replayed later."""
+        try:
+            await self._post_conversation(messages)
+            self.outbox.wake()  # The API is reachable: good time to drain any backlog
             return True
         except Exception as e:
-            logger.exception(f"Error while updating conversation in Supermemory: {e}")
-
-            if session is not None:
-                session_path = (self.sessions_dir / f"{session.key.replace(':', '_')}.jsonl")
-                self.session_manager.save(session, session_path)
-            else:
-                logger.error("No session provided to save failed conversation.")
-            
+            logger.error(f"Error while updating conversation in Supermemory: {e!r}")
+            self.outbox.put(session.key if session is not None else "unknown", messages)
             return False
 
-    def add_memory(self, content: str):
+    async def add_memory(self, content: str):
+        """Add a new memory entry."""
         try:
-            """Add a new memory entry."""
-                
-            self.supermemory_client.add(
+            await self._call("add", lambda: self.supermemory_client.add(
                 content=content,
                 container_tag=self.container_tag,
-                custom_id=f"session_{self.container_tag}",  
-            )
-        
+                custom_id=f"session_{self.container_tag}",
+            ))
+            self._invalidate()
+
         except Exception as e:
-            logger.error(f"Failed to add memory to Supermemory: {e}")
+            logger.error(f"Failed to add memory to Supermemory: {e!r}")
             self.alternative_memory.append_history(content)  # Fallback to local history
 
-    def get_user_long_term_memory(self) -> str:
-        
+    async def _profile(self) -> Any:
+        """The container's profile, from cache while it is younger than profile_ttl."""
+        cached = self._profiles.get(self.container_tag)
+        if cached and time.monotonic() - cached[0] < self.profile_ttl:
+            return cached[1]
+        result = await self._call("profile", lambda: self.supermemory_client.profile(container_tag=self.container_tag))
+        self._profiles[self.container_tag] = (time.monotonic(), result)
+        return result
+
+    async def get_user_long_term_memory(self) -> str:
+
         try:
-            result = self.supermemory_client.profile(container_tag=self.container_tag)
+            result = await self._profile()
             static_memory = result.profile.static or []
             dynamic_memory = result.profile.dynamic or []
             long_term_memory =  "Long term facts: \n " +  "\n".join(static_memory) + "\n --- \n"  + "Recent context: \n" +  "\n".join(dynamic_memory)
 
             return long_term_memory
-        
+
         except Exception as e:
-            logger.error(f"Failed to retrieve memory from Supermemory: {e}")
+            logger.error(f"Failed to retrieve memory from Supermemory: {e!r}")
             return self.alternative_memory.read_long_term()  # Fallback to local long-term memory
 
-    def get_context(self, query: str) -> str:
+    async def get_context(self, query: str = None) -> str:
+        """Get relevant memory context for the current conversation."""
+        key = (self.container_tag, query or "")
+        cached = self._queries.get(key)
+        if cached and time.monotonic() - cached[0] < self.profile_ttl:
+            self._queries.move_to_end(key)
+            return cached[1]
 
         try:
-            """Get relevant memory context for the current conversation."""
-            response = self.supermemory_client.profile(
+            response = await self._call("profile", lambda: self.supermemory_client.profile(
                 container_tag=self.container_tag,
-                q=query, 
+                q=query,
                 threshold=0.6,
-            )
-
-            # Extract profile fields
-            static_context = response.profile.static or []
-            dynamic_context = response.profile.dynamic or []
-
-            # Search results - access via attributes, not dict methods
-            results = response.search_results.results if response.search_results else []
-            relevant_chunks, relevant_memories = [], []
-            
-            for res in results:
-                relevant_memories += res.get("memory", [])
-                relevant_chunks += res.get("chunks", [])
-
-            context = f"""
-                User Background:
-                {chr(10).join(static_context) if static_context else 'No profile yet.'}
-
-                Current Context:
-                {chr(10).join(dynamic_context) if dynamic_context else 'No recent activity.'}
-
-                # Relevant Memories & Info:
-                {chr(10).join(relevant_memories) if relevant_memories else 'None found.'}
-                {chr(10).join(relevant_chunks) if relevant_chunks else 'None found.'}
-                """
-            return context
-        
+            ))
         except Exception as e:
-            logger.error(f"Failed to get memory context from Supermemory: {e}")
-            return self.alternative_memory.get_memory_context()  # Fallback to local memory context
+            logger.error(f"Failed to get memory context from Supermemory: {e!r}")
+            return await self.alternative_memory.get_context()  # Fallback to local memory context
+
+        # The query response carries the full profile too
+        self._profiles[self.container_tag] = (time.monotonic(), response)
+
+        # Extract profile fields
+        static_context = response.profile.static or []
+        dynamic_context = response.profile.dynamic or []
+
+        # Search results - access via attributes, not dict methods
+        results = response.search_results.results if response.search_results else []
+        relevant_chunks, relevant_memories = [], []
+
+        for res in results:
+            relevant_memories += res.get("memory", [])
+            relevant_chunks += res.get("chunks", [])
+
+        context = f"""
+            User Background:
+            {chr(10).join(static_context) if static_context else 'No profile yet.'}
+
+            Current Context:
+            {chr(10).join(dynamic_context) if dynamic_context else 'No recent activity.'}
+
+            # Relevant Memories & Info:
+            {chr(10).join(relevant_memories) if relevant_memories else 'None found.'}
+            {chr(10).join(relevant_chunks) if relevant_chunks else 'None found.'}
+            """
+
+        self._queries[key] = (time.monotonic(), context)
+        while len(self._queries) > self.cache_size:
+            self._queries.popitem(last=False)
+        return context
@@ -20,6 +20,10 @@ class Tool(ABC):
         "array": list,
         "object": dict,
     }
+
+    # Side-effect-free tools may run concurrently with other parallel-safe calls
+    # from the same LLM turn. Anything that mutates state should stay serial.
+    parallel_safe: bool = False
     
     @property
     @abstractmethod
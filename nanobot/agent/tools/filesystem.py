@@ -1,9 +1,20 @@
 """File system tools: read, write, edit."""
 
+import asyncio
+import mmap
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.helpers import file_signature
+
+_SNIFF_BYTES = 8192  # Prefix checked for NUL bytes to detect binary files
+_INDEX_STRIDE = 1000  # Lines between line-index checkpoints
+_INDEX_BLOCK = 1024 * 1024
+_MAX_CACHED_INDEXES = 32
 
 
 def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
@@ -14,11 +25,58 @@ def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
     return resolved
 
 
+class _LineIndex:
+    """
+    Sparse index of line start offsets (every ``_INDEX_STRIDE`` lines).
+
+    Built block by block with ``bytes.count``/``split`` (no per-line Python
+    work), so indexing a large file is a single fast pass; seeking to a line
+    then scans at most one stride of newlines.
+    """
+
+    def __init__(self, mm: mmap.mmap):
+        self.checkpoints = [0]  # Byte offset of lines 1, 1 + stride, 1 + 2 * stride, ...
+        size = len(mm)
+        newlines = 0
+        pos = 0
+        while pos < size:
+            block = mm[pos:pos + _INDEX_BLOCK]
+            count = block.count(b"\n")
+            need = len(self.checkpoints) * _INDEX_STRIDE - newlines  # newlines in this block to the next checkpoint
+            if need <= count:
+                pieces = block.split(b"\n")
+                done, offset = 0, 0
+                while need <= count:
+                    offset += sum(map(len, pieces[done:need])) + (need - done)
+                    done = need
+                    self.checkpoints.append(pos + offset)
+                    need += _INDEX_STRIDE
+            newlines += count
+            pos += len(block)
+        self.total_lines = newlines + (1 if size and mm[size - 1:size] != b"\n" else 0)
+
+    def line_offset(self, mm: mmap.mmap, line: int) -> int:
+        """Byte offset where (1-based) line starts."""
+        cp = min((line - 1) // _INDEX_STRIDE, len(self.checkpoints) - 1)
+        pos = self.checkpoints[cp]
+        for _ in range(line - 1 - cp * _INDEX_STRIDE):
+            nl = mm.find(b"\n", pos)
+            if nl < 0:
+                return len(mm)
+            pos = nl + 1
+        return pos
+
+
 class ReadFileTool(Tool):
     """Tool to read file contents."""
+
+    parallel_safe = True
     
-    def __init__(self, allowed_dir: Path | None = None):
+    def __init__(self, allowed_dir: Path | None = None, max_bytes: int = 16_000):
         self._allowed_dir = allowed_dir
+        self.max_bytes = max_bytes
+        self._indexes: OrderedDict[Path, tuple[tuple[int, int], _LineIndex]] = OrderedDict()
+        self._lock = threading.Lock()
 
     @property
     def name(self) -> str:
@@ -26,7 +84,10 @@ class ReadFileTool(Tool):
     
     @property
     def description(self) -> str:
-        return "Read the contents of a file at the given path."
+        return (
+            "Read the contents of a file at the given path. Large files, or reads with "
+            "offset/limit, return numbered lines plus the total line count; page with offset."
+        )
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -36,26 +97,109 @@ class ReadFileTool(Tool):
                 "path": {
                     "type": "string",
                     "description": "The file path to read"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Line number to start reading from (1-based)",
+                    "minimum": 1
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of lines to read",
+                    "minimum": 1
+                },
+                "max_bytes": {
+                    "type": "integer",
+                    "description": f"Maximum bytes to return (default {self.max_bytes})",
+                    "minimum": 1
                 }
             },
             "required": ["path"]
         }
     
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        offset: int | None = None,
+        limit: int | None = None,
+        max_bytes: int | None = None,
+        **kwargs: Any,
+    ) -> str:
         try:
             file_path = _resolve_path(path, self._allowed_dir)
             if not file_path.exists():
                 return f"Error: File not found: {path}"
             if not file_path.is_file():
                 return f"Error: Not a file: {path}"
-            
-            content = file_path.read_text(encoding="utf-8")
-            return content
+
+            return await asyncio.to_thread(self._read, file_path, path, offset, limit, max_bytes or self.max_bytes)
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
+    def _read(self, file_path: Path, path: str, offset: int | None, limit: int | None, max_bytes: int) -> str:
+        """Blocking part of execute (runs in a worker thread; indexing a big file takes a while)."""
+        with open(file_path, "rb") as f:
+            head = f.read(_SNIFF_BYTES)
+            size = os.fstat(f.fileno()).st_size
+            if b"\0" in head:
+                return f"Error: {path} is a binary file ({size} bytes); not reading it as text"
+            if offset is None and limit is None and size <= max_bytes:
+                return (head + f.read()).decode("utf-8", errors="replace")
+            if size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self._read_lines(file_path, mm, offset or 1, limit, max_bytes)
+
+    def _index(self, file_path: Path, mm: mmap.mmap) -> _LineIndex:
+        """Line index for the file, reused until its mtime or size changes."""
+        sig = file_signature(file_path)
+        with self._lock:
+            cached = self._indexes.get(file_path)
+            if cached and cached[0] == sig:
+                self._indexes.move_to_end(file_path)
+                return cached[1]
+        index = _LineIndex(mm)
+        with self._lock:
+            self._indexes[file_path] = (sig, index)
+            if len(self._indexes) > _MAX_CACHED_INDEXES:
+                self._indexes.popitem(last=False)
+        return index
+
+    def _read_lines(self, file_path: Path, mm: mmap.mmap, offset: int, limit: int | None, max_bytes: int) -> str:
+        """Numbered lines [offset, offset + limit) capped at max_bytes, with a paging header."""
+        index = self._index(file_path, mm)
+        total = index.total_lines
+        if offset > total:
+            return f"[{file_path.name} has {total} lines; offset {offset} is past the end]"
+
+        pos = index.line_offset(mm, offset)
+        end_line = total if limit is None else min(total, offset + limit - 1)
+        out: list[str] = []
+        used = 0
+        line_no = offset
+        while line_no <= end_line:
+            nl = mm.find(b"\n", pos)
+            stop = len(mm) if nl < 0 else nl
+            text = mm[pos:stop].decode("utf-8", errors="replace").rstrip("\r")
+            entry = f"{line_no:>6}\t{text}"
+            size = len(entry.encode("utf-8"))  # The limit is in bytes; non-ASCII text takes more than one
+            if out and used + size + 1 > max_bytes:
+                break
+            if not out and size > max_bytes:
+                entry = entry.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore") + " ... (line truncated)"
+                size = len(entry.encode("utf-8"))
+            out.append(entry)
+            used += size + 1
+            line_no += 1
+            pos = stop + 1
+
+        last = line_no - 1
+        header = f"[Lines {offset}-{last} of {total} in {file_path.name}"
+        header += f"; continue with offset={last + 1}]" if last < total else "]"
+        return header + "\n" + "\n".join(out)
+
 
 class WriteFileTool(Tool):
     """Tool to write content to a file."""
@@ -163,6 +307,8 @@ class EditFileTool(Tool):
 
 class ListDirTool(Tool):
     """Tool to list directory contents."""
+
+    parallel_safe = True
     
     def __init__(self, allowed_dir: Path | None = None):
         self._allowed_dir = allowed_dir
@@ -18,6 +18,9 @@ class MCPToolWrapper(Tool):
         self._name = f"mcp_{server_name}_{tool_def.name}"
         self._description = tool_def.description or tool_def.name
         self._parameters = tool_def.inputSchema or {"type": "object", "properties": {}}
+        # Servers that mark a tool read-only let us dispatch it in parallel
+        annotations = getattr(tool_def, "annotations", None)
+        self.parallel_safe = bool(annotations and getattr(annotations, "readOnlyHint", False))
 
     @property
     def name(self) -> str:
@@ -1,8 +1,10 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.tracing import get_tracer
 
 
 class ToolRegistry:
@@ -53,14 +55,63 @@ class ToolRegistry:
         if not tool:
             return f"Error: Tool '{name}' not found"
 
-        try:
-            errors = tool.validate_params(params)
-            if errors:
-                return f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors)
-            return await tool.execute(**params)
-        except Exception as e:
-            return f"Error executing {name}: {str(e)}"
+        with get_tracer().span("tool", tool=name) as span:
+            try:
+                errors = tool.validate_params(params)
+                if errors:
+                    result = f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors)
+                else:
+                    result = await tool.execute(**params)
+            except Exception as e:
+                result = f"Error executing {name}: {str(e)}"
+            span.set(result_chars=len(result), failed=result.startswith("Error"))
+            return result
     
+    def is_parallel_safe(self, name: str) -> bool:
+        """Check whether a tool may run concurrently with other calls."""
+        tool = self._tools.get(name)
+        return bool(tool and tool.parallel_safe)
+
+    async def execute_many(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        max_parallel: int = 4,
+    ) -> list[str]:
+        """
+        Execute several tool calls, running parallel-safe ones concurrently.
+
+        Consecutive parallel-safe calls are gathered (at most ``max_parallel``
+        at a time); serial-only calls run alone, so their ordering relative to
+        the surrounding calls is preserved.
+
+        Args:
+            calls: (name, params) pairs in the order the LLM emitted them.
+            max_parallel: Concurrency cap; 1 disables parallel dispatch.
+
+        Returns:
+            Results in the same order as ``calls``.
+        """
+        results: list[str] = [""] * len(calls)
+        sem = asyncio.Semaphore(max(1, max_parallel))
+
+        async def _run(i: int) -> None:
+            name, params = calls[i]
+            async with sem:
+                results[i] = await self.execute(name, params)
+
+        batch: list[int] = []
+        for i, (name, _) in enumerate(calls):
+            if max_parallel > 1 and self.is_parallel_safe(name):
+                batch.append(i)
+                continue
+            if batch:
+                await asyncio.gather(*(_run(j) for j in batch))
+                batch = []
+            await _run(i)
+        if batch:
+            await asyncio.gather(*(_run(j) for j in batch))
+        return results
+
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
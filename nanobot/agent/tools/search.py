@@ -0,0 +1,327 @@
+"""Workspace search tool backed by a persistent trigram index."""
+
+import asyncio
+import fnmatch
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.filesystem import _resolve_path
+from nanobot.utils.helpers import ensure_dir
+
+_SKIP_DIRS = {
+    ".git", ".hg", ".svn", ".nanobot", "node_modules", "__pycache__",
+    ".venv", "venv", ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox",
+    ".index",  # memory/.index (vector memory backend)
+}
+_MAX_FILE_BYTES = 2 * 1024 * 1024  # Larger files are not indexed
+_SNIFF_BYTES = 8192
+
+_indexes: dict[Path, "WorkspaceIndex"] = {}
+_indexes_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL
+);
+"""
+
+
+class WorkspaceIndex:
+    """
+    Full-text index of the text files under a directory, stored in SQLite.
+
+    Content lives in an FTS5 table with the ``trigram`` tokenizer, so any
+    substring of three or more characters is answered from the index
+    instead of rescanning every file. ``refresh`` only stats the tree and
+    re-reads files whose mtime or size changed, so keeping the index
+    current costs a directory walk per query. Without FTS5 trigram support
+    (SQLite < 3.34) the stored content is scanned instead, which still
+    avoids reading files from disk.
+    """
+
+    def __init__(self, root: Path, db_path: Path):
+        self.root = root
+        self.db_path = db_path
+        ensure_dir(db_path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(body, tokenize='trigram')"
+            )
+            self.trigram = True
+        except sqlite3.OperationalError:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS docs (body TEXT NOT NULL)")
+            self.trigram = False
+        self._conn.commit()
+
+    def _walk(self) -> dict[str, tuple[int, int]]:
+        """Relative path -> (mtime_ns, size) of every indexable file."""
+        found: dict[str, tuple[int, int]] = {}
+        stack = [self.root]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIP_DIRS:
+                            stack.append(Path(entry.path))
+                    elif entry.is_file(follow_symlinks=False):  # A link could point outside the workspace
+                        st = entry.stat()
+                        if st.st_size <= _MAX_FILE_BYTES:
+                            rel = os.path.relpath(entry.path, self.root)
+                            found[rel] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        return found
+
+    def refresh(self) -> dict[str, int]:
+        """Bring the index up to date with the filesystem. Returns change counts."""
+        current = self._walk()
+        with self._lock, self._conn:
+            indexed = {
+                path: (mtime, size, doc_id)
+                for path, mtime, size, doc_id in self._conn.execute("SELECT path, mtime_ns, size, doc_id FROM files")
+            }
+            removed = [p for p in indexed if p not in current]
+            changed = [p for p, sig in current.items() if p not in indexed or indexed[p][:2] != sig]
+            for path in removed:
+                self._conn.execute("DELETE FROM docs WHERE rowid = ?", (indexed[path][2],))
+                self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            for path in changed:
+                if path in indexed:
+                    self._conn.execute("DELETE FROM docs WHERE rowid = ?", (indexed[path][2],))
+                body = self._read_text(self.root / path)
+                if body is None:  # Binary: remember the signature so it is not re-read
+                    doc_id = -1
+                else:
+                    doc_id = self._conn.execute("INSERT INTO docs (body) VALUES (?)", (body,)).lastrowid
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files (path, mtime_ns, size, doc_id) VALUES (?, ?, ?, ?)",
+                    (path, *current[path], doc_id),
+                )
+        if changed or removed:
+            logger.debug(f"Search index: {len(changed)} files (re)indexed, {len(removed)} removed")
+        return {"indexed": len(changed), "removed": len(removed), "files": len(current)}
+
+    @staticmethod
+    def _read_text(path: Path) -> str | None:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        if b"\0" in data[:_SNIFF_BYTES]:
+            return None
+        return data.decode("utf-8", errors="replace")
+
+    def candidates(self, literal: str | None, prefix: str = "") -> list[tuple[str, str]]:
+        """(path, content) of files that may match; narrowed by the index when a 3+ char literal is given."""
+        like = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self._lock:
+            if literal and len(literal) >= 3 and self.trigram:
+                rows = self._conn.execute(
+                    "SELECT f.path, d.body FROM docs d JOIN files f ON f.doc_id = d.rowid "
+                    "WHERE docs MATCH ? AND f.path LIKE ? ESCAPE '\\'",
+                    ('"' + literal.replace('"', '""') + '"', like),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT f.path, d.body FROM docs d JOIN files f ON f.doc_id = d.rowid "
+                    "WHERE f.path LIKE ? ESCAPE '\\'",
+                    (like,),
+                ).fetchall()
+        return rows
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _literal_of(pattern: str) -> str | None:
+    """
+    Longest run of characters that every match of a regex must contain (None if there is none).
+
+    Only plain characters outside groups and classes count, and a character
+    made optional by ``?``, ``*`` or ``{m,n}`` ends the run without joining it.
+    """
+    if "|" in pattern:
+        return None  # Alternatives need not share any text
+    runs: list[str] = []
+    run = ""
+    depth = 0
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c in "?*{+":
+            if c != "+":
+                run = run[:-1]  # The quantified character may be absent
+            if c == "{":
+                close = pattern.find("}", i)
+                i = close if close >= 0 else i
+        elif c == "\\":
+            i += 1  # Escapes may be classes (\d, \w); don't count them
+        elif c == "[":
+            i += 1
+            if i < n and pattern[i] == "^":
+                i += 1
+            if i < n and pattern[i] == "]":
+                i += 1
+            while i < n and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+        elif c in "()":
+            depth += 1 if c == "(" else -1
+        elif c not in ".^$" and depth == 0:
+            run += c
+            i += 1
+            continue
+        runs.append(run)
+        run = ""
+        i += 1
+    runs.append(run)
+    return max(runs, key=len) or None
+
+
+class SearchFilesTool(Tool):
+    """Search the contents of workspace files."""
+
+    parallel_safe = True
+
+    def __init__(self, workspace: Path, allowed_dir: Path | None = None, index_path: Path | None = None):
+        self.workspace = workspace
+        self._allowed_dir = allowed_dir
+        self._index_path = index_path or workspace / ".nanobot" / "search_index.db"
+        self._index: WorkspaceIndex | None = None
+
+    @property
+    def name(self) -> str:
+        return "search_files"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search file contents in the workspace (including memory/HISTORY.md). "
+            "Returns matching lines with context, files with the most matches first. "
+            "Faster than running grep through exec."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Text to find (case-insensitive), or a regex if regex=true"},
+                "path": {"type": "string", "description": "Limit the search to this file or directory"},
+                "glob": {"type": "string", "description": "Only files matching this pattern, e.g. '*.md'"},
+                "regex": {"type": "boolean", "description": "Treat query as a regular expression"},
+                "context": {"type": "integer", "description": "Context lines around each match (default 2)", "minimum": 0, "maximum": 10},
+                "max_results": {"type": "integer", "description": "Maximum matching lines (default 50)", "minimum": 1, "maximum": 500},
+            },
+            "required": ["query"],
+        }
+
+    def _get_index(self) -> WorkspaceIndex:
+        # One index per database, shared by the main agent and its subagents
+        if self._index is None:
+            with _indexes_lock:
+                key = self._index_path.resolve()
+                if key not in _indexes:
+                    _indexes[key] = WorkspaceIndex(self.workspace.resolve(), self._index_path)
+                self._index = _indexes[key]
+        return self._index
+
+    async def execute(
+        self,
+        query: str,
+        path: str | None = None,
+        glob: str | None = None,
+        regex: bool = False,
+        context: int = 2,
+        max_results: int = 50,
+        **kwargs: Any,
+    ) -> str:
+        try:
+            prefix = ""
+            if path:
+                target = _resolve_path(str(self.workspace / path), self._allowed_dir)
+                root = self.workspace.resolve()
+                if target != root and root not in target.parents:
+                    return f"Error: search_files only searches inside the workspace ({self.workspace})"
+                prefix = "" if target == root else os.path.relpath(target, root)
+            try:
+                pattern = re.compile(query if regex else re.escape(query), re.IGNORECASE)
+            except re.error as e:
+                return f"Error: Invalid regex: {e}"
+            if not regex:
+                literal = query
+            else:
+                literal = None if pattern.flags & re.VERBOSE else _literal_of(query)
+            return await asyncio.to_thread(self._search, query, pattern, literal, prefix, glob, context, max_results)
+        except PermissionError as e:
+            return f"Error: {e}"
+        except Exception as e:
+            return f"Error searching files: {str(e)}"
+
+    def _search(
+        self,
+        query: str,
+        pattern: re.Pattern,
+        literal: str | None,
+        prefix: str,
+        glob: str | None,
+        context: int,
+        max_results: int,
+    ) -> str:
+        index = self._get_index()
+        index.refresh()
+
+        hits: list[tuple[str, list[str], list[int]]] = []
+        for rel, body in index.candidates(literal, prefix):
+            if prefix and rel != prefix and not rel.startswith(prefix.rstrip(os.sep) + os.sep):
+                continue
+            if glob and not (fnmatch.fnmatch(rel, glob) or fnmatch.fnmatch(os.path.basename(rel), glob)):
+                continue
+            lines = body.splitlines()
+            matched = [i for i, line in enumerate(lines) if pattern.search(line)]
+            if matched:
+                hits.append((rel, lines, matched))
+
+        if not hits:
+            return f"No matches for: {query}"
+
+        hits.sort(key=lambda h: (-len(h[2]), h[0]))
+        total = sum(len(h[2]) for h in hits)
+        out = [f"{total} matching lines in {len(hits)} files"]
+        shown = 0
+        for rel, lines, matched in hits:
+            if shown >= max_results:
+                break
+            matched = matched[: max_results - shown]
+            shown += len(matched)
+            out.append(f"\n{rel} ({len(matched)} shown)")
+            keep = set(matched)
+            last = -2
+            for i in sorted({j for m in matched for j in range(max(0, m - context), min(len(lines), m + context + 1))}):
+                if i > last + 1 and last >= 0:
+                    out.append("--")
+                sep = ":" if i in keep else "-"
+                out.append(f"{i + 1}{sep} {lines[i]}")
+                last = i
+        if shown < total:
+            out.append(f"\n... {total - shown} more matching lines (narrow with path/glob or raise max_results)")
+        return "\n".join(out)
@@ -3,10 +3,79 @@
 import asyncio
 import os
 import re
+import shlex
+import signal
+import time
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.shell_session import ShellSession, ShellSessionPool
+
+_POSIX = os.name == "posix"
+_READ_CHUNK = 64 * 1024
+_LIVE_INTERVAL = 1.0  # Seconds between live output updates
+_LIVE_TAIL = 1500  # Characters of output shown in a live update
+
+
+class _HeadTailBuffer:
+    """
+    Keeps the first and last ``max_bytes // 2`` bytes of a stream.
+
+    Output in between is counted but dropped, so memory stays bounded no
+    matter how much a command prints.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.head_cap = max_bytes // 2
+        self.tail_cap = max_bytes - self.head_cap
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def write(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        room = self.head_cap - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            chunk = chunk[room:]
+        if chunk:
+            self.tail += chunk
+            if len(self.tail) > 2 * self.tail_cap:  # Trim in batches, not on every write
+                del self.tail[:-self.tail_cap]
+
+    def tail_text(self, chars: int) -> str:
+        data = self.tail if self.tail else self.head
+        return data[-chars * 4:].decode("utf-8", errors="replace")[-chars:]
+
+    def text(self) -> str:
+        tail = bytes(self.tail[-self.tail_cap:])
+        omitted = self.total - len(self.head) - len(tail)
+        if omitted <= 0:
+            return (bytes(self.head) + tail).decode("utf-8", errors="replace")
+        return (
+            self.head.decode("utf-8", errors="replace")
+            + f"\n... ({omitted} bytes truncated) ...\n"
+            + tail.decode("utf-8", errors="replace")
+        )
+
+
+class _OutputLimitError(Exception):
+    pass
+
+
+def _kill_tree(process: asyncio.subprocess.Process) -> None:
+    """Kill the shell and everything it started (its process group on POSIX)."""
+    try:
+        if _POSIX:
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
 
 
 class ExecTool(Tool):
@@ -19,8 +88,21 @@ class ExecTool(Tool):
         deny_patterns: list[str] | None = None,
         allow_patterns: list[str] | None = None,
         restrict_to_workspace: bool = False,
+        max_output_bytes: int = 10_000,
+        kill_after_bytes: int = 50 * 1024 * 1024,
+        persistent: bool = False,
+        max_shells: int = 4,
+        shell_idle_timeout: float = 600,
     ):
         self.timeout = timeout
+        self.max_output_bytes = max_output_bytes
+        self.kill_after_bytes = kill_after_bytes
+        # Live-output callback and session key are task-local so concurrent sessions don't clobber each other
+        self._on_output: ContextVar[Callable[[str], Awaitable[None]] | None] = ContextVar(
+            f"exec_output_{id(self)}", default=None
+        )
+        self._session_key: ContextVar[str] = ContextVar(f"exec_session_{id(self)}", default="default")
+        self.shells = ShellSessionPool(max_shells, shell_idle_timeout) if persistent and _POSIX else None
         self.working_dir = working_dir
         self.deny_patterns = deny_patterns or [
             r"\brm\s+-[rf]{1,2}\b",          # rm -r, rm -rf, rm -fr
@@ -60,11 +142,28 @@ class ExecTool(Tool):
             "required": ["command"]
         }
     
+    def set_output_callback(self, callback: Callable[[str], Awaitable[None]] | None) -> None:
+        """Stream live output of commands run by the current task to callback (None to disable)."""
+        self._on_output.set(callback)
+
+    def set_session(self, key: str) -> None:
+        """Select the persistent shell used by the current task."""
+        self._session_key.set(key)
+
     async def execute(self, command: str, working_dir: str | None = None, **kwargs: Any) -> str:
         cwd = working_dir or self.working_dir or os.getcwd()
         guard_error = self._guard_command(command, cwd)
         if guard_error:
             return guard_error
+
+        if self.shells is not None:
+            key = self._session_key.get()
+            shell = self.shells.acquire(key, self.working_dir or os.getcwd())
+            if shell is not None:
+                if working_dir:
+                    command = f"cd {shlex.quote(working_dir)} && {{ {command}\n}}"
+                return await self._execute_persistent(key, shell, command)
+            logger.debug("All persistent shells busy, running exec command in a new process")
         
         try:
             process = await asyncio.create_subprocess_shell(
@@ -72,42 +171,112 @@ class ExecTool(Tool):
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
+                start_new_session=_POSIX,  # Own process group, so timeouts kill its children too
             )
-            
+            stdout = _HeadTailBuffer(self.max_output_bytes)
+            stderr = _HeadTailBuffer(self.max_output_bytes)
+            on_output = self._on_output.get()
+            last_live = 0.0
+            killed_for_output = False
+
+            async def pump(stream: asyncio.StreamReader, buf: _HeadTailBuffer) -> None:
+                nonlocal last_live, killed_for_output
+                while chunk := await stream.read(_READ_CHUNK):
+                    if killed_for_output:
+                        continue  # Drain to EOF: process.wait() only returns once every pipe is closed
+                    buf.write(chunk)
+                    if stdout.total + stderr.total > self.kill_after_bytes:
+                        killed_for_output = True
+                        _kill_tree(process)
+                        continue
+                    if on_output and buf is stdout and time.monotonic() - last_live >= _LIVE_INTERVAL:
+                        last_live = time.monotonic()
+                        await on_output(f"$ {command}\n```\n{stdout.tail_text(_LIVE_TAIL)}\n```")
+
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
+                await asyncio.wait_for(
+                    asyncio.gather(pump(process.stdout, stdout), pump(process.stderr, stderr), process.wait()),
                     timeout=self.timeout
                 )
             except asyncio.TimeoutError:
-                process.kill()
+                _kill_tree(process)
+                await process.wait()
                 return f"Error: Command timed out after {self.timeout} seconds"
             
             output_parts = []
             
-            if stdout:
-                output_parts.append(stdout.decode("utf-8", errors="replace"))
+            if stdout.total:
+                output_parts.append(stdout.text())
             
-            if stderr:
-                stderr_text = stderr.decode("utf-8", errors="replace")
+            if stderr.total:
+                stderr_text = stderr.text()
                 if stderr_text.strip():
                     output_parts.append(f"STDERR:\n{stderr_text}")
             
-            if process.returncode != 0:
+            if killed_for_output:
+                output_parts.append(f"\nProcess killed: output exceeded {self.kill_after_bytes} bytes")
+            elif process.returncode != 0:
                 output_parts.append(f"\nExit code: {process.returncode}")
             
-            result = "\n".join(output_parts) if output_parts else "(no output)"
-            
-            # Truncate very long output
-            max_len = 10000
-            if len(result) > max_len:
-                result = result[:max_len] + f"\n... (truncated, {len(result) - max_len} more chars)"
-            
-            return result
+            return "\n".join(output_parts) if output_parts else "(no output)"
             
         except Exception as e:
             return f"Error executing command: {str(e)}"
 
+    async def _execute_persistent(self, key: str, shell: ShellSession, command: str) -> str:
+        """Run a command in the session's long-lived shell (cwd and environment carry over)."""
+        output = _HeadTailBuffer(self.max_output_bytes)
+        on_output = self._on_output.get()
+        last_live = 0.0
+        killed_for_output = False
+
+        async def on_chunk() -> None:
+            nonlocal last_live
+            if output.total > self.kill_after_bytes:
+                raise _OutputLimitError
+            if on_output and time.monotonic() - last_live >= _LIVE_INTERVAL:
+                last_live = time.monotonic()
+                await on_output(f"$ {command}\n```\n{output.tail_text(_LIVE_TAIL)}\n```")
+
+        async with shell.lock:
+            try:
+                # The guard only sees this command; a `cd` from an earlier one carries over
+                if self.restrict_to_workspace and shell.alive:
+                    if await asyncio.wait_for(self._left_working_dir(shell), timeout=self.timeout):
+                        self.shells.discard(key)
+                        return ("Error: Command blocked by safety guard (shell left the working dir; "
+                                "the shell session was restarted)")
+                code = await asyncio.wait_for(shell.run(command, output.write, on_chunk), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self.shells.discard(key)
+                return (f"Error: Command timed out after {self.timeout} seconds "
+                        "(the shell session was restarted; cwd and environment were reset)")
+            except _OutputLimitError:
+                self.shells.discard(key)
+                code, killed_for_output = None, True
+            except Exception as e:
+                self.shells.discard(key)
+                return f"Error executing command: {str(e)}"
+
+        result = output.text() if output.total else ""
+        if killed_for_output:
+            result += f"\nProcess killed: output exceeded {self.kill_after_bytes} bytes (shell session restarted)"
+        elif code is None:
+            self.shells.discard(key)
+            result += "\nShell exited; a new session will start with the next command"
+        elif code != 0:
+            result += f"\nExit code: {code}"
+        return result or "(no output)"
+
+    async def _left_working_dir(self, shell: ShellSession) -> bool:
+        """Whether a persistent shell's current directory is outside the working dir."""
+        out = bytearray()
+        if await shell.run("pwd -P", out.extend) != 0:
+            return True
+        cwd = Path(out.decode("utf-8", errors="replace").strip())
+        root = Path(shell.cwd).resolve()
+        return cwd != root and root not in cwd.parents
+
     def _guard_command(self, command: str, cwd: str) -> str | None:
         """Best-effort safety guard for potentially destructive commands."""
         cmd = command.strip()
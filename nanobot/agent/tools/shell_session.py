@@ -0,0 +1,168 @@
+"""Long-lived shells for the exec tool, one per conversation."""
+
+import asyncio
+import os
+import shlex
+import shutil
+import signal
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+_READ_CHUNK = 64 * 1024
+
+
+class ShellSession:
+    """
+    A shell process that keeps its working directory, environment and shell
+    variables between commands.
+
+    Each command is sent as ``eval '<command>'`` (so a syntax error cannot
+    desynchronize the stream) followed by a ``printf`` of a random sentinel
+    and the exit status; output is read until the sentinel appears. Stdin of
+    the command is /dev/null, and stderr is merged into stdout.
+    """
+
+    def __init__(self, cwd: str):
+        self.cwd = cwd
+        self.process: asyncio.subprocess.Process | None = None
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        bash = shutil.which("bash")
+        argv = [bash, "--noprofile", "--norc"] if bash else ["/bin/sh"]
+        self.process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=self.cwd,
+            start_new_session=True,
+        )
+
+    async def run(
+        self,
+        command: str,
+        write: Callable[[bytes], None],
+        on_chunk: Callable[[], Awaitable[None]] | None = None,
+    ) -> int | None:
+        """
+        Run a command, passing its output to ``write``.
+
+        Returns the exit status, or None if the shell exited (e.g. the
+        command ran ``exit``).
+        """
+        if not self.alive:
+            await self.start()
+        self.last_used = time.monotonic()
+        sentinel = f"__nanobot_done_{uuid.uuid4().hex}__"
+        marker = f"\n{sentinel} ".encode()
+        script = f"eval {shlex.quote(command)} < /dev/null; printf '\\n%s %d\\n' {sentinel} \"$?\"\n"
+        self.process.stdin.write(script.encode())
+        await self.process.stdin.drain()
+
+        stdout = self.process.stdout
+        pending = b""
+        while True:
+            chunk = await stdout.read(_READ_CHUNK)
+            if not chunk:
+                write(pending)
+                await self.process.wait()
+                return None
+            pending += chunk
+            idx = pending.find(marker)
+            if idx >= 0:
+                write(pending[:idx])
+                rest = pending[idx + len(marker):]
+                while b"\n" not in rest:
+                    more = await stdout.read(64)
+                    if not more:
+                        break
+                    rest += more
+                self.last_used = time.monotonic()
+                try:
+                    return int(rest.split(b"\n", 1)[0])
+                except ValueError:
+                    return None
+            # Hold back a possible partial marker at the end of the buffer
+            keep = len(marker) - 1
+            if len(pending) > keep:
+                write(pending[:-keep])
+                pending = pending[-keep:]
+            if on_chunk:
+                await on_chunk()
+
+    def kill(self) -> None:
+        """Kill the shell and everything it started."""
+        if self.process is None or self.process.returncode is not None:
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class ShellSessionPool:
+    """
+    Persistent shells keyed by session, capped in number and reaped when idle.
+
+    When the cap is reached the least recently used idle shell is closed;
+    if every shell is busy, ``acquire`` returns None and the caller falls
+    back to a one-off process.
+    """
+
+    def __init__(self, max_shells: int = 4, idle_timeout: float = 600):
+        self.max_shells = max_shells
+        self.idle_timeout = idle_timeout
+        self._shells: OrderedDict[str, ShellSession] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._shells)
+
+    def acquire(self, key: str, cwd: str) -> ShellSession | None:
+        self.reap_idle()
+        shell = self._shells.get(key)
+        if shell is not None and (shell.alive or shell.process is None):
+            self._shells.move_to_end(key)
+            return shell
+        if shell is not None:
+            del self._shells[key]
+        if len(self._shells) >= self.max_shells and not self._evict_one():
+            return None
+        shell = ShellSession(cwd)
+        self._shells[key] = shell
+        return shell
+
+    def discard(self, key: str) -> None:
+        """Kill and forget a shell (after a timeout or runaway output)."""
+        shell = self._shells.pop(key, None)
+        if shell is not None:
+            shell.kill()
+
+    def reap_idle(self) -> None:
+        if not self.idle_timeout:
+            return
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, shell in list(self._shells.items()):
+            if shell.last_used < cutoff and not shell.lock.locked():
+                logger.debug(f"Closing idle shell for {key}")
+                self.discard(key)
+
+    def _evict_one(self) -> bool:
+        for key, shell in self._shells.items():
+            if not shell.lock.locked():
+                self.discard(key)
+                return True
+        return False
+
+    def close(self) -> None:
+        for key in list(self._shells):
+            self.discard(key)
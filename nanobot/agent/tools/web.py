@@ -1,33 +1,25 @@
 """Web tools: web_search and web_fetch."""
 
-import html
+import asyncio
 import json
+import multiprocessing
 import os
-import re
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
+from loguru import logger
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.web_cache import WebCache, normalize_query, normalize_url
+from nanobot.utils.html_extract import extract_html
+from nanobot.utils.http import HttpPool, get_http_pool
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
-MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
-
-
-def _strip_tags(text: str) -> str:
-    """Remove HTML tags and decode entities."""
-    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
-    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
-    text = re.sub(r'<[^>]+>', '', text)
-    return html.unescape(text).strip()
-
-
-def _normalize(text: str) -> str:
-    """Normalize whitespace."""
-    text = re.sub(r'[ \t]+', ' ', text)
-    return re.sub(r'\n{3,}', '\n\n', text).strip()
 
 
 def _validate_url(url: str) -> tuple[bool, str]:
@@ -47,6 +39,7 @@ class WebSearchTool(Tool):
     """Search the web using Brave Search API."""
     
     name = "web_search"
+    parallel_safe = True
     description = "Search the web. Returns titles, URLs, and snippets."
     parameters = {
         "type": "object",
@@ -57,9 +50,17 @@ class WebSearchTool(Tool):
         "required": ["query"]
     }
     
-    def __init__(self, api_key: str | None = None, max_results: int = 5):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        max_results: int = 5,
+        http: HttpPool | None = None,
+        cache: WebCache | None = None,
+    ):
         self.api_key = api_key or os.environ.get("BRAVE_API_KEY", "")
         self.max_results = max_results
+        self.http = http
+        self.cache = cache
     
     async def execute(self, query: str, count: int | None = None, **kwargs: Any) -> str:
         if not self.api_key:
@@ -67,14 +68,18 @@ class WebSearchTool(Tool):
         
         try:
             n = min(max(count or self.max_results, 1), 10)
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": n},
-                    headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
-                    timeout=10.0
-                )
-                r.raise_for_status()
+            key = f"search:{n}:{normalize_query(query)}"
+            if self.cache and (entry := await self.cache.get(key)) and entry.fresh:
+                return entry.value["text"]
+
+            client = (self.http or get_http_pool()).client
+            r = await client.get(
+                "https://api.search.brave.com/res/v1/web/search",
+                params={"q": query, "count": n},
+                headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+                timeout=10.0
+            )
+            r.raise_for_status()
             
             results = r.json().get("web", {}).get("results", [])
             if not results:
@@ -85,7 +90,10 @@ class WebSearchTool(Tool):
                 lines.append(f"{i}. {item.get('title', '')}\n   {item.get('url', '')}")
                 if desc := item.get("description"):
                     lines.append(f"   {desc}")
-            return "\n".join(lines)
+            text = "\n".join(lines)
+            if self.cache:
+                await self.cache.put(key, {"text": text}, r.headers)
+            return text
         except Exception as e:
             return f"Error: {e}"
 
@@ -94,6 +102,7 @@ class WebFetchTool(Tool):
     """Fetch and extract content from a URL using Readability."""
     
     name = "web_fetch"
+    parallel_safe = True
     description = "Fetch URL and extract readable content (HTML → markdown/text)."
     parameters = {
         "type": "object",
@@ -105,12 +114,21 @@ class WebFetchTool(Tool):
         "required": ["url"]
     }
     
-    def __init__(self, max_chars: int = 50000):
+    def __init__(
+        self,
+        max_chars: int = 50000,
+        http: HttpPool | None = None,
+        cache: WebCache | None = None,
+        max_bytes: int = 5 * 1024 * 1024,
+        extract_timeout: float = 20.0,
+    ):
         self.max_chars = max_chars
+        self.http = http
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self.extract_timeout = extract_timeout
     
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
-        from readability import Document
-
         max_chars = maxChars or self.max_chars
 
         # Validate URL before fetching
@@ -119,45 +137,114 @@ class WebFetchTool(Tool):
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url})
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
-            
-            ctype = r.headers.get("content-type", "")
-            
-            # JSON
-            if "application/json" in ctype:
-                text, extractor = json.dumps(r.json(), indent=2), "json"
-            # HTML
-            elif "text/html" in ctype or r.text[:256].lower().startswith(("<!doctype", "<html")):
-                doc = Document(r.text)
-                content = self._to_markdown(doc.summary()) if extractMode == "markdown" else _strip_tags(doc.summary())
-                text = f"# {doc.title()}\n\n{content}" if doc.title() else content
-                extractor = "readability"
+            key = f"fetch:{extractMode}:{normalize_url(url)}"
+            entry = await self.cache.get(key) if self.cache else None
+            if entry and entry.fresh:
+                page = entry.value
             else:
-                text, extractor = r.text, "raw"
-            
-            truncated = len(text) > max_chars
-            if truncated:
+                headers = {"User-Agent": USER_AGENT}
+                if entry:
+                    headers.update(entry.validators())
+                client = (self.http or get_http_pool()).client
+                async with client.stream(
+                    "GET", url, headers=headers, follow_redirects=True, timeout=30.0
+                ) as r:
+                    if entry and r.status_code == 304:
+                        await self.cache.refresh(key, entry, r.headers)
+                        page = entry.value
+                    else:
+                        r.raise_for_status()
+                        body, cut = await self._read_body(r)
+                        page = await self._extract(r, body, cut, extractMode)
+                        if self.cache:
+                            await self.cache.put(key, page, r.headers)
+
+            text = page["text"]
+            truncated = len(text) > max_chars or page.get("bodyTruncated", False)
+            if len(text) > max_chars:
                 text = text[:max_chars]
             
-            return json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
-                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text})
+            return json.dumps({"url": url, "finalUrl": page["finalUrl"], "status": page["status"],
+                              "extractor": page["extractor"], "truncated": truncated, "length": len(text), "text": text})
+        except asyncio.TimeoutError:
+            return json.dumps({"error": f"Content extraction timed out after {self.extract_timeout}s", "url": url})
         except Exception as e:
             return json.dumps({"error": str(e), "url": url})
-    
-    def _to_markdown(self, html: str) -> str:
-        """Convert HTML to markdown."""
-        # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
-        return _normalize(_strip_tags(text))
+
+    async def _read_body(self, r: httpx.Response) -> tuple[bytes, bool]:
+        """Read the response body up to max_bytes; returns (body, was_cut)."""
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in r.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                return b"".join(chunks)[:self.max_bytes], True
+        return b"".join(chunks), False
+
+    async def _extract(self, r: httpx.Response, body: bytes, cut: bool, extract_mode: str) -> dict[str, Any]:
+        """Extract the full text of a response (cached before truncation, so any maxChars can reuse it)."""
+        ctype = r.headers.get("content-type", "")
+        raw = body.decode(r.encoding or "utf-8", errors="replace")
+        text = None
+        
+        # JSON
+        if "application/json" in ctype and not cut:
+            text, extractor = json.dumps(json.loads(raw), indent=2), "json"
+        # HTML
+        elif "text/html" in ctype or raw[:256].lower().startswith(("<!doctype", "<html")):
+            text, extractor = await _run_extraction(raw, extract_mode, self.extract_timeout), "readability"
+        else:
+            text, extractor = raw, "raw"
+        page = {"finalUrl": str(r.url), "status": r.status_code, "extractor": extractor, "text": text}
+        if cut:
+            page["bodyTruncated"] = True
+        return page
+
+
+# Readability and the markdown regexes are CPU-bound and hold the GIL, so
+# large pages are parsed in worker processes to keep the event loop (and
+# every channel's websocket heartbeat) responsive.
+_INLINE_EXTRACT_CHARS = 64 * 1024  # Smaller pages parse in a few ms, cheaper than a worker round trip
+_EXTRACT_WORKERS = 2
+_extract_pool: ProcessPoolExecutor | None = None
+_extract_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    global _extract_pool
+    if _extract_pool is None:
+        # spawn: forking a process that runs threads (the event loop's executors) is unsafe
+        _extract_pool = ProcessPoolExecutor(_EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _extract_pool
+
+
+def _reset_extract_pool() -> None:
+    """Discard the pool, killing workers stuck on a pathological page."""
+    global _extract_pool
+    pool, _extract_pool = _extract_pool, None
+    if pool is None:
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_extraction(html: str, extract_mode: str, timeout: float) -> str:
+    if len(html) <= _INLINE_EXTRACT_CHARS:
+        return extract_html(html, extract_mode)
+
+    loop = asyncio.get_running_loop()
+    slots = _extract_slots.setdefault(loop, asyncio.Semaphore(_EXTRACT_WORKERS))
+    async with slots:  # Bounded: excess pages wait here instead of queueing in the pool
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(_get_extract_pool(), extract_html, html, extract_mode), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"HTML extraction exceeded {timeout}s, restarting extraction workers")
+            _reset_extract_pool()
+            raise
+        except BrokenProcessPool:
+            _reset_extract_pool()
+            raise
@@ -0,0 +1,247 @@
+"""Two-tier (memory + disk) cache for web_search and web_fetch results."""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Mapping
+from urllib.parse import urlsplit, urlunsplit
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass
+class CacheEntry:
+    """A cached tool result plus the HTTP validators needed to revalidate it."""
+
+    value: dict[str, Any]
+    expires: float
+    etag: str | None = None
+    last_modified: str | None = None
+    stored: float = field(default_factory=time.time)
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for cache keys (lowercase host, no default port or fragment)."""
+    p = urlsplit(url.strip())
+    scheme = p.scheme.lower()
+    host = (p.hostname or "").lower()
+    if p.port and p.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{p.port}"
+    return urlunsplit((scheme, host, p.path or "/", p.query, ""))
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+
+def cache_ttl(headers: Mapping[str, str], default: float) -> float | None:
+    """
+    Seconds a response may be served from cache, honouring Cache-Control.
+
+    Returns None for ``no-store``; 0 for ``no-cache`` (store, but revalidate
+    before every use); ``max-age`` when given; otherwise ``default``.
+    """
+    directives = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+    if "max-age" in directives:
+        try:
+            return max(0.0, float(directives["max-age"]))
+        except ValueError:
+            pass
+    return default
+
+
+class WebCache:
+    """
+    LRU cache in memory backed by one JSON file per entry on disk.
+
+    Memory hits cost nothing; disk hits survive restarts and are shared by
+    every agent, subagent and heartbeat run in the process (and across
+    processes using the same directory). Expired entries that carry an
+    ``ETag`` or ``Last-Modified`` are kept so the caller can revalidate them
+    with a conditional request instead of re-downloading. The disk tier is
+    pruned oldest-first once it exceeds ``max_disk_bytes``. Disk reads and
+    writes run in worker threads; only the memory tier is touched on the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        ttl: float = 3600,
+        max_entries: int = 256,
+        max_disk_bytes: int = 100 * 1024 * 1024,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._disk_bytes: int | None = None  # Summed once on first write, then kept up to date
+        self._disk_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0}
+
+    def _path(self, key: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    async def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for key (fresh, or stale but revalidatable), or None."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        elif self.cache_dir is not None:
+            entry = await asyncio.to_thread(self._load, key)
+            if entry is not None:
+                self._remember(key, entry)
+        self.stats["hits" if entry is not None and entry.fresh else "misses"] += 1
+        return entry
+
+    def _load(self, key: str) -> CacheEntry | None:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            entry = CacheEntry(**json.loads(path.read_text(encoding="utf-8")))
+        except Exception as e:
+            logger.debug(f"Dropping unreadable web cache entry {path.name}: {e}")
+            self._remove(path)
+            return None
+        if not entry.fresh and not entry.revalidatable:
+            self._remove(path)
+            return None
+        return entry
+
+    def _remove(self, path: Path) -> None:
+        with self._disk_lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except OSError:
+                return
+            if self._disk_bytes is not None:
+                self._disk_bytes -= size
+
+    async def put(
+        self,
+        key: str,
+        value: dict[str, Any],
+        headers: Mapping[str, str] | None = None,
+        ttl: float | None = None,
+    ) -> CacheEntry | None:
+        """Store a result; ``headers`` supply Cache-Control and validators. Returns None if not cacheable."""
+        headers = headers or {}
+        lifetime = cache_ttl(headers, self.ttl if ttl is None else ttl)
+        if lifetime is None:
+            return None
+        entry = CacheEntry(
+            value=value,
+            expires=time.time() + lifetime,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+        self._remember(key, entry)
+        await self._write_async(key, entry)
+        return entry
+
+    async def refresh(self, key: str, entry: CacheEntry, headers: Mapping[str, str] | None = None) -> None:
+        """Extend a revalidated entry (HTTP 304) without touching its value."""
+        lifetime = cache_ttl(headers or {}, self.ttl)
+        entry.expires = time.time() + (lifetime or 0)
+        entry.etag = (headers or {}).get("etag") or entry.etag
+        self.stats["revalidated"] += 1
+        await self._write_async(key, entry)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        with self._disk_lock:
+            if self.cache_dir is not None and self.cache_dir.exists():
+                for path in self.cache_dir.glob("*.json"):
+                    path.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _write_async(self, key: str, entry: CacheEntry) -> None:
+        if self.cache_dir is not None:
+            # Serialize on the loop: the entry may be refreshed again while the thread runs
+            data = json.dumps(asdict(entry), ensure_ascii=False)
+            await asyncio.to_thread(self._write, key, data)
+
+    def _write(self, key: str, data: str) -> None:
+        path = self._path(key)
+        with self._disk_lock:
+            try:
+                ensure_dir(path.parent)
+                old_size = path.stat().st_size if path.exists() else 0
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(data, encoding="utf-8")
+                os.replace(tmp, path)
+                if self._disk_bytes is None:
+                    self._disk_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.json"))
+                else:
+                    self._disk_bytes += path.stat().st_size - old_size
+            except OSError as e:
+                logger.warning(f"Failed to write web cache entry: {e}")
+                return
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune()
+
+    def _prune(self) -> None:
+        """Delete the least recently written files until the disk tier is under 90% of its cap."""
+        files = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._disk_bytes = total
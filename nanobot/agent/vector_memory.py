@@ -0,0 +1,259 @@
+"""Local retrieval over MEMORY.md and HISTORY.md with an on-disk vector index."""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.utils.helpers import atomic_write_text, ensure_dir, file_signature
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_TOKEN_RE = re.compile(r"[\w']+", re.UNICODE)
+_HEADING_RE = re.compile(r"^#{1,6}\s", re.MULTILINE)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by did do does for from had has have how i in is it its me my of on or "
+    "our so that the their them then there they this to was we were what when where which who why "
+    "will with you your".split()
+)
+
+# Embeds a batch of texts into an (n, dim) float32 array of unit vectors
+Embedder = Callable[[list[str]], "np.ndarray"]
+
+
+class HashingEmbedder:
+    """
+    Offline embedder: hashed unigrams and bigrams with sublinear term weights.
+
+    No model or vocabulary is needed, so it works on a fresh install and
+    gives the same vector for the same text across runs. Quality is that of
+    a keyword match with some phrase awareness, which suits short memory
+    chunks; pass any other ``Embedder`` for semantic retrieval.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> dict[int, float]:
+        words = [w for w in (t.lower() for t in _TOKEN_RE.findall(text)) if w not in _STOPWORDS]
+        counts: dict[str, int] = {}
+        for term in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            counts[term] = counts.get(term, 0) + 1
+        features: dict[int, float] = {}
+        for term, count in counts.items():
+            digest = hashlib.blake2b(term.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            sign = 1.0 if digest[4] & 1 else -1.0
+            features[bucket] = features.get(bucket, 0.0) + sign * (1.0 + math.log(count))
+        return features
+
+    def __call__(self, texts: list[str]) -> "np.ndarray":
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for bucket, weight in self._features(text).items():
+                vectors[row, bucket] = weight
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def chunk_memory(text: str, max_chars: int) -> list[str]:
+    """Split MEMORY.md into heading sections, then paragraphs when a section is too long."""
+    sections: list[str] = []
+    starts = [m.start() for m in _HEADING_RE.finditer(text)]
+    bounds = ([0] if not starts or starts[0] > 0 else []) + starts + [len(text)]
+    pending = ""  # Headings without a body are carried into the next section
+    for start, end in zip(bounds, bounds[1:]):
+        section = text[start:end].strip()
+        if not section:
+            continue
+        if section.startswith("#") and "\n" not in section:
+            pending = f"{pending}\n{section}" if pending else section
+            continue
+        if pending:
+            section, pending = f"{pending}\n{section}", ""
+        if len(section) <= max_chars:
+            sections.append(section)
+            continue
+        heading, _, body = section.partition("\n") if section.startswith("#") else ("", "", section)
+        sections.extend(_pack(body.split("\n\n"), max_chars, prefix=heading))
+    if pending:
+        sections.append(pending)
+    return sections
+
+
+def chunk_history(text: str, max_chars: int) -> list[str]:
+    """Split HISTORY.md into entries (separated by blank lines)."""
+    return _pack(text.split("\n\n"), max_chars, pack=False)
+
+
+def _pack(paragraphs: list[str], max_chars: int, prefix: str = "", pack: bool = True) -> list[str]:
+    """Group paragraphs into chunks of at most max_chars, hard-splitting oversized ones."""
+    chunks: list[str] = []
+    current = ""
+    for para in (p.strip() for p in paragraphs):
+        if not para:
+            continue
+        while len(para) > max_chars:
+            chunks.append(para[:max_chars])
+            para = para[max_chars:]
+        if pack and current and len(current) + len(para) + 2 <= max_chars:
+            current += "\n\n" + para
+        else:
+            if current:
+                chunks.append(current)
+            current = para
+    if current:
+        chunks.append(current)
+    if prefix:
+        chunks = [f"{prefix}\n{c}" for c in chunks]
+    return chunks
+
+
+class VectorMemoryStore(MemoryStore):
+    """
+    Memory store that retrieves only the chunks relevant to the current message.
+
+    MEMORY.md is chunked by section and HISTORY.md by entry; chunks are
+    embedded and kept in a flat float32 matrix under ``memory/.index``.
+    When a file changes the chunks are recomputed, but vectors are reused by
+    content hash, so appending a history entry embeds only that entry.
+    ``get_context`` returns the ``top_k`` best-scoring chunks, which keeps
+    the memory section of the prompt bounded however large the files grow.
+    Writing and consolidation are unchanged from :class:`MemoryStore`.
+    """
+
+    def __init__(
+        self,
+        workspace: Path,
+        embedder: Embedder | None = None,
+        top_k: int = 6,
+        max_chunk_chars: int = 800,
+    ):
+        if np is None:
+            raise ImportError("numpy is required for the vector memory backend. "
+                              "Please install it with `pip install numpy`.")
+        super().__init__(workspace)
+        self.embedder = embedder or HashingEmbedder()
+        self.embedder_name = getattr(self.embedder, "name", type(self.embedder).__name__)
+        self.top_k = top_k
+        self.max_chunk_chars = max_chunk_chars
+        self.index_dir = self.memory_dir / ".index"
+        self._lock = threading.RLock()  # get_context runs in worker threads
+        self._signature: tuple | None = None
+        self._chunks: list[dict] = []  # {"source", "text", "hash"}, row-aligned with _vectors
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._load()
+
+    def _load(self) -> None:
+        meta_path = self.index_dir / "chunks.json"
+        vectors_path = self.index_dir / "vectors.npy"
+        if not meta_path.exists() or not vectors_path.exists():
+            return
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            vectors = np.load(vectors_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable memory index: {e}")
+            return
+        if meta.get("embedder") != self.embedder_name or len(meta.get("chunks", [])) != len(vectors):
+            return
+        self._chunks = meta["chunks"]
+        self._vectors = vectors
+
+    def _save(self) -> None:
+        # Replace each file whole: a crash mid-write must not leave a truncated index behind
+        ensure_dir(self.index_dir)
+        vectors_path = self.index_dir / "vectors.npy"
+        tmp = vectors_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, self._vectors)
+        os.replace(tmp, vectors_path)
+        atomic_write_text(
+            self.index_dir / "chunks.json",
+            json.dumps({"embedder": self.embedder_name, "chunks": self._chunks}, ensure_ascii=False),
+        )
+
+    def refresh(self) -> None:
+        """Re-chunk and embed whatever changed in MEMORY.md and HISTORY.md."""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        signature = (file_signature(self.memory_file), file_signature(self.history_file))
+        if signature == self._signature:
+            return
+        memory = self.read_long_term()
+        history = self.history_file.read_text(encoding="utf-8") if signature[1] else ""
+        wanted = [("memory", c) for c in chunk_memory(memory, self.max_chunk_chars)]
+        wanted += [("history", c) for c in chunk_history(history, self.max_chunk_chars)]
+
+        known = {c["hash"]: row for row, c in enumerate(self._chunks)}
+        chunks, rows, missing = [], [], []
+        for source, text in wanted:
+            digest = hashlib.sha1(f"{source}\0{text}".encode()).hexdigest()
+            chunks.append({"source": source, "text": text, "hash": digest})
+            rows.append(known.get(digest))
+            if rows[-1] is None:
+                missing.append(len(chunks) - 1)
+
+        fresh = self.embedder([chunks[i]["text"] for i in missing]) if missing else None
+        dim = fresh.shape[1] if fresh is not None else self._vectors.shape[1]
+        vectors = np.zeros((len(chunks), dim), dtype=np.float32)
+        for i, row in enumerate(rows):
+            if row is not None:
+                vectors[i] = self._vectors[row]
+        for j, i in enumerate(missing):
+            vectors[i] = fresh[j]
+
+        changed = bool(missing) or len(chunks) != len(self._chunks)
+        self._chunks, self._vectors, self._signature = chunks, vectors, signature
+        if changed:
+            logger.debug(f"Memory index: {len(missing)} chunks embedded, {len(chunks)} total")
+            self._save()
+
+    def search(self, query: str, top_k: int | None = None) -> list[tuple[float, dict]]:
+        """Best-matching chunks for a query as (score, chunk), highest score first."""
+        with self._lock:
+            self._refresh()
+            k = min(top_k or self.top_k, len(self._chunks))
+            if not k or not query or not query.strip():
+                return []
+            scores = self._vectors @ self.embedder([query])[0]
+            best = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+            ranked = sorted(best, key=lambda i: -scores[i])
+            return [(float(scores[i]), self._chunks[i]) for i in ranked if scores[i] > 0]
+
+    async def get_context(self, query: str = None) -> str:
+        """Relevant long-term memory and history for ``query`` (the first memory sections if none)."""
+        return await asyncio.to_thread(self._context, query)
+
+    def _context(self, query: str | None) -> str:
+        with self._lock:
+            self._refresh()
+            hits = self.search(query) if query else []
+            if not hits:
+                memory = [c["text"] for c in self._chunks if c["source"] == "memory"][: self.top_k]
+                return "## Long-term Memory\n" + "\n\n".join(memory) if memory else ""
+
+            order = {id(c): row for row, c in enumerate(self._chunks)}
+            hits.sort(key=lambda h: order[id(h[1])])  # Keep document (chronological) order
+            memory = [c["text"] for _, c in hits if c["source"] == "memory"]
+            history = [c["text"] for _, c in hits if c["source"] == "history"]
+            parts = []
+            if memory:
+                parts.append("## Long-term Memory (relevant excerpts)\n" + "\n\n".join(memory))
+            if history:
+                parts.append("## Related History\n" + "\n\n".join(history))
+            return "\n\n".join(parts)
@@ -33,5 +33,5 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
-
-
+    stream_id: str | None = None  # Groups progressive updates of one streamed reply
+    partial: bool = False  # True for in-progress updates; content is the full text so far
@@ -18,6 +18,10 @@ class BaseChannel(ABC):
     """
     
     name: str = "base"
+
+    # Channels that can edit a sent message set this to receive partial
+    # (streamed) updates; others only ever get the final reply.
+    supports_streaming: bool = False
     
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -52,6 +56,10 @@ class BaseChannel(ABC):
     async def send(self, msg: OutboundMessage) -> None:
         """
         Send a message through this channel.
+
+        When ``msg.stream_id`` is set, partial messages carry the reply text
+        generated so far and the final (non-partial) message with the same
+        stream_id should replace it.
         
         Args:
             msg: The message to send.
@@ -12,6 +12,7 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import DingTalkConfig
+from nanobot.utils.http import get_http_pool
 
 try:
     from dingtalk_stream import (
@@ -123,7 +124,7 @@ class DingTalkChannel(BaseChannel):
                 return
 
             self._running = True
-            self._http = httpx.AsyncClient()
+            self._http = get_http_pool().client
 
             logger.info(
                 f"Initializing DingTalk Stream Client with Client ID: {self.config.client_id}..."
@@ -155,8 +156,7 @@ class DingTalkChannel(BaseChannel):
         self._running = False
         # Close the shared HTTP client
         if self._http:
-            await self._http.aclose()
-            self._http = None
+            self._http = None  # Shared pool; closed on shutdown
         # Cancel outstanding background tasks
         for task in self._background_tasks:
             task.cancel()
@@ -13,16 +13,19 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import DiscordConfig
+from nanobot.utils.http import get_http_pool
 
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
 MAX_ATTACHMENT_BYTES = 20 * 1024 * 1024  # 20MB
+MAX_MESSAGE_CHARS = 2000  # Discord message content limit
 
 
 class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    supports_streaming = True
 
     def __init__(self, config: DiscordConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -32,6 +35,7 @@ class DiscordChannel(BaseChannel):
         self._heartbeat_task: asyncio.Task | None = None
         self._typing_tasks: dict[str, asyncio.Task] = {}
         self._http: httpx.AsyncClient | None = None
+        self._stream_messages: dict[str, str] = {}  # stream_id -> message id of the live preview
 
     async def start(self) -> None:
         """Start the Discord gateway connection."""
@@ -40,7 +44,7 @@ class DiscordChannel(BaseChannel):
             return
 
         self._running = True
-        self._http = httpx.AsyncClient(timeout=30.0)
+        self._http = get_http_pool().client
 
         while self._running:
             try:
@@ -69,8 +73,7 @@ class DiscordChannel(BaseChannel):
             await self._ws.close()
             self._ws = None
         if self._http:
-            await self._http.aclose()
-            self._http = None
+            self._http = None  # Shared pool; closed on shutdown
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Discord REST API."""
@@ -78,6 +81,11 @@ class DiscordChannel(BaseChannel):
             logger.warning("Discord HTTP client not initialized")
             return
 
+        if msg.stream_id and await self._send_stream_update(msg):
+            if not msg.partial:
+                await self._stop_typing(msg.chat_id)
+            return
+
         url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
         payload: dict[str, Any] = {"content": msg.content}
 
@@ -107,6 +115,53 @@ class DiscordChannel(BaseChannel):
         finally:
             await self._stop_typing(msg.chat_id)
 
+    async def _send_stream_update(self, msg: OutboundMessage) -> bool:
+        """
+        Create or edit the live preview message of a streamed reply.
+
+        Returns True if handled; False means fall back to a normal send.
+        """
+        url = f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages"
+        headers = {"Authorization": f"Bot {self.config.token}"}
+        message_id = self._stream_messages.get(msg.stream_id)
+
+        if msg.partial:
+            if not msg.content or len(msg.content) > MAX_MESSAGE_CHARS:
+                return True
+            try:
+                if message_id is None:
+                    response = await self._http.post(url, headers=headers, json={"content": msg.content})
+                    response.raise_for_status()
+                    self._stream_messages[msg.stream_id] = response.json()["id"]
+                else:
+                    response = await self._http.patch(
+                        f"{url}/{message_id}", headers=headers, json={"content": msg.content}
+                    )
+                    response.raise_for_status()
+            except Exception as e:
+                logger.debug(f"Discord stream update failed: {e}")
+            return True
+
+        self._stream_messages.pop(msg.stream_id, None)
+        if message_id is None:
+            return False
+        if len(msg.content) <= MAX_MESSAGE_CHARS:
+            try:
+                response = await self._http.patch(
+                    f"{url}/{message_id}", headers=headers, json={"content": msg.content}
+                )
+                response.raise_for_status()
+                return True
+            except Exception as e:
+                logger.warning(f"Discord final edit failed, sending new message: {e}")
+        # The reply is sent as a new message; don't leave the partial preview next to it
+        try:
+            response = await self._http.delete(f"{url}/{message_id}", headers=headers)
+            response.raise_for_status()
+        except Exception as e:
+            logger.debug(f"Failed to delete Discord stream preview: {e}")
+        return False
+
     async def _gateway_loop(self) -> None:
         """Main gateway loop: identify, heartbeat, dispatch events."""
         if not self._ws:
@@ -21,8 +21,11 @@ try:
         CreateMessageRequestBody,
         CreateMessageReactionRequest,
         CreateMessageReactionRequestBody,
+        DeleteMessageRequest,
         Emoji,
         P2ImMessageReceiveV1,
+        PatchMessageRequest,
+        PatchMessageRequestBody,
     )
     FEISHU_AVAILABLE = True
 except ImportError:
@@ -99,6 +102,7 @@ class FeishuChannel(BaseChannel):
     """
     
     name = "feishu"
+    supports_streaming = True
     
     def __init__(self, config: FeishuConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -108,6 +112,7 @@ class FeishuChannel(BaseChannel):
         self._ws_thread: threading.Thread | None = None
         self._processed_message_ids: OrderedDict[str, None] = OrderedDict()  # Ordered dedup cache
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._stream_messages: dict[str, str] = {}  # stream_id -> message_id of the live card
     
     async def start(self) -> None:
         """Start the Feishu bot with WebSocket long connection."""
@@ -301,10 +306,16 @@ class FeishuChannel(BaseChannel):
             # Build card with markdown + table support
             elements = self._build_card_elements(msg.content)
             card = {
-                "config": {"wide_screen_mode": True},
+                # Streamed cards must be shared (update_multi) to be patchable
+                "config": {"wide_screen_mode": True, "update_multi": bool(msg.stream_id)},
                 "elements": elements,
             }
             content = json.dumps(card, ensure_ascii=False)
+
+            if msg.stream_id and self._send_stream_update(msg, content):
+                return
+            if msg.partial and not msg.content:
+                return
             
             request = CreateMessageRequest.builder() \
                 .receive_id_type(receive_id_type) \
@@ -325,9 +336,43 @@ class FeishuChannel(BaseChannel):
                 )
             else:
                 logger.debug(f"Feishu message sent to {msg.chat_id}")
+                if msg.partial and response.data:
+                    self._stream_messages[msg.stream_id] = response.data.message_id
                 
         except Exception as e:
             logger.error(f"Error sending Feishu message: {e}")
+
+    def _send_stream_update(self, msg: OutboundMessage, content: str) -> bool:
+        """
+        Patch the live card of a streamed reply, if one was already sent.
+
+        Returns True if handled; False means the caller should create a new card.
+        """
+        message_id = self._stream_messages.get(msg.stream_id)
+        if not msg.partial:
+            self._stream_messages.pop(msg.stream_id, None)
+        if message_id is None:
+            return False
+
+        request = PatchMessageRequest.builder() \
+            .message_id(message_id) \
+            .request_body(
+                PatchMessageRequestBody.builder()
+                .content(content)
+                .build()
+            ).build()
+        response = self._client.im.v1.message.patch(request)
+        if response.success():
+            return True
+        logger.debug(f"Feishu card patch failed: code={response.code}, msg={response.msg}")
+        if msg.partial:
+            return True  # Dropped; the next update or the final reply catches up
+        # The final reply is re-sent as a new card; don't leave the partial one next to it
+        request = DeleteMessageRequest.builder().message_id(message_id).build()
+        response = self._client.im.v1.message.delete(request)
+        if not response.success():
+            logger.debug(f"Feishu preview delete failed: code={response.code}, msg={response.msg}")
+        return False
     
     def _on_message_sync(self, data: "P2ImMessageReceiveV1") -> None:
         """
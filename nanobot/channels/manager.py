@@ -11,6 +11,7 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import Config
+from nanobot.utils.tracing import get_tracer
 
 
 class ChannelManager:
@@ -195,8 +196,11 @@ class ChannelManager:
                 
                 channel = self.channels.get(msg.channel)
                 if channel:
+                    if msg.partial and not channel.supports_streaming:
+                        continue
                     try:
-                        await channel.send(msg)
+                        with get_tracer().span("channel_send", channel=msg.channel, partial=msg.partial):
+                            await channel.send(msg)
                     except Exception as e:
                         logger.error(f"Error sending to {msg.channel}: {e}")
                 else:
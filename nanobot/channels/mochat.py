@@ -17,6 +17,7 @@ from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import MochatConfig
 from nanobot.utils.helpers import get_data_path
+from nanobot.utils.http import get_http_pool
 
 try:
     import socketio
@@ -255,7 +256,7 @@ class MochatChannel(BaseChannel):
             return
 
         self._running = True
-        self._http = httpx.AsyncClient(timeout=30.0)
+        self._http = get_http_pool().client
         self._state_dir.mkdir(parents=True, exist_ok=True)
         await self._load_session_cursors()
         self._seed_targets_from_config()
@@ -291,8 +292,7 @@ class MochatChannel(BaseChannel):
         await self._save_session_cursors()
 
         if self._http:
-            await self._http.aclose()
-            self._http = None
+            self._http = None  # Shared pool; closed on shutdown
         self._ws_connected = self._ws_ready = False
 
     async def send(self, msg: OutboundMessage) -> None:
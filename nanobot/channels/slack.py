@@ -22,6 +22,7 @@ class SlackChannel(BaseChannel):
     """Slack channel using Socket Mode."""
 
     name = "slack"
+    supports_streaming = True
 
     def __init__(self, config: SlackConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -29,6 +30,7 @@ class SlackChannel(BaseChannel):
         self._web_client: AsyncWebClient | None = None
         self._socket_client: SocketModeClient | None = None
         self._bot_user_id: str | None = None
+        self._stream_messages: dict[str, str] = {}  # stream_id -> ts of the live preview
 
     async def start(self) -> None:
         """Start the Slack Socket Mode client."""
@@ -84,14 +86,56 @@ class SlackChannel(BaseChannel):
             channel_type = slack_meta.get("channel_type")
             # Only reply in thread for channel/group messages; DMs don't use threads
             use_thread = thread_ts and channel_type != "im"
+            text = self._to_mrkdwn(msg.content)
+
+            if msg.stream_id and await self._send_stream_update(msg, text, thread_ts if use_thread else None):
+                return
+
             await self._web_client.chat_postMessage(
                 channel=msg.chat_id,
-                text=self._to_mrkdwn(msg.content),
+                text=text,
                 thread_ts=thread_ts if use_thread else None,
             )
         except Exception as e:
             logger.error(f"Error sending Slack message: {e}")
 
+    async def _send_stream_update(self, msg: OutboundMessage, text: str, thread_ts: str | None) -> bool:
+        """
+        Create or update the live preview message of a streamed reply.
+
+        Returns True if handled; False means fall back to a normal post.
+        """
+        ts = self._stream_messages.get(msg.stream_id)
+        if msg.partial:
+            if not text:
+                return True
+            try:
+                if ts is None:
+                    result = await self._web_client.chat_postMessage(
+                        channel=msg.chat_id, text=text, thread_ts=thread_ts,
+                    )
+                    self._stream_messages[msg.stream_id] = result.get("ts")
+                else:
+                    await self._web_client.chat_update(channel=msg.chat_id, ts=ts, text=text)
+            except Exception as e:
+                logger.debug(f"Slack stream update failed: {e}")
+            return True
+
+        self._stream_messages.pop(msg.stream_id, None)
+        if ts is None:
+            return False
+        try:
+            await self._web_client.chat_update(channel=msg.chat_id, ts=ts, text=text)
+            return True
+        except Exception as e:
+            logger.warning(f"Slack final update failed, posting new message: {e}")
+        # The reply is posted as a new message; don't leave the partial preview next to it
+        try:
+            await self._web_client.chat_delete(channel=msg.chat_id, ts=ts)
+        except Exception as e:
+            logger.debug(f"Failed to delete Slack stream preview: {e}")
+        return False
+
     async def _on_socket_request(
         self,
         client: SocketModeClient,
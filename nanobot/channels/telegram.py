@@ -106,6 +106,7 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    supports_streaming = True
     
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -126,6 +127,7 @@ class TelegramChannel(BaseChannel):
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
         self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
+        self._stream_messages: dict[str, int] = {}  # stream_id -> message_id of the live preview
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -224,6 +226,9 @@ class TelegramChannel(BaseChannel):
             logger.error(f"Invalid chat_id: {msg.chat_id}")
             return
 
+        if msg.stream_id and await self._send_stream_update(chat_id, msg):
+            return
+
         # Send media files
         for media_path in (msg.media or []):
             try:
@@ -254,6 +259,56 @@ class TelegramChannel(BaseChannel):
                     except Exception as e2:
                         logger.error(f"Error sending Telegram message: {e2}")
     
+    async def _send_stream_update(self, chat_id: int, msg: OutboundMessage) -> bool:
+        """
+        Create or edit the live preview message of a streamed reply.
+
+        Returns True if the update was fully handled; False means the caller
+        should fall back to a normal send (e.g. final text too long to fit).
+        """
+        message_id = self._stream_messages.get(msg.stream_id)
+        if msg.partial:
+            # Partial text is sent plain: half-written markdown won't convert cleanly
+            if not msg.content or len(msg.content) > 4000:
+                return True
+            try:
+                if message_id is None:
+                    sent = await self._app.bot.send_message(chat_id=chat_id, text=msg.content)
+                    self._stream_messages[msg.stream_id] = sent.message_id
+                else:
+                    await self._app.bot.edit_message_text(
+                        chat_id=chat_id, message_id=message_id, text=msg.content
+                    )
+            except Exception as e:
+                logger.debug(f"Telegram stream update failed: {e}")
+            return True
+
+        self._stream_messages.pop(msg.stream_id, None)
+        if message_id is None:
+            return False
+        chunks = _split_message(msg.content) if msg.content else []
+        if msg.media or len(chunks) != 1:
+            # Can't express the final reply as one edit; replace the preview
+            try:
+                await self._app.bot.delete_message(chat_id=chat_id, message_id=message_id)
+            except Exception as e:
+                logger.debug(f"Failed to delete Telegram stream preview: {e}")
+            return False
+        try:
+            await self._app.bot.edit_message_text(
+                chat_id=chat_id, message_id=message_id,
+                text=_markdown_to_telegram_html(chunks[0]), parse_mode="HTML",
+            )
+        except Exception as e:
+            logger.warning(f"HTML edit failed, falling back to plain text: {e}")
+            try:
+                await self._app.bot.edit_message_text(chat_id=chat_id, message_id=message_id, text=chunks[0])
+            except Exception as e2:
+                if "not modified" not in str(e2).lower():
+                    logger.warning(f"Telegram final edit failed, sending new message: {e2}")
+                    return False
+        return True
+
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
         if not update.message or not update.effective_user:
@@ -284,11 +284,71 @@ This file stores important information that should persist across sessions.
 
 
 def _make_provider(config: Config):
-    """Create LiteLLMProvider from config. Exits if no API key found."""
+    """Create the LLM provider from config, behind the scheduler and response cache. Exits if no API key found."""
+    provider = _make_routed_provider(config)
+    sched = config.llm.scheduler
+    if sched.enabled:
+        from nanobot.providers.scheduler import ProviderScheduler
+        provider = ProviderScheduler(
+            provider,
+            max_concurrency=sched.max_concurrency,
+            requests_per_minute=sched.requests_per_minute,
+            tokens_per_minute=sched.tokens_per_minute,
+            max_retries=sched.max_retries,
+        )
+    if config.llm.cache.enabled:
+        # Outermost, so cache hits take no scheduler slot or rate-limit budget
+        from nanobot.providers.cache import CachingProvider
+        provider = CachingProvider(provider, _make_response_cache(config), force=config.llm.cache.force)
+    return provider
+
+
+def _make_response_cache(config: Config):
+    from nanobot.providers.cache import ResponseCache
+
+    return ResponseCache(
+        Path.home() / ".nanobot" / "cache" / "llm.db",
+        ttl=config.llm.cache.ttl,
+        max_entries=config.llm.cache.max_entries,
+    )
+
+
+def _make_routed_provider(config: Config):
+    """The default model's provider, or a RoutingProvider over it and the configured fallbacks."""
+    model = config.agents.defaults.model
+    primary = _make_model_provider(config, model)
+    if primary is None:
+        console.print("[red]Error: No API key configured.[/red]")
+        console.print("Set one in ~/.nanobot/config.json under providers section")
+        raise typer.Exit(1)
+
+    routing = config.llm.routing
+    backends = [(config.get_provider_name(model) or "default", primary, model)]
+    for fallback in routing.fallback_models:
+        provider = _make_model_provider(config, fallback)
+        if provider is None:
+            console.print(f"[yellow]Warning: No API key configured for fallback model {fallback}, skipping.[/yellow]")
+            continue
+        backends.append((config.get_provider_name(fallback) or "default", provider, fallback))
+    if len(backends) == 1:
+        return primary
+
+    from nanobot.providers.router import RoutingProvider
+    return RoutingProvider(
+        backends,
+        hedge_after=routing.hedge_after,
+        max_error_rate=routing.max_error_rate,
+        window=routing.window,
+        failure_threshold=routing.failure_threshold,
+        reset_timeout=routing.reset_timeout,
+    )
+
+
+def _make_model_provider(config: Config, model: str):
+    """Create the provider serving ``model`` (LiteLLM or Codex). Returns None if it has no API key."""
     from nanobot.providers.litellm_provider import LiteLLMProvider
     from nanobot.providers.openai_codex_provider import OpenAICodexProvider
 
-    model = config.agents.defaults.model
     provider_name = config.get_provider_name(model)
     p = config.get_provider(model)
 
@@ -299,9 +359,7 @@ def _make_provider(config: Config):
     from nanobot.providers.registry import find_by_name
     spec = find_by_name(provider_name)
     if not model.startswith("bedrock/") and not (p and p.api_key) and not (spec and spec.is_oauth):
-        console.print("[red]Error: No API key configured.[/red]")
-        console.print("Set one in ~/.nanobot/config.json under providers section")
-        raise typer.Exit(1)
+        return None
 
     return LiteLLMProvider(
         api_key=p.api_key if p else None,
@@ -312,6 +370,81 @@ def _make_provider(config: Config):
     )
 
 
+def _make_session_store(config: Config):
+    """Create the session storage backend from config."""
+    from nanobot.session import JsonlSessionStore, SQLiteSessionStore
+
+    backend = config.sessions.backend
+    if backend == "sqlite":
+        return SQLiteSessionStore(Path(config.sessions.db_path).expanduser())
+    if backend == "jsonl":
+        return JsonlSessionStore(Path.home() / ".nanobot" / "sessions")
+    console.print(f"[red]Error: Unknown session backend '{backend}' (expected 'jsonl' or 'sqlite').[/red]")
+    raise typer.Exit(1)
+
+
+def _make_session_manager(config: Config):
+    """Create the SessionManager with its store and cache limits from config."""
+    from nanobot.session.manager import SessionManager
+
+    sc = config.sessions
+    return SessionManager(
+        config.workspace_path,
+        max_sessions=sc.max_cached,
+        max_bytes=sc.max_cached_bytes,
+        idle_ttl=sc.idle_ttl,
+        tail_window=sc.tail_window,
+        store=_make_session_store(config),
+    )
+
+
+def _configure_tracing(config: Config) -> None:
+    """Install the process-wide tracer with the exporters enabled in config."""
+    from nanobot.utils.tracing import JsonlSpanExporter, OTelSpanExporter, Tracer, set_tracer
+
+    tc = config.tracing
+    if not tc.enabled:
+        return
+    sinks = []
+    if tc.jsonl:
+        sinks.append(JsonlSpanExporter(Path(tc.log_dir).expanduser()))
+    if tc.otel:
+        try:
+            sinks.append(OTelSpanExporter(endpoint=tc.otel_endpoint, service_name=tc.service_name))
+        except ImportError as e:
+            console.print(f"[yellow]Warning: {e}[/yellow]")
+    set_tracer(Tracer(sinks))
+
+
+def _configure_http_pool(config: Config) -> None:
+    """Install the shared HTTP connection pool with limits from config."""
+    from nanobot.utils.http import HttpPool, set_http_pool
+
+    hc = config.tools.http
+    set_http_pool(HttpPool(
+        max_connections=hc.max_connections,
+        max_keepalive_connections=hc.max_keepalive_connections,
+        max_connections_per_host=hc.max_connections_per_host,
+        keepalive_expiry=hc.keepalive_expiry,
+        http2=hc.http2,
+    ))
+
+
+def _make_web_cache(config: Config):
+    """Create the web_search/web_fetch result cache, or None if disabled."""
+    from nanobot.agent.tools.web_cache import WebCache
+
+    wc = config.tools.web.cache
+    if not wc.enabled:
+        return None
+    return WebCache(
+        Path.home() / ".nanobot" / "cache" / "web",
+        ttl=wc.ttl,
+        max_entries=wc.max_entries,
+        max_disk_bytes=wc.max_disk_mb * 1024 * 1024,
+    )
+
+
 # ============================================================================
 # Gateway / Server
 # ============================================================================
@@ -327,10 +460,10 @@ def gateway(
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
     from nanobot.channels.manager import ChannelManager
-    from nanobot.session.manager import SessionManager
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.utils.http import get_http_pool
     
     if verbose:
         import logging
@@ -341,7 +474,9 @@ def gateway(
     config = load_config()
     bus = MessageBus()
     provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    session_manager = _make_session_manager(config)
+    _configure_http_pool(config)
+    _configure_tracing(config)
     
     # Create cron service first (callback set after agent creation)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
@@ -357,8 +492,19 @@ def gateway(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        consolidation_debounce=config.agents.defaults.consolidation_debounce,
+        max_concurrency=config.agents.defaults.max_concurrency,
+        max_parallel_tools=config.tools.max_parallel_calls,
+        stream=config.agents.defaults.stream,
+        stream_interval=config.agents.defaults.stream_interval,
+        prompt_layout=config.agents.defaults.prompt_layout,
+        context_window_tokens=config.agents.defaults.context_window_tokens or None,
+        max_tool_result_tokens=config.agents.defaults.max_tool_result_tokens,
+        memory_config=config.memory,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        web_fetch_config=config.tools.web.fetch,
+        web_cache=_make_web_cache(config),
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         session_manager=session_manager,
@@ -421,11 +567,13 @@ def gateway(
         except KeyboardInterrupt:
             console.print("\nShutting down...")
         finally:
-            await agent.close_mcp()
             heartbeat.stop()
             cron.stop()
-            agent.stop()
+            await agent.stop()
+            await agent.close_mcp()
             await channels.stop_all()
+            await get_http_pool().aclose()
+            session_manager.close()
     
     asyncio.run(run())
 
@@ -449,11 +597,14 @@ def agent(
     from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
     from nanobot.cron.service import CronService
+    from nanobot.utils.http import get_http_pool
     
     config = load_config()
     
     bus = MessageBus()
     provider = _make_provider(config)
+    _configure_http_pool(config)
+    _configure_tracing(config)
 
     # Create cron service for tool usage (no callback needed for CLI unless running)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
@@ -470,11 +621,23 @@ def agent(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        consolidation_debounce=config.agents.defaults.consolidation_debounce,
+        max_concurrency=config.agents.defaults.max_concurrency,
+        max_parallel_tools=config.tools.max_parallel_calls,
+        stream=config.agents.defaults.stream,
+        stream_interval=config.agents.defaults.stream_interval,
+        prompt_layout=config.agents.defaults.prompt_layout,
+        context_window_tokens=config.agents.defaults.context_window_tokens or None,
+        max_tool_result_tokens=config.agents.defaults.max_tool_result_tokens,
+        memory_config=config.memory,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        web_fetch_config=config.tools.web.fetch,
+        web_cache=_make_web_cache(config),
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         mcp_servers=config.tools.mcp_servers,
+        session_manager=_make_session_manager(config),
     )
     
     # Show spinner when logs are off (no output to miss); skip when logs are on
@@ -491,7 +654,9 @@ def agent(
             with _thinking_ctx():
                 response = await agent_loop.process_direct(message, session_id)
             _print_agent_response(response, render_markdown=markdown)
+            await agent_loop.stop()
             await agent_loop.close_mcp()
+            await get_http_pool().aclose()
         
         asyncio.run(run_once())
     else:
@@ -533,7 +698,9 @@ def agent(
                         console.print("\nGoodbye!")
                         break
             finally:
+                await agent_loop.stop()
                 await agent_loop.close_mcp()
+                await get_http_pool().aclose()
         
         asyncio.run(run_interactive())
 
@@ -863,6 +1030,143 @@ def cron_run(
         console.print(f"[red]Failed to run job {job_id}[/red]")
 
 
+# ============================================================================
+# Session Commands
+# ============================================================================
+
+
+sessions_app = typer.Typer(help="Manage conversation sessions")
+app.add_typer(sessions_app, name="sessions")
+
+
+@sessions_app.command("list")
+def sessions_list():
+    """List stored sessions."""
+    from nanobot.config.loader import load_config
+
+    store = _make_session_store(load_config())
+    sessions = store.list_sessions()
+    store.close()
+
+    if not sessions:
+        console.print("No sessions.")
+        return
+
+    table = Table(title="Sessions")
+    table.add_column("Key", style="cyan")
+    table.add_column("Created")
+    table.add_column("Updated")
+    for info in sessions:
+        table.add_row(info["key"], (info.get("created_at") or "")[:16], (info.get("updated_at") or "")[:16])
+    console.print(table)
+
+
+@sessions_app.command("purge")
+def sessions_purge(
+    days: int = typer.Option(..., "--days", "-d", help="Delete sessions not updated for this many days"),
+):
+    """Delete old sessions."""
+    from datetime import datetime, timedelta
+
+    from nanobot.config.loader import load_config
+
+    store = _make_session_store(load_config())
+    removed = store.purge(datetime.now() - timedelta(days=days))
+    store.close()
+    console.print(f"[green]✓[/green] Removed {removed} session(s) older than {days} day(s)")
+
+
+@sessions_app.command("migrate")
+def sessions_migrate(
+    db: str = typer.Option(None, "--db", help="SQLite database path (default: sessions.db_path from config)"),
+    overwrite: bool = typer.Option(False, "--overwrite", help="Replace sessions already in the database"),
+):
+    """Import JSONL sessions into the SQLite session store."""
+    from nanobot.config.loader import load_config
+    from nanobot.session import JsonlSessionStore, SQLiteSessionStore
+
+    config = load_config()
+    source = JsonlSessionStore(Path.home() / ".nanobot" / "sessions")
+    target = SQLiteSessionStore(Path(db or config.sessions.db_path).expanduser())
+    existing = {info["key"] for info in target.list_sessions()}
+
+    imported = skipped = failed = 0
+    for info in source.list_sessions():
+        key = info["key"]
+        if key in existing and not overwrite:
+            skipped += 1
+            continue
+        session = source.load(key)
+        if session is None:
+            failed += 1
+            continue
+        session._persisted = 0  # Replace whatever the database holds for this key
+        target.save(session)
+        imported += 1
+    target.close()
+
+    console.print(f"[green]✓[/green] Imported {imported} session(s) into {target.db_path}"
+                  f" ({skipped} already present, {failed} unreadable)")
+    if config.sessions.backend != "sqlite":
+        console.print('Set "sessions": {"backend": "sqlite"} in ~/.nanobot/config.json to use it')
+
+
+# ============================================================================
+# LLM Response Cache Commands
+# ============================================================================
+
+
+llm_cache_app = typer.Typer(help="Inspect or purge the LLM response cache")
+app.add_typer(llm_cache_app, name="llm-cache")
+
+
+@llm_cache_app.command("stats")
+def llm_cache_stats(
+    limit: int = typer.Option(10, "--limit", "-n", help="Recently used entries to list"),
+):
+    """Show hit rate, size and recently used entries."""
+    from datetime import datetime
+
+    from nanobot.config.loader import load_config
+
+    config = load_config()
+    cache = _make_response_cache(config)
+    stats = cache.stats()
+    entries = cache.entries(limit)
+    cache.close()
+
+    state = "enabled" if config.llm.cache.enabled else "disabled (llm.cache.enabled)"
+    console.print(f"LLM response cache: {state}")
+    console.print(f"{stats['entries']} entries, {stats['size'] / 1024:.0f} KiB; "
+                  f"{stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+    if not entries:
+        return
+
+    table = Table(title="Recently used")
+    table.add_column("Key", style="cyan")
+    table.add_column("Model")
+    table.add_column("Hits", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Last used")
+    for e in entries:
+        used = datetime.fromtimestamp(e["used_at"]).strftime("%Y-%m-%d %H:%M")
+        table.add_row(e["key"][:12], e["model"], str(e["hits"]), f"{e['size'] / 1024:.1f} KiB", used)
+    console.print(table)
+
+
+@llm_cache_app.command("purge")
+def llm_cache_purge(
+    expired: bool = typer.Option(False, "--expired", help="Only delete entries older than the TTL"),
+):
+    """Delete cached LLM responses (and reset the hit counters)."""
+    from nanobot.config.loader import load_config
+
+    cache = _make_response_cache(load_config())
+    removed = cache.purge(expired_only=expired)
+    cache.close()
+    console.print(f"[green]✓[/green] Removed {removed} cached response(s)")
+
+
 # ============================================================================
 # Status Commands
 # ============================================================================
@@ -165,6 +165,22 @@ class QQConfig(Base):
 class SupermemoryConfig(Base):
     api_key : str = ""          # Supermemory API key
     container_tag: str = ""     # Tag to identify this bot's memory container in Supermemory (e.g. "nanobot-memory")
+    timeout: float = 5.0        # Seconds per API call before falling back to local memory
+    profile_ttl: float = 60.0   # Seconds a fetched profile / query result is reused
+    cache_size: int = 128       # Query results kept (LRU)
+    failure_threshold: int = 3  # Consecutive failures that open the circuit breaker
+    reset_timeout: float = 30.0 # Seconds the breaker stays open before retrying the API
+    outbox_max_items: int = 1000   # Failed conversation uploads kept for replay (oldest dropped beyond this)
+    outbox_batch_size: int = 20    # Queued conversations merged into one upload
+    outbox_concurrency: int = 4    # Replay uploads in flight at once
+
+class MemoryConfig(Base):
+    """Local memory backend configuration (ignored when Supermemory is configured)."""
+
+    backend: str = "file"  # "file": whole MEMORY.md in every prompt; "vector": only the chunks relevant to the message
+    top_k: int = 6  # Chunks of MEMORY.md/HISTORY.md retrieved per message (vector backend)
+    embedding_dim: int = 1024  # Size of the offline hashing embedding
+    max_chunk_chars: int = 800  # Longer sections and entries are split
 
 class ChannelsConfig(Base):
     """Configuration for chat channels."""
@@ -189,6 +205,13 @@ class AgentDefaults(Base):
     temperature: float = 0.7
     max_tool_iterations: int = 20
     memory_window: int = 50
+    consolidation_debounce: float = 5.0  # Seconds to wait (and fold further triggers) before consolidating a session
+    max_concurrency: int = 4  # Messages processed in parallel (same session is always serialized)
+    stream: bool = False  # Stream replies to channels that can edit messages (Telegram, Discord, Slack, Feishu)
+    stream_interval: float = 1.0  # Minimum seconds between partial updates (channel edit rate limits)
+    context_window_tokens: int = 0  # Prompt token budget; 0 = the model's limit from LiteLLM metadata
+    max_tool_result_tokens: int = 4000  # Larger tool outputs are clipped (head + tail)
+    prompt_layout: str = "classic"  # "classic": single system prompt; "cache": stable prompt prefix for provider prompt caching
 
 
 class AgentsConfig(Base):
@@ -225,6 +248,44 @@ class ProvidersConfig(Base):
     github_copilot: ProviderConfig = Field(default_factory=ProviderConfig)  # Github Copilot (OAuth)
 
 
+class ProviderSchedulerConfig(Base):
+    """Queueing, rate limits, retries and coalescing for LLM calls (opt-in; interactive before subagents before background)."""
+
+    enabled: bool = False
+    max_concurrency: int = 8  # LLM requests in flight at once
+    requests_per_minute: int = 0  # Account request limit (0 = unlimited)
+    tokens_per_minute: int = 0  # Account token limit, estimated up front and corrected from usage (0 = unlimited)
+    max_retries: int = 3  # Retries of a 429 / 5xx (honouring Retry-After)
+
+
+class RoutingConfig(Base):
+    """Failover and latency-based routing between the default model and fallbacks."""
+
+    fallback_models: list[str] = Field(default_factory=list)  # Tried after agents.defaults.model; each uses its matching provider
+    hedge_after: float = 0.0  # Seconds before a slow request is also sent to the next backend (0 = its p95, -1 = never)
+    max_error_rate: float = 0.5  # Backends failing more often than this (rolling) are tried last
+    window: int = 100  # Recent requests per backend used for p50/p95 and error rate
+    failure_threshold: int = 3  # Consecutive failures that take a backend out of rotation
+    reset_timeout: float = 60.0  # Seconds before a failed backend is tried again
+
+
+class LLMCacheConfig(Base):
+    """On-disk cache of LLM responses for repeated deterministic requests (opt-in)."""
+
+    enabled: bool = False
+    ttl: int = 86400  # Seconds a cached response is served
+    max_entries: int = 1000  # Least recently used responses are evicted beyond this
+    force: bool = False  # Also cache calls with temperature > 0 (memory consolidation is always cached when enabled)
+
+
+class LLMConfig(Base):
+    """How requests reach the LLM provider."""
+
+    scheduler: ProviderSchedulerConfig = Field(default_factory=ProviderSchedulerConfig)
+    routing: RoutingConfig = Field(default_factory=RoutingConfig)
+    cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+
+
 class GatewayConfig(Base):
     """Gateway/server configuration."""
 
@@ -239,16 +300,50 @@ class WebSearchConfig(Base):
     max_results: int = 5
 
 
+class WebCacheConfig(Base):
+    """Cache for web_search/web_fetch results (memory LRU + ~/.nanobot/cache/web)."""
+
+    enabled: bool = True
+    ttl: int = 3600  # Seconds, unless the response's Cache-Control says otherwise
+    max_entries: int = 256  # Results kept in memory
+    max_disk_mb: int = 100  # Size cap of the on-disk cache
+
+
+class WebFetchConfig(Base):
+    """web_fetch tool configuration."""
+
+    max_bytes: int = 5 * 1024 * 1024  # Stop downloading a page after this many bytes
+    extract_timeout: float = 20.0  # Seconds allowed for Readability extraction of a page
+
+
 class WebToolsConfig(Base):
     """Web tools configuration."""
 
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
+    fetch: WebFetchConfig = Field(default_factory=WebFetchConfig)
+    cache: WebCacheConfig = Field(default_factory=WebCacheConfig)
 
 
 class ExecToolConfig(Base):
     """Shell exec tool configuration."""
 
     timeout: int = 60
+    max_output_bytes: int = 10_000  # Output kept per stream (head + tail); the middle is dropped
+    kill_after_bytes: int = 50 * 1024 * 1024  # Kill the command once it has printed this much
+    stream_output: bool = False  # Show live command output in the streamed reply preview (needs agents.defaults.stream)
+    persistent: bool = False  # Keep one shell per session so cd/env/venv state carries over between commands (POSIX)
+    max_shells: int = 4  # Persistent shells alive at once
+    shell_idle_timeout: int = 600  # Seconds before an unused persistent shell is closed
+
+
+class HttpConfig(Base):
+    """Shared HTTP connection pool used by web tools, transcription and channels."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    max_connections_per_host: int = 10
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    http2: bool = True  # Requires the h2 package (pip install httpx[http2])
 
 
 class MCPServerConfig(Base):
@@ -265,22 +360,50 @@ class ToolsConfig(Base):
 
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
+    max_parallel_calls: int = 4  # Parallel-safe tool calls from one LLM turn run concurrently (1 = serial)
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
 
 
+class SessionConfig(Base):
+    """Session storage, cache and loading configuration."""
+
+    backend: str = "jsonl"  # "jsonl" (one file per session) or "sqlite"
+    db_path: str = "~/.nanobot/sessions.db"  # SQLite database file (sqlite backend)
+    max_cached: int = 256  # Sessions kept in memory (least recently used are evicted)
+    max_cached_bytes: int = 64 * 1024 * 1024  # Approximate memory budget for cached sessions
+    idle_ttl: float = 3600  # Seconds before an unused session is evicted (0 = never)
+    tail_window: int | None = 100  # Read only the last N messages on load; older ones on demand (None = load everything)
+
+
+class TracingConfig(Base):
+    """Per-turn timing spans (queue wait, prompt build, LLM calls, tools, ...)."""
+
+    enabled: bool = False
+    jsonl: bool = True  # Write spans to log_dir/spans-YYYY-MM-DD.jsonl
+    log_dir: str = "~/.nanobot/logs"
+    otel: bool = False  # Also export to OpenTelemetry (needs the opentelemetry packages)
+    otel_endpoint: str = ""  # OTLP/HTTP traces endpoint; empty = the globally configured tracer provider
+    service_name: str = "nanobot"
+
+
 class Config(BaseSettings):
     """Root configuration for nanobot."""
 
     agents: AgentsConfig = Field(default_factory=AgentsConfig)
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
+    llm: LLMConfig = Field(default_factory=LLMConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    sessions: SessionConfig = Field(default_factory=SessionConfig)
     
     # Supermemory configuration for intelligent memory management. If api_key is provided
     # Supermemory will be used as the agent's memory backend instead of local files. 
     supermemory : SupermemoryConfig = Field(default_factory=SupermemoryConfig)
+    memory: MemoryConfig = Field(default_factory=MemoryConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
 
     @property
     def workspace_path(self) -> Path:
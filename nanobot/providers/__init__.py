@@ -1,7 +1,13 @@
 """LLM provider abstraction module."""
 
-from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
+from nanobot.providers.cache import CachingProvider, ResponseCache
 from nanobot.providers.litellm_provider import LiteLLMProvider
 from nanobot.providers.openai_codex_provider import OpenAICodexProvider
+from nanobot.providers.router import RoutingProvider
+from nanobot.providers.scheduler import Priority, ProviderScheduler
 
-__all__ = ["LLMProvider", "LLMResponse", "LiteLLMProvider", "OpenAICodexProvider"]
+__all__ = [
+    "LLMProvider", "LLMResponse", "LLMStreamChunk", "LiteLLMProvider", "OpenAICodexProvider",
+    "RoutingProvider", "ProviderScheduler", "Priority", "CachingProvider", "ResponseCache",
+]
@@ -1,8 +1,10 @@
 """Base LLM provider interface."""
 
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator
 
 
 @dataclass
@@ -21,6 +23,8 @@ class LLMResponse:
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
     reasoning_content: str | None = None  # Kimi, DeepSeek-R1 etc.
+    status_code: int | None = None  # HTTP status of a failed request (finish_reason="error")
+    retry_after: float | None = None  # Seconds the upstream asked us to wait (Retry-After)
     
     @property
     def has_tool_calls(self) -> bool:
@@ -28,6 +32,56 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+@dataclass
+class LLMStreamChunk:
+    """An incremental piece of a streamed LLM response."""
+    delta: str = ""  # Newly generated content text
+    response: LLMResponse | None = None  # Complete response, set on the final chunk only
+
+
+def content_text(content: Any) -> str:
+    """Text of a message content: a plain string, or the text blocks of a content list joined."""
+    if isinstance(content, list):
+        return "\n\n".join(b.get("text", "") for b in content if isinstance(b, dict) and b.get("type") == "text")
+    return content or ""
+
+
+def parse_retry_after(headers: Any) -> float | None:
+    """Seconds to wait from ``retry-after-ms`` / ``Retry-After`` (delta-seconds or HTTP date)."""
+    try:
+        headers = {str(k).lower(): v for k, v in dict(headers or {}).items()}
+    except (TypeError, ValueError):
+        return None
+    if (ms := headers.get("retry-after-ms")) is not None:
+        try:
+            return max(0.0, float(ms) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_response(error: Exception) -> LLMResponse:
+    """Error result for a failed request, keeping the HTTP status and Retry-After for retry logic."""
+    status = getattr(error, "status_code", None)
+    headers = getattr(error, "litellm_response_headers", None) or getattr(getattr(error, "response", None), "headers", None)
+    return LLMResponse(
+        content=f"Error calling LLM: {str(error)}",
+        finish_reason="error",
+        status_code=status if isinstance(status, int) else None,
+        retry_after=parse_retry_after(headers),
+    )
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -64,6 +118,31 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Stream a chat completion as content deltas.
+
+        Yields zero or more chunks carrying ``delta`` text, then exactly one
+        final chunk whose ``response`` holds the assembled LLMResponse
+        (including tool calls). Providers without native streaming fall
+        back to a single chunk built from ``chat``.
+        """
+        response = await self.chat(
+            messages=messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        yield LLMStreamChunk(delta=response.content or "", response=response)
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
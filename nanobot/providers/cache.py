@@ -0,0 +1,240 @@
+"""On-disk cache of LLM responses for repeated, deterministic requests."""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk, ToolCallRequest
+from nanobot.utils.helpers import ensure_dir
+from nanobot.utils.tracing import current_span
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_used ON responses (used_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_forced: ContextVar[bool] = ContextVar("llm_cache_forced", default=False)
+
+
+def force_response_cache(forced: bool = True) -> None:
+    """Cache LLM calls of the current task (and tasks it creates) even at temperature > 0."""
+    _forced.set(forced)
+
+
+def request_key(
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """Stable hash of everything that determines a response."""
+    payload = json.dumps(
+        [model, messages, tools or [], temperature, max_tokens],
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed LRU of LLM responses with a TTL.
+
+    Entries older than ``ttl`` seconds are misses; beyond ``max_entries``
+    the least recently used are evicted. Hit/miss counters live in the
+    database as well, so the CLI can report the gateway's hit rate.
+    ``timeout`` is kept short: while another process holds the write lock
+    (e.g. ``nanobot llm-cache purge``) a lookup fails fast and counts as a
+    miss instead of stalling the turn.
+    """
+
+    def __init__(self, db_path: Path, ttl: float = 86400, max_entries: int = 1000, timeout: float = 1.0):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        ensure_dir(db_path.parent)
+        self._lock = threading.Lock()  # get/put run in worker threads
+        self._conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _count(self, name: str) -> None:
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def get(self, key: str) -> LLMResponse | None:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at > ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            self._conn.execute("UPDATE responses SET used_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self._count("hits")
+        data = json.loads(row[0])
+        data["tool_calls"] = [ToolCallRequest(**tc) for tc in data.get("tool_calls", [])]
+        return LLMResponse(**data)
+
+    def put(self, key: str, model: str, response: LLMResponse) -> None:
+        data = json.dumps(asdict(response), ensure_ascii=False)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, data, len(data), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def purge(self, expired_only: bool = False) -> int:
+        """Delete cached responses (only the expired ones if asked). Returns the number removed."""
+        with self._lock, self._conn:
+            if expired_only:
+                cursor = self._conn.execute("DELETE FROM responses WHERE created_at <= ?", (time.time() - self.ttl,))
+            else:
+                cursor = self._conn.execute("DELETE FROM responses")
+                self._conn.execute("DELETE FROM counters")
+        return cursor.rowcount
+
+    def entries(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Most recently used entries, for inspection."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, model, size, created_at, used_at, hits FROM responses ORDER BY used_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {"key": k, "model": m, "size": s, "created_at": c, "used_at": u, "hits": h}
+            for k, m, s, c, u, h in rows
+        ]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "entries": entries,
+            "size": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachingProvider(LLMProvider):
+    """
+    Serves repeated requests from a :class:`ResponseCache`.
+
+    Only deterministic calls are cached: temperature 0, or any temperature
+    when ``force`` is set or the calling task used :func:`force_response_cache`
+    (memory consolidation does). Error responses are never stored.
+    """
+
+    def __init__(self, provider: LLMProvider, cache: ResponseCache, force: bool = False):
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.cache = cache
+        self.force = force
+        self.bypassed = 0  # Calls not eligible for caching (temperature > 0), this process only
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
+
+    def _key(self, messages, tools, model, max_tokens, temperature) -> str | None:
+        if temperature > 0 and not (self.force or _forced.get()):
+            self.bypassed += 1
+            return None
+        return request_key(model or self.get_default_model(), messages, tools, temperature, max_tokens)
+
+    async def _lookup(self, key: str | None) -> LLMResponse | None:
+        if key is None:
+            return None
+        try:
+            cached = await asyncio.to_thread(self.cache.get, key)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"LLM response cache unavailable: {e}")
+            return None
+        if span := current_span():
+            span.set(cache_hit=cached is not None)
+        return cached
+
+    async def _store(self, key: str, model: str | None, response: LLMResponse) -> None:
+        if response.finish_reason == "error":
+            return
+        try:
+            await asyncio.to_thread(self.cache.put, key, model or self.get_default_model(), response)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache LLM response: {e}")
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        key = self._key(messages, tools, model, max_tokens, temperature)
+        if cached := await self._lookup(key):
+            return cached
+        response = await self.provider.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        )
+        if key:
+            await self._store(key, model, response)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        key = self._key(messages, tools, model, max_tokens, temperature)
+        if cached := await self._lookup(key):
+            if cached.content:
+                yield LLMStreamChunk(delta=cached.content)
+            yield LLMStreamChunk(response=cached)
+            return
+        async for chunk in self.provider.chat_stream(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+        ):
+            if chunk.response is not None and key:
+                await self._store(key, model, chunk.response)
+            yield chunk
@@ -3,12 +3,14 @@
 import json
 import json_repair
 import os
-from typing import Any
+from typing import Any, AsyncIterator
 
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import (
+    LLMProvider, LLMResponse, LLMStreamChunk, ToolCallRequest, content_text, error_response,
+)
 from nanobot.providers.registry import find_by_model, find_gateway
 
 
@@ -103,28 +105,80 @@ class LiteLLMProvider(LLMProvider):
                     kwargs.update(overrides)
                     return
     
-    async def chat(
-        self,
+    def _supports_cache_control(self, model: str) -> bool:
+        """Whether the provider accepts Anthropic-style cache_control breakpoints."""
+        if self._gateway and not self._gateway.supports_prompt_caching:
+            return False
+        # Gateways pass the blocks through, so the upstream model must accept them too
+        spec = find_by_model(model)
+        return bool(spec and spec.supports_prompt_caching)
+
+    @staticmethod
+    def _flatten_system(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Join system content blocks into a plain string for providers without block support."""
+        return [
+            {**m, "content": content_text(m["content"])}
+            if m.get("role") == "system" and isinstance(m.get("content"), list) else m
+            for m in messages
+        ]
+
+    @staticmethod
+    def _apply_cache_control(
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
+        tools: list[dict[str, Any]] | None,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
         """
-        Send a chat completion request via LiteLLM.
-        
-        Args:
-            messages: List of message dicts with 'role' and 'content'.
-            tools: Optional list of tool definitions in OpenAI format.
-            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
-            max_tokens: Maximum tokens in response.
-            temperature: Sampling temperature.
-        
-        Returns:
-            LLMResponse with content and/or tool calls.
+        Mark prompt-cache breakpoints (Anthropic allows at most four).
+
+        Marks the system blocks, the last tool definition, and the last history
+        message before the current user turn, so the next turn can reuse the
+        cached conversation prefix. Inputs are not modified.
         """
+        marker = {"type": "ephemeral"}
+        result = list(messages)
+
+        def mark(index: int) -> None:
+            msg = result[index]
+            content = msg.get("content")
+            if isinstance(content, str) and content:
+                blocks = [{"type": "text", "text": content}]
+            elif isinstance(content, list) and content:
+                blocks = [dict(b) for b in content]
+            else:
+                return
+            blocks[-1]["cache_control"] = marker
+            result[index] = {**msg, "content": blocks}
+
+        if result and result[0].get("role") == "system":
+            content = result[0].get("content")
+            if isinstance(content, list):
+                result[0] = {**result[0], "content": [{**b, "cache_control": marker} for b in content[:2]] + content[2:]}
+            else:
+                mark(0)
+
+        last_user = next((i for i in range(len(result) - 1, -1, -1) if result[i].get("role") == "user"), None)
+        if last_user and result[last_user - 1].get("role") in ("user", "assistant"):
+            mark(last_user - 1)
+
+        if tools:
+            tools = [*tools[:-1], {**tools[-1], "cache_control": marker}]
+        return result, tools
+
+    def _build_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build the acompletion() keyword arguments for a request."""
         model = self._resolve_model(model or self.default_model)
+
+        if self._supports_cache_control(model):
+            messages, tools = self._apply_cache_control(messages, tools)
+        else:
+            messages = self._flatten_system(messages)
         
         # Clamp max_tokens to at least 1 — negative or zero values cause
         # LiteLLM to reject the request with "max_tokens must be at least 1".
@@ -156,16 +210,65 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
+        return kwargs
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request via LiteLLM.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions in OpenAI format.
+            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Returns:
+            LLMResponse with content and/or tool calls.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+
         try:
             response = await acompletion(**kwargs)
             return self._parse_response(response)
         except Exception as e:
             # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+            return error_response(e)
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Stream a chat completion via LiteLLM, yielding content deltas as they arrive."""
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+
+        chunks: list[Any] = []
+        try:
+            stream = await acompletion(**kwargs)
+            async for chunk in stream:
+                chunks.append(chunk)
+                if chunk.choices and (delta := getattr(chunk.choices[0].delta, "content", None)):
+                    yield LLMStreamChunk(delta=delta)
+            # Reassemble the full response (tool call arguments arrive in fragments)
+            response = litellm.stream_chunk_builder(chunks, messages=messages)
+            final = self._parse_response(response)
+        except Exception as e:
+            final = error_response(e)
+        yield LLMStreamChunk(response=final)
+
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
         choice = response.choices[0]
@@ -187,11 +290,20 @@ class LiteLLMProvider(LLMProvider):
         
         usage = {}
         if hasattr(response, "usage") and response.usage:
+            u = response.usage
             usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
+                "prompt_tokens": u.prompt_tokens,
+                "completion_tokens": u.completion_tokens,
+                "total_tokens": u.total_tokens,
             }
+            # Prompt-cache hits: OpenAI-style details, or Anthropic's cache read/write counters
+            details = getattr(u, "prompt_tokens_details", None)
+            cached = getattr(details, "cached_tokens", None) or getattr(u, "cache_read_input_tokens", None)
+            if cached is not None:
+                usage["cached_tokens"] = cached
+            created = getattr(u, "cache_creation_input_tokens", None)
+            if created is not None:
+                usage["cache_creation_tokens"] = created
         
         reasoning_content = getattr(message, "reasoning_content", None)
         
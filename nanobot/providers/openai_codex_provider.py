@@ -11,7 +11,7 @@ import httpx
 from loguru import logger
 
 from oauth_cli_kit import get_token as get_codex_token
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk, ToolCallRequest, content_text
 
 DEFAULT_CODEX_URL = "https://chatgpt.com/backend-api/codex/responses"
 DEFAULT_ORIGINATOR = "nanobot"
@@ -24,14 +24,13 @@ class OpenAICodexProvider(LLMProvider):
         super().__init__(api_key=None, api_base=None)
         self.default_model = default_model
 
-    async def chat(
+    async def _build_request(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+    ) -> tuple[dict[str, str], dict[str, Any]]:
+        """Build request headers and body for the Responses API."""
         model = model or self.default_model
         system_prompt, input_items = _convert_messages(messages)
 
@@ -46,7 +45,7 @@ class OpenAICodexProvider(LLMProvider):
             "input": input_items,
             "text": {"verbosity": "medium"},
             "include": ["reasoning.encrypted_content"],
-            "prompt_cache_key": _prompt_cache_key(messages),
+            "prompt_cache_key": _prompt_cache_key(messages, tools),
             "tool_choice": "auto",
             "parallel_tool_calls": True,
         }
@@ -54,27 +53,65 @@ class OpenAICodexProvider(LLMProvider):
         if tools:
             body["tools"] = _convert_tools(tools)
 
+        return headers, body
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
         url = DEFAULT_CODEX_URL
 
         try:
+            headers, body = await self._build_request(messages, tools, model)
             try:
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=True)
+                response = await _request_codex(url, headers, body, verify=True)
             except Exception as e:
                 if "CERTIFICATE_VERIFY_FAILED" not in str(e):
                     raise
                 logger.warning("SSL certificate verification failed for Codex API; retrying with verify=False")
-                content, tool_calls, finish_reason = await _request_codex(url, headers, body, verify=False)
-            return LLMResponse(
-                content=content,
-                tool_calls=tool_calls,
-                finish_reason=finish_reason,
-            )
+                response = await _request_codex(url, headers, body, verify=False)
+            response.content = response.content or ""
+            return response
         except Exception as e:
             return LLMResponse(
                 content=f"Error calling Codex: {str(e)}",
                 finish_reason="error",
             )
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncGenerator[LLMStreamChunk, None]:
+        url = DEFAULT_CODEX_URL
+        started = False
+
+        try:
+            headers, body = await self._build_request(messages, tools, model)
+            try:
+                async for chunk in _stream_codex(url, headers, body, verify=True):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                # Only safe to retry if nothing has been emitted yet
+                if started or "CERTIFICATE_VERIFY_FAILED" not in str(e):
+                    raise
+                logger.warning("SSL certificate verification failed for Codex API; retrying with verify=False")
+                async for chunk in _stream_codex(url, headers, body, verify=False):
+                    yield chunk
+        except Exception as e:
+            yield LLMStreamChunk(response=LLMResponse(
+                content=f"Error calling Codex: {str(e)}",
+                finish_reason="error",
+            ))
+
     def get_default_model(self) -> str:
         return self.default_model
 
@@ -102,7 +139,7 @@ async def _request_codex(
     headers: dict[str, str],
     body: dict[str, Any],
     verify: bool,
-) -> tuple[str, list[ToolCallRequest], str]:
+) -> LLMResponse:
     async with httpx.AsyncClient(timeout=60.0, verify=verify) as client:
         async with client.stream("POST", url, headers=headers, json=body) as response:
             if response.status_code != 200:
@@ -111,6 +148,21 @@ async def _request_codex(
             return await _consume_sse(response)
 
 
+async def _stream_codex(
+    url: str,
+    headers: dict[str, str],
+    body: dict[str, Any],
+    verify: bool,
+) -> AsyncGenerator[LLMStreamChunk, None]:
+    async with httpx.AsyncClient(timeout=60.0, verify=verify) as client:
+        async with client.stream("POST", url, headers=headers, json=body) as response:
+            if response.status_code != 200:
+                text = await response.aread()
+                raise RuntimeError(_friendly_error(response.status_code, text.decode("utf-8", "ignore")))
+            async for chunk in _stream_sse(response):
+                yield chunk
+
+
 def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Convert OpenAI function-calling schema to Codex flat format."""
     converted: list[dict[str, Any]] = []
@@ -138,7 +190,7 @@ def _convert_messages(messages: list[dict[str, Any]]) -> tuple[str, list[dict[st
         content = msg.get("content")
 
         if role == "system":
-            system_prompt = content if isinstance(content, str) else ""
+            system_prompt = content_text(content)
             continue
 
         if role == "user":
@@ -217,8 +269,11 @@ def _split_tool_call_id(tool_call_id: Any) -> tuple[str, str | None]:
     return "call_0", None
 
 
-def _prompt_cache_key(messages: list[dict[str, Any]]) -> str:
-    raw = json.dumps(messages, ensure_ascii=True, sort_keys=True)
+def _prompt_cache_key(messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None) -> str:
+    """Key requests sharing a stable prefix (tools + leading system block) to the same prompt cache."""
+    system = messages[0].get("content") if messages and messages[0].get("role") == "system" else ""
+    prefix = system[0].get("text", "") if isinstance(system, list) and system else system
+    raw = json.dumps([tools or [], prefix], ensure_ascii=True, sort_keys=True)
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
@@ -242,11 +297,13 @@ async def _iter_sse(response: httpx.Response) -> AsyncGenerator[dict[str, Any],
         buffer.append(line)
 
 
-async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequest], str]:
+async def _stream_sse(response: httpx.Response) -> AsyncGenerator[LLMStreamChunk, None]:
+    """Yield text deltas as they arrive, then a final chunk with the assembled response."""
     content = ""
     tool_calls: list[ToolCallRequest] = []
     tool_call_buffers: dict[str, dict[str, Any]] = {}
     finish_reason = "stop"
+    usage: dict[str, int] = {}
 
     async for event in _iter_sse(response):
         event_type = event.get("type")
@@ -262,7 +319,10 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                     "arguments": item.get("arguments") or "",
                 }
         elif event_type == "response.output_text.delta":
-            content += event.get("delta") or ""
+            delta = event.get("delta") or ""
+            content += delta
+            if delta:
+                yield LLMStreamChunk(delta=delta)
         elif event_type == "response.function_call_arguments.delta":
             call_id = event.get("call_id")
             if call_id and call_id in tool_call_buffers:
@@ -291,12 +351,41 @@ async def _consume_sse(response: httpx.Response) -> tuple[str, list[ToolCallRequ
                     )
                 )
         elif event_type == "response.completed":
-            status = (event.get("response") or {}).get("status")
-            finish_reason = _map_finish_reason(status)
+            completed = event.get("response") or {}
+            finish_reason = _map_finish_reason(completed.get("status"))
+            usage = _map_usage(completed.get("usage") or {})
         elif event_type in {"error", "response.failed"}:
             raise RuntimeError("Codex response failed")
 
-    return content, tool_calls, finish_reason
+    yield LLMStreamChunk(response=LLMResponse(
+        content=content,
+        tool_calls=tool_calls,
+        finish_reason=finish_reason,
+        usage=usage,
+    ))
+
+
+async def _consume_sse(response: httpx.Response) -> LLMResponse:
+    final = LLMResponse(content="")
+    async for chunk in _stream_sse(response):
+        if chunk.response:
+            final = chunk.response
+    return final
+
+
+def _map_usage(usage: dict[str, Any]) -> dict[str, int]:
+    """Map Responses API usage to the chat-completions style keys used by LLMResponse."""
+    if not usage:
+        return {}
+    mapped = {
+        "prompt_tokens": usage.get("input_tokens", 0),
+        "completion_tokens": usage.get("output_tokens", 0),
+        "total_tokens": usage.get("total_tokens", 0),
+    }
+    cached = (usage.get("input_tokens_details") or {}).get("cached_tokens")
+    if cached is not None:
+        mapped["cached_tokens"] = cached
+    return mapped
 
 
 _FINISH_REASON_MAP = {"completed": "stop", "incomplete": "length", "failed": "error", "cancelled": "error"}
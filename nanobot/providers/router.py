@@ -0,0 +1,246 @@
+"""Failover and latency-based routing across several LLM backends."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk, error_response
+from nanobot.utils.breaker import CircuitBreaker
+from nanobot.utils.tracing import current_span
+
+# The request itself is at fault; another backend would reject it too
+NON_FAILOVER_STATUS = {400, 413, 422}
+MIN_SAMPLES = 5  # Outcomes needed before a backend's error rate counts against it
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class Backend:
+    """One provider/model pair with its rolling latency and error statistics."""
+
+    name: str
+    provider: LLMProvider
+    model: str
+    breaker: CircuitBreaker
+    window: int = 100
+    latencies: deque = field(init=False)
+    outcomes: deque = field(init=False)  # True = success
+    requests: int = 0
+    failures: int = 0
+    hedges: int = 0
+
+    def __post_init__(self) -> None:
+        self.latencies = deque(maxlen=self.window)
+        self.outcomes = deque(maxlen=self.window)
+
+    def record(self, ok: bool, latency: float | None = None) -> None:
+        self.outcomes.append(ok)
+        if ok:
+            if latency is not None:
+                self.latencies.append(latency)
+            self.breaker.record_success()
+        else:
+            self.failures += 1
+            self.breaker.record_failure()
+
+    @property
+    def p50(self) -> float | None:
+        return _percentile(list(self.latencies), 0.5)
+
+    @property
+    def p95(self) -> float | None:
+        return _percentile(list(self.latencies), 0.95)
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def healthy(self, max_error_rate: float) -> bool:
+        if self.breaker.state == "open":
+            return False
+        return len(self.outcomes) < MIN_SAMPLES or self.error_rate <= max_error_rate
+
+
+class RoutingProvider(LLMProvider):
+    """
+    Sends each request to the fastest healthy backend and fails over on errors.
+
+    Backends are ranked by rolling p50 latency; the first backend keeps
+    the traffic until the others have been measured (through failover or
+    hedging), and backends whose circuit breaker is open or whose error
+    rate exceeds ``max_error_rate`` go to the back. A request still
+    running after ``hedge_after`` seconds (0 = that backend's p95) is also
+    sent to the next backend and the first good answer wins. An error
+    moves the request on to the next backend, except for errors that
+    blame the request itself (400, 413, 422).
+
+    Each backend is called with its own model; the ``model`` argument of
+    ``chat`` is ignored because the router stands for the whole set.
+    """
+
+    def __init__(
+        self,
+        backends: list[tuple[str, LLMProvider, str]],
+        hedge_after: float = 0.0,
+        min_hedge_delay: float = 1.0,
+        max_error_rate: float = 0.5,
+        window: int = 100,
+        failure_threshold: int = 3,
+        reset_timeout: float = 60.0,
+    ):
+        if not backends:
+            raise ValueError("RoutingProvider needs at least one backend")
+        super().__init__()
+        self.backends = [
+            Backend(name, provider, model, CircuitBreaker(failure_threshold, reset_timeout), window)
+            for name, provider, model in backends
+        ]
+        self.hedge_after = hedge_after
+        self.min_hedge_delay = min_hedge_delay
+        self.max_error_rate = max_error_rate
+
+    def get_default_model(self) -> str:
+        return self.backends[0].model
+
+    def _ranked(self) -> list[Backend]:
+        """Backends in the order they should be tried."""
+        def key(item: tuple[int, Backend]) -> tuple:
+            index, b = item
+            unhealthy = not b.healthy(self.max_error_rate)
+            p50 = b.p50
+            # Unmeasured: the primary counts as fastest, the others as slowest
+            latency = p50 if p50 is not None else (0.0 if index == 0 else float("inf"))
+            return unhealthy, latency, index
+
+        return [b for _, b in sorted(enumerate(self.backends), key=key)]
+
+    def _hedge_delay(self, backend: Backend) -> float | None:
+        if self.hedge_after < 0:
+            return None
+        if self.hedge_after > 0:
+            return self.hedge_after
+        p95 = backend.p95
+        return None if p95 is None else max(p95, self.min_hedge_delay)
+
+    async def _call(self, backend: Backend, **kwargs: Any) -> LLMResponse:
+        backend.requests += 1
+        started = time.monotonic()
+        try:
+            response = await backend.provider.chat(model=backend.model, **kwargs)
+        except asyncio.CancelledError:
+            raise  # Lost a hedge race: neither a success nor a failure
+        except Exception as e:
+            response = error_response(e)
+        failed = response.finish_reason == "error" and response.status_code not in NON_FAILOVER_STATUS
+        backend.record(not failed, time.monotonic() - started)
+        if failed:
+            logger.warning(f"LLM backend {backend.name} failed: {response.content[:200]}")
+        elif span := current_span():
+            span.set(backend=backend.name, backend_model=backend.model)
+        return response
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        kwargs = dict(messages=messages, tools=tools, max_tokens=max_tokens, temperature=temperature)
+        order = self._ranked()
+        running: dict[asyncio.Task, Backend] = {}
+        next_index = 0
+        hedged = False
+        last: LLMResponse | None = None
+
+        def launch() -> None:
+            nonlocal next_index
+            backend = order[next_index]
+            next_index += 1
+            running[asyncio.create_task(self._call(backend, **kwargs))] = backend
+
+        try:
+            launch()
+            while running:
+                delay = None
+                if not hedged and next_index < len(order):
+                    delay = self._hedge_delay(order[0])
+                done, _ = await asyncio.wait(running, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    order[next_index].hedges += 1
+                    logger.debug(f"LLM backend {order[0].name} slow, hedging on {order[next_index].name}")
+                    launch()
+                    continue
+                for task in done:
+                    running.pop(task)
+                    response = task.result()
+                    if response.finish_reason != "error" or response.status_code in NON_FAILOVER_STATUS:
+                        return response
+                    last = response
+                if not running and next_index < len(order):
+                    launch()
+            return last
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        # Streams cannot be hedged, but fail over while nothing has been shown yet
+        final: LLMResponse | None = None
+        for backend in self._ranked():
+            backend.requests += 1
+            started = time.monotonic()
+            streamed = False
+            final = None
+            async for chunk in backend.provider.chat_stream(
+                messages=messages, tools=tools, model=backend.model, max_tokens=max_tokens, temperature=temperature,
+            ):
+                if chunk.response is not None:
+                    final = chunk.response
+                    break
+                streamed = True
+                yield chunk
+            if final is None:
+                final = LLMResponse(content="Error calling LLM: stream ended without a response", finish_reason="error")
+            failed = final.finish_reason == "error" and final.status_code not in NON_FAILOVER_STATUS
+            backend.record(not failed, time.monotonic() - started)
+            if not failed or streamed:
+                break
+            logger.warning(f"LLM backend {backend.name} failed: {final.content[:200]}")
+        yield LLMStreamChunk(response=final)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Rolling latency, error rate and breaker state per backend, in routing order."""
+        return [
+            {
+                "name": b.name,
+                "model": b.model,
+                "state": b.breaker.state,
+                "p50": b.p50,
+                "p95": b.p95,
+                "error_rate": b.error_rate,
+                "requests": b.requests,
+                "failures": b.failures,
+                "hedges": b.hedges,
+            }
+            for b in self._ranked()
+        ]
@@ -0,0 +1,320 @@
+"""Priority scheduling, rate limiting and retries in front of an LLM provider."""
+
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
+from nanobot.providers.cache import request_key
+from nanobot.utils.tracing import current_span
+
+# 429 plus transient server errors (529: Anthropic "overloaded")
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower values are served first."""
+
+    INTERACTIVE = 0  # A user is waiting for the reply
+    SUBAGENT = 1
+    BACKGROUND = 2  # Cron, heartbeat, memory consolidation
+
+
+_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+def set_priority(priority: Priority) -> None:
+    """Set the priority of LLM calls made by the current task (and tasks it creates)."""
+    _priority.set(priority)
+
+
+@contextmanager
+def llm_priority(priority: Priority):
+    """Run a block with the given LLM call priority, restoring the previous one afterwards."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+class TokenBucket:
+    """Refills ``rate_per_minute`` units per minute up to one minute's worth; 0 disables the limit."""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.capacity / 60)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 = now)."""
+        if not self.capacity:
+            return 0.0
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing * 60 / self.capacity)
+
+    def take(self, amount: float) -> None:
+        """Consume units; the level may go negative (debt is repaid before the next grant)."""
+        if self.capacity:
+            self._refill()
+            self.level -= amount
+
+
+def estimate_tokens(messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None, max_tokens: int) -> int:
+    """Rough request size for rate limiting: ~4 characters per prompt token plus the completion budget."""
+    chars = len(json.dumps(messages, ensure_ascii=False, default=str))
+    if tools:
+        chars += len(json.dumps(tools, ensure_ascii=False))
+    return chars // 4 + max_tokens
+
+
+class ProviderScheduler(LLMProvider):
+    """
+    Shares one provider between every caller with priorities, rate limits and retries.
+
+    Requests wait in a priority queue (interactive before subagents before
+    background work, FIFO within a class) for one of ``max_concurrency``
+    slots and for the request and token buckets. A 429 or transient 5xx is
+    retried with exponential backoff and jitter; a ``Retry-After`` from the
+    upstream pauses all dispatching for that long, since the limit is
+    usually per account rather than per request. Token usage reported by
+    the response corrects the estimate charged up front. Identical ``chat``
+    requests issued while one is in flight wait for that call and share
+    its response instead of sending a duplicate.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        max_concurrency: int = 8,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._queue: list[list[Any]] = []  # [priority, seq, future, tokens]
+        self._seq = itertools.count()
+        self._active = 0
+        self._paused_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._inflight: dict[str, asyncio.Future] = {}  # request_key -> response of the call in flight
+        self._stats = {"requests": 0, "retries": 0, "rate_limited": 0, "errors": 0, "coalesced": 0}
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
+
+    # -- queueing -------------------------------------------------------------
+
+    def _pump(self) -> None:
+        """Grant slots to queued requests in priority order while limits allow."""
+        self._timer = None
+        while self._queue and self._active < self.max_concurrency:
+            entry = self._queue[0]
+            if entry[2].done():  # Cancelled while waiting
+                heapq.heappop(self._queue)
+                continue
+            wait = max(
+                self._paused_until - time.monotonic(),
+                self.requests.delay(1),
+                self.tokens.delay(entry[3]),
+            )
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._pump)
+                return
+            heapq.heappop(self._queue)
+            self.requests.take(1)
+            self.tokens.take(entry[3])
+            self._active += 1
+            entry[2].set_result(None)
+
+    async def _acquire(self, priority: Priority, tokens: int, seq: int | None = None) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, [priority, next(self._seq) if seq is None else seq, future, tokens])
+        if self._timer is None:
+            self._pump()
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # Granted just before the cancellation
+            raise
+        waited = time.monotonic() - started
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        if span := current_span():
+            span.set(scheduler_wait=round(waited, 3))
+
+    def _release(self) -> None:
+        self._active -= 1
+        if self._timer is None:
+            self._pump()
+
+    def _retry_delay(self, response: LLMResponse, attempt: int) -> float | None:
+        """Backoff before the next attempt, or None if the error is not worth retrying."""
+        if response.finish_reason != "error" or attempt >= self.max_retries:
+            return None
+        if response.status_code not in RETRYABLE_STATUS:
+            return None
+        if response.status_code == 429:
+            self._stats["rate_limited"] += 1
+        if response.retry_after is not None:
+            delay = min(response.retry_after, self.max_delay)
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            return delay
+        backoff = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return random.uniform(backoff / 2, backoff)
+
+    def _settle(self, response: LLMResponse, estimate: int) -> None:
+        """Correct the token bucket with the usage the provider reported."""
+        if actual := response.usage.get("total_tokens"):
+            self.tokens.take(actual - estimate)
+        if response.finish_reason == "error":
+            self._stats["errors"] += 1
+
+    # -- LLMProvider ----------------------------------------------------------
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        key = request_key(model or self.get_default_model(), messages, tools, temperature, max_tokens)
+        while (shared := self._inflight.get(key)) is not None:
+            try:
+                response = await asyncio.shield(shared)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                continue  # The call we joined was abandoned; make our own
+            self._stats["coalesced"] += 1
+            return response
+
+        shared = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await self._chat(messages, tools, model, max_tokens, temperature)
+        except BaseException:
+            shared.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+        shared.set_result(response)
+        return response
+
+    async def _chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> LLMResponse:
+        priority = current_priority()
+        estimate = estimate_tokens(messages, tools, max_tokens)
+        seq = next(self._seq)  # Retries keep their place in line
+        attempt = 0
+        while True:
+            await self._acquire(priority, estimate, seq)
+            try:
+                self._stats["requests"] += 1
+                response = await self.provider.chat(
+                    messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+                )
+                self._settle(response, estimate)
+            finally:
+                self._release()
+            delay = self._retry_delay(response, attempt)
+            if delay is None:
+                return response
+            attempt += 1
+            self._stats["retries"] += 1
+            logger.warning(f"LLM request failed (HTTP {response.status_code}), retry {attempt} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        priority = current_priority()
+        estimate = estimate_tokens(messages, tools, max_tokens)
+        seq = next(self._seq)
+        attempt = 0
+        while True:
+            await self._acquire(priority, estimate, seq)
+            final: LLMResponse | None = None
+            streamed = False
+            try:
+                self._stats["requests"] += 1
+                async for chunk in self.provider.chat_stream(
+                    messages=messages, tools=tools, model=model, max_tokens=max_tokens, temperature=temperature,
+                ):
+                    if chunk.response is not None:
+                        final = chunk.response
+                        self._settle(final, estimate)
+                        break
+                    streamed = True
+                    yield chunk
+            finally:
+                self._release()
+            # Only retry if nothing was shown yet; a partial reply cannot be taken back
+            delay = None if final is None or streamed else self._retry_delay(final, attempt)
+            if delay is None:
+                if final is not None:
+                    yield LLMStreamChunk(response=final)
+                return
+            attempt += 1
+            self._stats["retries"] += 1
+            logger.warning(f"LLM stream failed (HTTP {final.status_code}), retry {attempt} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth per priority class, in-flight requests, retry and coalescing counters."""
+        queued = {p.name.lower(): 0 for p in Priority}
+        for entry in self._queue:
+            if not entry[2].done():
+                queued[Priority(entry[0]).name.lower()] += 1
+        granted = self._stats["requests"]
+        return {
+            "queued": queued,
+            "active": self._active,
+            **self._stats,
+            "avg_wait": self._wait_total / granted if granted else 0.0,
+            "max_wait": self._wait_max,
+        }
@@ -4,9 +4,10 @@ import os
 from pathlib import Path
 from typing import Any
 
-import httpx
 from loguru import logger
 
+from nanobot.utils.http import HttpPool, get_http_pool
+
 
 class GroqTranscriptionProvider:
     """
@@ -15,8 +16,9 @@ class GroqTranscriptionProvider:
     Groq offers extremely fast transcription with a generous free tier.
     """
     
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, http: HttpPool | None = None):
         self.api_key = api_key or os.environ.get("GROQ_API_KEY")
+        self.http = http
         self.api_url = "https://api.groq.com/openai/v1/audio/transcriptions"
     
     async def transcribe(self, file_path: str | Path) -> str:
@@ -39,26 +41,26 @@ class GroqTranscriptionProvider:
             return ""
         
         try:
-            async with httpx.AsyncClient() as client:
-                with open(path, "rb") as f:
-                    files = {
-                        "file": (path.name, f),
-                        "model": (None, "whisper-large-v3"),
-                    }
-                    headers = {
-                        "Authorization": f"Bearer {self.api_key}",
-                    }
-                    
-                    response = await client.post(
-                        self.api_url,
-                        headers=headers,
-                        files=files,
-                        timeout=60.0
-                    )
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("text", "")
+            client = (self.http or get_http_pool()).client
+            with open(path, "rb") as f:
+                files = {
+                    "file": (path.name, f),
+                    "model": (None, "whisper-large-v3"),
+                }
+                headers = {
+                    "Authorization": f"Bearer {self.api_key}",
+                }
+                
+                response = await client.post(
+                    self.api_url,
+                    headers=headers,
+                    files=files,
+                    timeout=60.0
+                )
+                
+                response.raise_for_status()
+                data = response.json()
+                return data.get("text", "")
                     
         except Exception as e:
             logger.error(f"Groq transcription error: {e}")
@@ -1,5 +1,8 @@
 """Session management module."""
 
-from nanobot.session.manager import SessionManager, Session
+from nanobot.session.base import Session, SessionStore
+from nanobot.session.jsonl_store import JsonlSessionStore
+from nanobot.session.manager import SessionManager
+from nanobot.session.sqlite_store import SQLiteSessionStore
 
-__all__ = ["SessionManager", "Session"]
+__all__ = ["SessionManager", "Session", "SessionStore", "JsonlSessionStore", "SQLiteSessionStore"]
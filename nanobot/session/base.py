@@ -0,0 +1,165 @@
+"""Session model and the storage backend interface."""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable
+
+
+@dataclass
+class Session:
+    """
+    A conversation session.
+
+    Stores messages in JSONL format for easy reading and persistence.
+
+    Important: Messages are append-only for LLM cache efficiency.
+    The consolidation process writes summaries to MEMORY.md/HISTORY.md
+    but does NOT modify the messages list or get_history() output.
+    """
+
+    key: str  # channel:chat_id
+    messages: list[dict[str, Any]] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    metadata: dict[str, Any] = field(default_factory=dict)
+    last_consolidated: int = 0  # Number of messages already consolidated to files
+    # Number of entries of `messages` already appended to the session file; 0 forces a full rewrite
+    _persisted: int = field(default=0, init=False, repr=False, compare=False)
+    # Tail loading: number of older messages left on disk, and how to fetch them
+    _offset: int = field(default=0, init=False, repr=False, compare=False)
+    _prefix_loader: Callable[[int, int], list[dict[str, Any]]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # (message_count, last_consolidated, updated_at, metadata) as of the last save/load
+    _saved_state: tuple | None = field(default=None, init=False, repr=False, compare=False)
+
+    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
+        """Add a message to the session."""
+        msg = {
+            "role": role,
+            "content": content,
+            "timestamp": datetime.now().isoformat(),
+            **kwargs
+        }
+        self.messages.append(msg)
+        self.updated_at = datetime.now()
+
+    @property
+    def message_count(self) -> int:
+        """Total number of messages, including older ones not yet loaded from disk."""
+        return self._offset + len(self.messages)
+
+    def ensure_loaded(self, start: int = 0) -> None:
+        """Make sure messages from absolute index ``start`` onward are in memory."""
+        start = max(0, start)
+        if start >= self._offset or self._prefix_loader is None:
+            return
+        prefix = self._prefix_loader(start, self._offset)
+        self.messages = prefix + self.messages
+        self._persisted += len(prefix)
+        self._offset = start
+        if not self._offset:
+            self._prefix_loader = None
+
+    def window(self, start: int, end: int | None = None) -> list[dict[str, Any]]:
+        """Messages by absolute index (``end`` may be negative), loading older ones if needed."""
+        self.ensure_loaded(start)
+        begin = max(0, start - self._offset)
+        if end is not None and end >= 0:
+            end = max(0, end - self._offset)
+        return self.messages[begin:end]
+
+    def get_history(self, max_messages: int = 500) -> list[dict[str, Any]]:
+        """Get recent messages in LLM format (role + content only)."""
+        if max_messages > len(self.messages):
+            self.ensure_loaded(self.message_count - max_messages)
+        return [{"role": m["role"], "content": m["content"]} for m in self.messages[-max_messages:]]
+
+    def clear(self) -> None:
+        """Clear all messages and reset session to initial state."""
+        self.messages = []
+        self.last_consolidated = 0
+        self.updated_at = datetime.now()
+        self._persisted = 0
+        self._offset = 0
+        self._prefix_loader = None
+
+    def _state(self) -> tuple:
+        return (self.message_count, self.last_consolidated, self.updated_at, dict(self.metadata))
+
+    @property
+    def is_dirty(self) -> bool:
+        """True if the session changed since it was last saved or loaded."""
+        return self._state() != self._saved_state
+
+
+class SessionStore(ABC):
+    """
+    Abstract base class for session storage backends.
+
+    Backends persist sessions incrementally: ``Session._persisted`` counts the
+    in-memory messages already stored, and ``save`` writes only the ones after
+    it. ``_persisted == 0`` means the stored copy has diverged (or does not
+    exist yet) and must be replaced. Loaders may return only the last ``tail``
+    messages and set ``Session._prefix_loader`` to fetch older ones on demand.
+    """
+
+    @abstractmethod
+    def load(self, key: str, tail: int | None = None) -> Session | None:
+        """
+        Load a session.
+
+        Args:
+            key: Session key (usually channel:chat_id).
+            tail: If set, load only the most recent ``tail`` messages.
+
+        Returns:
+            The session, or None if it does not exist or cannot be read.
+        """
+        pass
+
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        """Persist a session and update its ``_persisted`` counter."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete a stored session, if present."""
+        pass
+
+    @abstractmethod
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List stored sessions (key, created_at, updated_at), most recently updated first."""
+        pass
+
+    def purge(self, older_than: datetime) -> int:
+        """
+        Delete sessions not updated since ``older_than``.
+
+        Returns:
+            Number of sessions deleted.
+        """
+        cutoff = older_than.isoformat()
+        stale = [s["key"] for s in self.list_sessions() if (s.get("updated_at") or "") < cutoff]
+        for key in stale:
+            self.delete(key)
+        return len(stale)
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        pass
+
+    @staticmethod
+    def _session_from_meta(key: str, messages: list[dict[str, Any]], meta: dict[str, Any]) -> Session:
+        created_at = meta.get("created_at")
+        updated_at = meta.get("updated_at")
+        return Session(
+            key=key,
+            messages=messages,
+            created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+            updated_at=datetime.fromisoformat(updated_at) if updated_at else datetime.now(),
+            metadata=meta.get("metadata", {}),
+            last_consolidated=meta.get("last_consolidated", 0)
+        )
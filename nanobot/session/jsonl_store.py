@@ -0,0 +1,248 @@
+"""Session storage as one append-only JSONL file per session."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.session.base import Session, SessionStore
+from nanobot.utils.helpers import atomic_write_text, ensure_dir, safe_filename
+
+_READ_BLOCK = 64 * 1024  # Block size for reading session files backwards
+
+
+class JsonlSessionStore(SessionStore):
+    """
+    Stores each session as an append-only JSONL file of messages plus a
+    small ``.meta.json`` sidecar holding metadata (created/updated time,
+    last_consolidated, message count).
+
+    Saving appends only the messages added since the last save and
+    atomically replaces the sidecar, so per-turn disk I/O does not grow with
+    history length. The message file is rewritten (compacted, via temp file +
+    rename) only when it no longer matches the in-memory session, e.g. after
+    ``Session.clear()`` or when loading a legacy file. Tail loads read the
+    file backwards from its end.
+    """
+
+    def __init__(self, sessions_dir: Path):
+        self.sessions_dir = ensure_dir(sessions_dir)
+
+    def _get_session_path(self, key: str) -> Path:
+        """Get the file path for a session."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.sessions_dir / f"{safe_key}.jsonl"
+
+    @staticmethod
+    def _get_meta_path(path: Path) -> Path:
+        """Get the metadata sidecar path for a session file."""
+        return path.with_suffix(".meta.json")
+
+    def _read_meta(self, path: Path) -> dict[str, Any] | None:
+        """Read the metadata sidecar of a session file, if present."""
+        meta_path = self._get_meta_path(path)
+        if not meta_path.exists():
+            return None
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logger.warning(f"Failed to read session metadata {meta_path}: {e}")
+            return None
+
+    @staticmethod
+    def _read_lines_backward(path: Path, count: int, end: int | None = None) -> tuple[list[bytes], int]:
+        """
+        Read up to ``count`` non-empty lines that end at byte offset ``end``.
+
+        Reads the file in blocks from the end, so the cost depends on the
+        number of lines requested rather than on the file size.
+
+        Returns:
+            (lines oldest first, byte offset where the oldest returned line starts).
+        """
+        lines: list[bytes] = []
+        with open(path, "rb") as f:
+            cut = f.seek(0, os.SEEK_END) if end is None else end
+            pos = cut
+            buf = b""  # file[pos:cut]
+            while len(lines) < count and cut > 0:
+                # The line before `cut` starts after the last newline other than buf's own terminator
+                idx = buf.rfind(b"\n", 0, len(buf) - 1)
+                if idx == -1 and pos > 0:
+                    size = min(_READ_BLOCK, pos)
+                    pos -= size
+                    f.seek(pos)
+                    buf = f.read(size) + buf
+                    continue
+                line = buf[idx + 1:]
+                buf = buf[:idx + 1]
+                cut -= len(line)
+                if line.strip():
+                    lines.append(line)
+        lines.reverse()
+        return lines, cut
+
+    @staticmethod
+    def _parse_lines(key: str, lines: list[bytes]) -> list[dict[str, Any]]:
+        messages = []
+        for line in lines:
+            try:
+                messages.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt line in session {key}")
+                messages.append({"role": "user", "content": ""})  # keep absolute indices aligned
+        return messages
+
+    def _load_tail(self, key: str, path: Path, meta: dict[str, Any], tail: int) -> Session | None:
+        """
+        Load only the last ``tail`` messages by reading the file backwards.
+
+        Older messages stay on disk and are read back (also backwards, from
+        where the tail began) when ``Session.ensure_loaded`` asks for them.
+        Returns None if the sidecar does not match the file, e.g. after a
+        crash between appending messages and updating the sidecar.
+        """
+        total = meta.get("message_count")
+        if total is None or meta.get("size") != path.stat().st_size:
+            return None
+
+        lines, boundary = self._read_lines_backward(path, tail)
+        offset = total - len(lines)
+        if offset < 0 or (offset > 0 and len(lines) < tail):
+            return None
+
+        session = self._session_from_meta(key, self._parse_lines(key, lines), meta)
+        session._offset = offset
+        session._persisted = len(lines)
+        if offset:
+            def load_prefix(start: int, end: int) -> list[dict[str, Any]]:
+                nonlocal boundary
+                prefix, boundary = self._read_lines_backward(path, end - start, boundary)
+                return self._parse_lines(key, prefix)
+
+            session._prefix_loader = load_prefix
+        return session
+
+    def load(self, key: str, tail: int | None = None) -> Session | None:
+        """Load a session from its JSONL file."""
+        path = self._get_session_path(key)
+
+        if not path.exists():
+            return None
+
+        try:
+            meta = self._read_meta(path)
+            if tail and meta is not None:
+                session = self._load_tail(key, path, meta, tail)
+                if session is not None:
+                    return session
+
+            messages = []
+            meta = meta or {}
+            legacy_meta: dict[str, Any] = {}
+            needs_compaction = False
+
+            with open(path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write from a crash mid-append; drop it on next compaction
+                        logger.warning(f"Skipping corrupt line in session {key}")
+                        needs_compaction = True
+                        continue
+
+                    if data.get("_type") == "metadata":
+                        # Legacy format: metadata as the first line of the JSONL file
+                        legacy_meta = data
+                        needs_compaction = True
+                    else:
+                        messages.append(data)
+
+            session = self._session_from_meta(key, messages, meta or legacy_meta)
+            session._persisted = 0 if needs_compaction else len(messages)
+            return session
+        except Exception as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+
+    @staticmethod
+    def _meta_record(session: Session, path: Path) -> dict[str, Any]:
+        return {
+            "_type": "metadata",
+            "key": session.key,
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "last_consolidated": session.last_consolidated,
+            "message_count": session.message_count,
+            "size": path.stat().st_size,  # Lets tail loading detect a stale sidecar
+        }
+
+    @classmethod
+    def export(cls, session: Session, path: Path) -> None:
+        """Write a full, self-contained copy of a session (file + sidecar) to ``path``."""
+        session.ensure_loaded()
+        lines = "".join(json.dumps(msg) + "\n" for msg in session.messages)
+        atomic_write_text(path, lines)
+        atomic_write_text(cls._get_meta_path(path), json.dumps(cls._meta_record(session, path)))
+
+    def save(self, session: Session) -> None:
+        """
+        Save a session to its JSONL file.
+
+        Appends messages added since the last save, or compacts with a full
+        atomic rewrite when the file has diverged from memory.
+        """
+        path = self._get_session_path(session.key)
+        persisted = session._persisted
+        if 0 < persisted <= len(session.messages) and path.exists():
+            new_messages = session.messages[persisted:]
+            if new_messages:
+                with open(path, "a") as f:
+                    for msg in new_messages:
+                        f.write(json.dumps(msg) + "\n")
+            atomic_write_text(self._get_meta_path(path), json.dumps(self._meta_record(session, path)))
+        else:
+            self.export(session, path)
+        session._persisted = len(session.messages)
+
+    def delete(self, key: str) -> None:
+        path = self._get_session_path(key)
+        path.unlink(missing_ok=True)
+        self._get_meta_path(path).unlink(missing_ok=True)
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """
+        List all sessions.
+
+        Returns:
+            List of session info dicts.
+        """
+        sessions = []
+
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                data = self._read_meta(path)
+                if data is None:
+                    # Legacy file: metadata is the first line
+                    with open(path) as f:
+                        first_line = f.readline().strip()
+                    data = json.loads(first_line) if first_line else {}
+                if data.get("_type") == "metadata":
+                    sessions.append({
+                        "key": data.get("key") or path.stem.replace("_", ":"),
+                        "created_at": data.get("created_at"),
+                        "updated_at": data.get("updated_at"),
+                        "path": str(path)
+                    })
+            except Exception:
+                continue
+
+        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
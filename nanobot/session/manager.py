@@ -1,73 +1,51 @@
 """Session management for conversation history."""
 
-import json
+import time
+from collections import OrderedDict
 from pathlib import Path
-from dataclasses import dataclass, field
-from datetime import datetime
 from typing import Any
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir, safe_filename
-
-
-@dataclass
-class Session:
-    """
-    A conversation session.
-
-    Stores messages in JSONL format for easy reading and persistence.
-
-    Important: Messages are append-only for LLM cache efficiency.
-    The consolidation process writes summaries to MEMORY.md/HISTORY.md
-    but does NOT modify the messages list or get_history() output.
-    """
-
-    key: str  # channel:chat_id
-    messages: list[dict[str, Any]] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
-    metadata: dict[str, Any] = field(default_factory=dict)
-    last_consolidated: int = 0  # Number of messages already consolidated to files
-    
-    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
-        """Add a message to the session."""
-        msg = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().isoformat(),
-            **kwargs
-        }
-        self.messages.append(msg)
-        self.updated_at = datetime.now()
-    
-    def get_history(self, max_messages: int = 500) -> list[dict[str, Any]]:
-        """Get recent messages in LLM format (role + content only)."""
-        return [{"role": m["role"], "content": m["content"]} for m in self.messages[-max_messages:]]
-    
-    def clear(self) -> None:
-        """Clear all messages and reset session to initial state."""
-        self.messages = []
-        self.last_consolidated = 0
-        self.updated_at = datetime.now()
+from nanobot.session.base import Session, SessionStore
+from nanobot.session.jsonl_store import JsonlSessionStore
 
 
 class SessionManager:
     """
     Manages conversation sessions.
 
-    Sessions are stored as JSONL files in the sessions directory.
+    Persistence is delegated to a ``SessionStore`` backend: by default one
+    append-only JSONL file per session under ``~/.nanobot/sessions``
+    (``JsonlSessionStore``), or a SQLite database (``SQLiteSessionStore``).
+
+    Loaded sessions are kept in an LRU cache bounded by count and by
+    approximate size; sessions idle longer than ``idle_ttl`` seconds are
+    evicted. Dirty sessions are flushed to the store before being dropped.
+    With ``tail_window`` set, only the most recent messages are loaded;
+    older ones are read back on demand (see ``Session.ensure_loaded``).
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        max_sessions: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        idle_ttl: float = 3600,
+        tail_window: int | None = None,
+        store: SessionStore | None = None,
+    ):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
-        self._cache: dict[str, Session] = {}
-    
-    def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
+        self.store = store or JsonlSessionStore(Path.home() / ".nanobot" / "sessions")
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.tail_window = tail_window
+        self._cache: OrderedDict[str, Session] = OrderedDict()  # LRU order: oldest first
+        self._last_access: dict[str, float] = {}
+        self._sizes: dict[str, int] = {}  # Approximate in-memory bytes per cached session
+        self._cached_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "flushes": 0}
     
     def get_or_create(self, key: str) -> Session:
         """
@@ -79,77 +57,125 @@ class SessionManager:
         Returns:
             The session.
         """
+        self._evict_idle()
         if key in self._cache:
+            self._stats["hits"] += 1
+            self._touch(key)
             return self._cache[key]
         
-        session = self._load(key)
+        self._stats["misses"] += 1
+        session = self.store.load(key, tail=self.tail_window)
         if session is None:
             session = Session(key=key)
+        else:
+            session._saved_state = session._state()
         
-        self._cache[key] = session
+        self._put(session)
         return session
-    
-    def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
-        path = self._get_session_path(key)
-
-        if not path.exists():
-            return None
-
-        try:
-            messages = []
-            metadata = {}
-            created_at = None
-            last_consolidated = 0
-
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    data = json.loads(line)
-
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                        last_consolidated = data.get("last_consolidated", 0)
-                    else:
-                        messages.append(data)
-
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata,
-                last_consolidated=last_consolidated
-            )
-        except Exception as e:
-            logger.warning(f"Failed to load session {key}: {e}")
-            return None
+
+    # ------------------------------------------------------------------
+    # Cache bookkeeping
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _estimate_bytes(messages: list[dict[str, Any]]) -> int:
+        """Cheap size estimate: content length plus a fixed per-message overhead."""
+        return sum(len(m.get("content") or "") + 200 for m in messages)
+
+    def _touch(self, key: str) -> None:
+        self._cache.move_to_end(key)
+        self._last_access[key] = time.monotonic()
+
+    def _put(self, session: Session, size: int | None = None) -> None:
+        """Insert or refresh a session in the cache, then enforce the bounds."""
+        key = session.key
+        self._cached_bytes -= self._sizes.get(key, 0)
+        self._sizes[key] = self._estimate_bytes(session.messages) if size is None else size
+        self._cached_bytes += self._sizes[key]
+        self._cache[key] = session
+        self._touch(key)
+        self._evict_overflow(keep=key)
+
+    def _evict(self, key: str) -> None:
+        """Drop a session from the cache, flushing unsaved changes first."""
+        session = self._cache.get(key)
+        if session is not None and session.is_dirty:
+            self._stats["flushes"] += 1
+            try:
+                self._write(session)
+            except Exception as e:
+                logger.error(f"Failed to flush session {key} before eviction: {e}")
+        self._drop(key)
+        self._stats["evictions"] += 1
+
+    def _drop(self, key: str) -> None:
+        self._cache.pop(key, None)
+        self._last_access.pop(key, None)
+        self._cached_bytes -= self._sizes.pop(key, 0)
+
+    def _evict_overflow(self, keep: str | None = None) -> None:
+        """Evict least-recently-used sessions until within count and size bounds."""
+        while len(self._cache) > self.max_sessions or (
+            self._cached_bytes > self.max_bytes and len(self._cache) > 1
+        ):
+            oldest = next(iter(self._cache))
+            if oldest == keep:
+                break
+            self._evict(oldest)
+
+    def _evict_idle(self) -> None:
+        """Evict sessions not accessed within idle_ttl (oldest are first in LRU order)."""
+        if not self.idle_ttl:
+            return
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._cache:
+            oldest = next(iter(self._cache))
+            if self._last_access.get(oldest, 0) > cutoff:
+                break
+            self._evict(oldest)
+
+    def cache_stats(self) -> dict[str, int]:
+        """Cache counters (hits, misses, evictions, flushes) and current occupancy."""
+        return {**self._stats, "sessions": len(self._cache), "bytes": self._cached_bytes}
+
+    def flush(self) -> None:
+        """Save every cached session with unsaved changes (e.g. on shutdown)."""
+        for session in list(self._cache.values()):
+            if session.is_dirty:
+                self._write(session)
+
+    def close(self) -> None:
+        """Flush unsaved sessions and close the store (e.g. on shutdown)."""
+        self.flush()
+        self.store.close()
+
+    def _write(self, session: Session) -> None:
+        self.store.save(session)
+        session._saved_state = session._state()
     
     def save(self, session: Session, save_path=None) -> None:
-        """Save a session to disk."""
-
-        path =  save_path if save_path is not None else self._get_session_path(session.key)
-
-        with open(path, "w") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line) + "\n")
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
-
-        self._cache[session.key] = session
+        """
+        Save a session.
+
+        The store writes only messages added since the last save. An explicit
+        ``save_path`` instead gets a full, self-contained JSONL copy.
+        """
+        if save_path is not None:
+            JsonlSessionStore.export(session, Path(save_path))
+            return
+
+        persisted = session._persisted
+        appended = 0 < persisted <= len(session.messages)
+        added = self._estimate_bytes(session.messages[persisted:]) if appended else 0
+        self._write(session)
+        size = None
+        if appended and self._cache.get(session.key) is session:
+            size = self._sizes.get(session.key, 0) + added
+        self._put(session, size)
     
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
-        self._cache.pop(key, None)
+        self._drop(key)
     
     def list_sessions(self) -> list[dict[str, Any]]:
         """
@@ -158,23 +184,4 @@ class SessionManager:
         Returns:
             List of session info dicts.
         """
-        sessions = []
-        
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            sessions.append({
-                                "key": path.stem.replace("_", ":"),
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
-                continue
-        
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        return self.store.list_sessions()
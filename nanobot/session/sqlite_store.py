@@ -0,0 +1,181 @@
+"""Session storage in a single SQLite database (WAL mode)."""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.session.base import Session, SessionStore
+from nanobot.utils.helpers import ensure_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    last_consolidated INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at);
+
+CREATE TABLE IF NOT EXISTS messages (
+    session_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_key, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages (session_key, timestamp);
+"""
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Stores sessions in SQLite: one row per message, keyed by session and
+    position, plus a ``sessions`` table for metadata.
+
+    WAL mode lets other processes (e.g. the CLI) read while the gateway is
+    writing. Listing reads only the ``sessions`` table, tail loads use
+    ``ORDER BY seq DESC LIMIT n``, and retention purges are a single
+    ``DELETE``.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        ensure_dir(db_path.parent)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _parse_rows(key: str, rows: list[tuple[str]]) -> list[dict[str, Any]]:
+        messages = []
+        for (data,) in rows:
+            try:
+                messages.append(json.loads(data))
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt message row in session {key}")
+                messages.append({"role": "user", "content": ""})  # keep absolute indices aligned
+        return messages
+
+    def load(self, key: str, tail: int | None = None) -> Session | None:
+        """Load a session, optionally only its last ``tail`` messages."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT created_at, updated_at, metadata, last_consolidated, message_count "
+                    "FROM sessions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if tail:
+                    rows = self._conn.execute(
+                        "SELECT data FROM messages WHERE session_key = ? ORDER BY seq DESC LIMIT ?",
+                        (key, tail),
+                    ).fetchall()
+                    rows.reverse()
+                else:
+                    rows = self._conn.execute(
+                        "SELECT data FROM messages WHERE session_key = ? ORDER BY seq", (key,)
+                    ).fetchall()
+        except Exception as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+
+        created_at, updated_at, metadata, last_consolidated, message_count = row
+        session = self._session_from_meta(key, self._parse_rows(key, rows), {
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "metadata": json.loads(metadata),
+            "last_consolidated": last_consolidated,
+        })
+        session._offset = max(0, message_count - len(rows))
+        session._persisted = len(rows)
+        if session._offset:
+            session._prefix_loader = lambda start, end: self._read_range(key, start, end)
+        return session
+
+    def _read_range(self, key: str, start: int, end: int) -> list[dict[str, Any]]:
+        """Read messages [start, end) of a session by position."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM messages WHERE session_key = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (key, start, end),
+            ).fetchall()
+        return self._parse_rows(key, rows)
+
+    def save(self, session: Session) -> None:
+        """
+        Save a session.
+
+        Inserts only messages added since the last save; replaces all rows
+        of the session when the stored copy has diverged from memory.
+        """
+        persisted = session._persisted
+        replace = not 0 < persisted <= len(session.messages)
+        if replace:
+            session.ensure_loaded()
+            persisted = 0
+
+        rows = [
+            (session.key, session._offset + i, msg.get("timestamp"), json.dumps(msg))
+            for i, msg in enumerate(session.messages[persisted:], persisted)
+        ]
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM messages WHERE session_key = ?", (session.key,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO messages (session_key, seq, timestamp, data) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT INTO sessions (key, created_at, updated_at, metadata, last_consolidated, message_count) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET updated_at = excluded.updated_at, "
+                "metadata = excluded.metadata, last_consolidated = excluded.last_consolidated, "
+                "message_count = excluded.message_count",
+                (
+                    session.key,
+                    session.created_at.isoformat(),
+                    session.updated_at.isoformat(),
+                    json.dumps(session.metadata),
+                    session.last_consolidated,
+                    session.message_count,
+                ),
+            )
+        session._persisted = len(session.messages)
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages WHERE session_key = ?", (key,))
+            self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, created_at, updated_at FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [
+            {"key": key, "created_at": created_at, "updated_at": updated_at, "path": str(self.db_path)}
+            for key, created_at, updated_at in rows
+        ]
+
+    def purge(self, older_than: datetime) -> int:
+        cutoff = older_than.isoformat()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM messages WHERE session_key IN (SELECT key FROM sessions WHERE updated_at < ?)",
+                (cutoff,),
+            )
+            return self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
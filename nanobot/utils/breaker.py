@@ -0,0 +1,54 @@
+"""Circuit breaker for calls to remote services."""
+
+import time
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing service for a while instead of waiting on it.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow()`` returns False for ``reset_timeout`` seconds. The next call
+    after that is a trial (half-open): success closes the circuit, failure
+    opens it again; a trial that ends with neither (e.g. cancelled) must
+    call ``release()`` so the next call can probe instead.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._trial or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now."""
+        if self.opened_at is None:
+            return True
+        if self._trial or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self._trial = True  # Let exactly one call through to probe the service
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._trial = False
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed, freeing the half-open trial."""
+        self._trial = False
@@ -1,5 +1,7 @@
 """Utility functions for nanobot."""
 
+import os
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
@@ -10,6 +12,29 @@ def ensure_dir(path: Path) -> Path:
     return path
 
 
+def atomic_write_text(path: Path, content: str, encoding: str = "utf-8") -> None:
+    """Write a file atomically: write to a temp file in the same directory, then rename."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def file_signature(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it is missing. Cheap change detection without reading."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def get_data_path() -> Path:
     """Get the nanobot data directory (~/.nanobot)."""
     return ensure_dir(Path.home() / ".nanobot")
@@ -0,0 +1,45 @@
+"""HTML to text/markdown extraction for web_fetch.
+
+Kept free of heavy imports so worker processes that run it start quickly.
+"""
+
+import html
+import re
+
+
+def _strip_tags(text: str) -> str:
+    """Remove HTML tags and decode entities."""
+    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
+    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
+    text = re.sub(r'<[^>]+>', '', text)
+    return html.unescape(text).strip()
+
+
+def _normalize(text: str) -> str:
+    """Normalize whitespace."""
+    text = re.sub(r'[ \t]+', ' ', text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def _to_markdown(html: str) -> str:
+    """Convert HTML to markdown."""
+    # Convert links, headings, lists before stripping tags
+    text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
+                  lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
+    text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
+                  lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
+    text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
+    text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
+    text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
+    return _normalize(_strip_tags(text))
+
+
+def extract_html(html: str, extract_mode: str) -> str:
+    """Extract the readable content of an HTML page as markdown or plain text."""
+    from readability import Document
+
+    doc = Document(html)
+    summary = doc.summary()
+    content = _to_markdown(summary) if extract_mode == "markdown" else _strip_tags(summary)
+    title = doc.title()
+    return f"# {title}\n\n{content}" if title else content
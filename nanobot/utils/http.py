@@ -0,0 +1,164 @@
+"""Process-wide pooled HTTP client shared by tools, providers and channels."""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable
+
+import httpx
+from loguru import logger
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks (for requests with follow_redirects=True)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that releases its per-host slot once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """Connection-pooling transport with a per-host concurrency limit and reuse counters."""
+
+    def __init__(self, pool: "HttpPool", max_per_host: int, **kwargs: Any):
+        self._pool = pool
+        self._inner = httpx.AsyncHTTPTransport(**kwargs)
+        self._host_slots: defaultdict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(max_per_host)
+        )
+
+    async def _trace(self, event: str, info: dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            self._pool.connections_opened += 1
+
+    def open_connections(self) -> int:
+        inner_pool = getattr(self._inner, "_pool", None)
+        return len(getattr(inner_pool, "connections", ()))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        slot = self._host_slots[request.url.host]
+        await slot.acquire()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                slot.release()
+
+        request.extensions = {**request.extensions, "trace": self._trace}
+        self._pool.requests += 1
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class HttpPool:
+    """
+    Lazily created ``httpx.AsyncClient`` with keep-alive, HTTP/2 (when the
+    ``h2`` package is installed) and a cap on concurrent requests per host.
+
+    Reusing one client saves a TCP+TLS handshake on every web search, page
+    fetch or API call. Asyncio connections cannot cross event loops, so the
+    client is rebuilt if it is used from a different loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_connections_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        http2: bool = True,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.requests = 0
+        self.connections_opened = 0
+        self._client: httpx.AsyncClient | None = None
+        self._transport: _PooledTransport | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client (must be used from within an event loop)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._transport = _PooledTransport(
+                self,
+                self.max_connections_per_host,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self._client = httpx.AsyncClient(
+                transport=self._transport, timeout=self.timeout, max_redirects=MAX_REDIRECTS
+            )
+            self._loop = loop
+            logger.debug(f"HTTP pool: new client (http2={self.http2})")
+        return self._client
+
+    def stats(self) -> dict[str, Any]:
+        """Request and connection counters since startup."""
+        reused = max(0, self.requests - self.connections_opened)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "open_connections": self._transport.open_connections() if self._transport else 0,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            "http2": self.http2,
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = self._transport = self._loop = None
+
+
+_shared: HttpPool | None = None
+
+
+def get_http_pool() -> HttpPool:
+    """Return the process-wide pool, creating it with defaults on first use."""
+    global _shared
+    if _shared is None:
+        _shared = HttpPool()
+    return _shared
+
+
+def set_http_pool(pool: HttpPool) -> None:
+    """Replace the process-wide pool (e.g. with limits from config)."""
+    global _shared
+    _shared = pool
@@ -0,0 +1,250 @@
+"""Timing spans for agent turns, exported through pluggable sinks."""
+
+import asyncio
+import json
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Protocol
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir
+
+
+@dataclass
+class Span:
+    """One timed step of a turn. Times are epoch seconds."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start: float = 0.0
+    duration: float = 0.0
+    status: str = "ok"  # "ok", "error" or "cancelled"
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class _NoopSpan(Span):
+    """Handed out when tracing is off, so call sites need no checks."""
+
+    def __init__(self):
+        super().__init__(name="", trace_id="", span_id="")
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class SpanSink(Protocol):
+    """Receives every finished span."""
+
+    def export(self, span: Span) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def current_span() -> Span | None:
+    """The innermost open span of the current task, if tracing is on."""
+    return _current.get()
+
+
+def detach_span() -> None:
+    """Start new traces in the current task (background work that outlives the turn that created it)."""
+    _current.set(None)
+
+
+class Tracer:
+    """
+    Creates nested spans and hands them to the sinks when they end.
+
+    The open span is tracked in a ContextVar, so spans started in a task
+    (or in tasks it creates) become children of the caller's span. With no
+    sinks every call is a no-op.
+    """
+
+    def __init__(self, sinks: list[SpanSink] | None = None):
+        self.sinks = list(sinks or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def _new(self, name: str, start: float, attributes: dict[str, Any]) -> Span:
+        parent = _current.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent else None,
+            start=start,
+            attributes=attributes,
+        )
+
+    @contextmanager
+    def span(self, name: str, start: float | None = None, **attributes: Any) -> Iterator[Span]:
+        """Time a block. ``start`` backdates the span (e.g. to when a message arrived)."""
+        if not self.sinks:
+            yield _NOOP
+            return
+        span = self._new(name, time.time() if start is None else start, attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "cancelled" if isinstance(e, (asyncio.CancelledError, GeneratorExit)) else "error"
+            span.attributes.setdefault("error", repr(e)[:200])
+            raise
+        finally:
+            _current.reset(token)
+            span.duration = time.time() - span.start
+            self._export(span)
+
+    def record(self, name: str, start: float, end: float | None = None, **attributes: Any) -> None:
+        """Add a span for something already measured, as a child of the current span."""
+        if not self.sinks:
+            return
+        span = self._new(name, start, attributes)
+        span.duration = max(0.0, (time.time() if end is None else end) - start)
+        self._export(span)
+
+    def _export(self, span: Span) -> None:
+        for sink in self.sinks:
+            try:
+                sink.export(span)
+            except Exception as e:
+                logger.warning(f"Span export to {type(sink).__name__} failed: {e}")
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+
+
+class JsonlSpanExporter:
+    """Appends spans as JSON lines to ``spans-YYYY-MM-DD.jsonl`` in ``log_dir``."""
+
+    def __init__(self, log_dir: Path):
+        self.log_dir = ensure_dir(log_dir)
+        self._day = ""
+        self._file = None
+
+    def export(self, span: Span) -> None:
+        day = datetime.now().strftime("%Y-%m-%d")
+        if day != self._day:
+            self.close()
+            self._file = open(self.log_dir / f"spans-{day}.jsonl", "a", encoding="utf-8")
+            self._day = day
+        self._file.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._day = ""
+
+
+class OTelSpanExporter:
+    """
+    Re-emits finished traces as OpenTelemetry spans.
+
+    Spans of a trace are buffered until its root ends, then created
+    parent-first with their recorded start and end times. They go to the
+    global tracer provider; if ``endpoint`` is set and the SDK and OTLP
+    exporter are installed, one is configured for it.
+    """
+
+    def __init__(self, endpoint: str = "", service_name: str = "nanobot", max_pending: int = 10_000):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError("OpenTelemetry is not installed. "
+                              "Please install it with `pip install opentelemetry-sdk opentelemetry-exporter-otlp`.")
+        self._trace = trace
+        if endpoint:
+            self._configure(endpoint, service_name)
+        self.tracer = trace.get_tracer("nanobot")
+        self.max_pending = max_pending
+        self._pending: dict[str, list[Span]] = {}
+        self._count = 0
+
+    def _configure(self, endpoint: str, service_name: str) -> None:
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            logger.warning("OpenTelemetry SDK or OTLP exporter not installed; using the global tracer provider")
+            return
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+        self._trace.set_tracer_provider(provider)
+
+    def export(self, span: Span) -> None:
+        if span.parent_id is not None:
+            if self._count >= self.max_pending:
+                return  # A root that never ended; don't grow without bound
+            self._pending.setdefault(span.trace_id, []).append(span)
+            self._count += 1
+            return
+        spans = self._pending.pop(span.trace_id, []) + [span]
+        self._count -= len(spans) - 1
+        children: dict[str | None, list[Span]] = {}
+        for s in spans:
+            children.setdefault(s.parent_id, []).append(s)
+        created: dict[str, Any] = {}
+        stack = [(span, None)]  # Parents are started before their children
+        while stack:
+            s, parent = stack.pop()
+            context = self._trace.set_span_in_context(parent) if parent is not None else None
+            attributes = {
+                k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in s.attributes.items()
+            }
+            created[s.span_id] = otel = self.tracer.start_span(
+                s.name, context=context, start_time=int(s.start * 1e9), attributes=attributes,
+            )
+            stack.extend((child, otel) for child in children.get(s.span_id, []))
+        for s in spans:
+            if s.span_id not in created:
+                continue  # Parent was dropped
+            otel = created[s.span_id]
+            if s.status != "ok":
+                otel.set_status(self._trace.Status(self._trace.StatusCode.ERROR, s.status))
+            otel.end(end_time=int((s.start + s.duration) * 1e9))
+
+    def close(self) -> None:
+        provider = self._trace.get_tracer_provider()
+        if hasattr(provider, "shutdown"):
+            provider.shutdown()
+
+
+_shared = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer (a no-op until sinks are configured)."""
+    return _shared
+
+
+def set_tracer(tracer: Tracer) -> None:
+    """Replace the process-wide tracer (e.g. with exporters from config)."""
+    global _shared
+    _shared = tracer
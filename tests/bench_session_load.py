@@ -0,0 +1,54 @@
+"""Benchmark cold session load: full JSONL parse vs. tail-seek loading.
+
+Run directly (not collected by pytest):
+
+    python tests/bench_session_load.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from nanobot.session.manager import Session, SessionManager
+
+SIZES = [100, 10_000, 100_000, 500_000]
+TAIL = 50
+ROUNDS = 5
+
+
+def _make_session(key: str, count: int) -> Session:
+    session = Session(key=key)
+    for i in range(count):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"message {i} " + "x" * 80)
+    return session
+
+
+def _time_loads(manager: SessionManager, key: str) -> float:
+    """Mean milliseconds to load a session from disk and build its history."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        manager.invalidate(key)
+        manager.get_or_create(key).get_history(max_messages=TAIL)
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(Path, "home", return_value=Path(tmp)):
+        full = SessionManager(Path(tmp))
+        tail = SessionManager(Path(tmp), tail_window=TAIL)
+        print(f"{'messages':>10} {'file (MB)':>10} {'full (ms)':>11} {'tail (ms)':>11} {'speedup':>9}")
+        for size in SIZES:
+            key = f"bench:load{size}"
+            full.save(_make_session(key, size))
+            full.invalidate(key)
+            mb = full.store._get_session_path(key).stat().st_size / 1e6
+
+            full_ms = _time_loads(full, key)
+            tail_ms = _time_loads(tail, key)
+            print(f"{size:>10} {mb:>10.1f} {full_ms:>11.3f} {tail_ms:>11.3f} {full_ms / tail_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
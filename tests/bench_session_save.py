@@ -0,0 +1,75 @@
+"""Benchmark session save latency: append-only writer vs. full JSONL rewrite.
+
+Run directly (not collected by pytest):
+
+    python tests/bench_session_save.py
+"""
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from nanobot.session.manager import Session, SessionManager
+
+SIZES = [100, 10_000, 100_000]
+ROUNDS = 20
+
+
+def _legacy_save(session: Session, path: Path) -> None:
+    """The previous implementation: rewrite metadata + every message on each save."""
+    with open(path, "w") as f:
+        f.write(json.dumps({
+            "_type": "metadata",
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "last_consolidated": session.last_consolidated,
+        }) + "\n")
+        for msg in session.messages:
+            f.write(json.dumps(msg) + "\n")
+
+
+def _make_session(key: str, count: int) -> Session:
+    session = Session(key=key)
+    for i in range(count):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"message {i} " + "x" * 80)
+    return session
+
+
+def _time_rounds(fn) -> float:
+    """Mean milliseconds per save over ROUNDS turns (one new message per turn)."""
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp, patch.object(Path, "home", return_value=Path(tmp)):
+        manager = SessionManager(Path(tmp))
+        print(f"{'messages':>10} {'rewrite (ms)':>14} {'append (ms)':>13} {'speedup':>9}")
+        for size in SIZES:
+            legacy = _make_session(f"bench:legacy{size}", size)
+            legacy_path = Path(tmp) / f"legacy{size}.jsonl"
+
+            def legacy_turn():
+                legacy.add_message("user", "next")
+                _legacy_save(legacy, legacy_path)
+
+            current = _make_session(f"bench:append{size}", size)
+            manager.save(current)  # initial full write is not part of the per-turn cost
+
+            def append_turn():
+                current.add_message("user", "next")
+                manager.save(current)
+
+            rewrite_ms = _time_rounds(legacy_turn)
+            append_ms = _time_rounds(append_turn)
+            print(f"{size:>10} {rewrite_ms:>14.3f} {append_ms:>13.3f} {rewrite_ms / append_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
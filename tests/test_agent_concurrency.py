@@ -0,0 +1,107 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools.message import MessageTool
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse
+
+
+class SlowProvider(LLMProvider):
+    """Provider that sleeps, then echoes the last user message."""
+
+    def __init__(self, delay: float = 0.2):
+        super().__init__()
+        self.delay = delay
+        self.order: list[str] = []
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        content = messages[-1]["content"].split("\n\n---\n\n")[0]  # drop the runtime context section
+        await asyncio.sleep(self.delay)
+        self.order.append(content)
+        return LLMResponse(content=f"echo {content}")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.fixture
+def make_loop(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def _make(max_concurrency: int = 4, delay: float = 0.2) -> AgentLoop:
+        workspace = tmp_path / "workspace"
+        workspace.mkdir(exist_ok=True)
+        return AgentLoop(
+            bus=MessageBus(),
+            provider=SlowProvider(delay),
+            workspace=Path(workspace),
+            max_concurrency=max_concurrency,
+        )
+
+    return _make
+
+
+async def _collect(bus: MessageBus, count: int) -> list[str]:
+    return [(await asyncio.wait_for(bus.consume_outbound(), 5)).content for _ in range(count)]
+
+
+async def test_different_sessions_run_in_parallel(make_loop):
+    loop = make_loop(max_concurrency=4)
+    runner = asyncio.create_task(loop.run())
+    start = time.monotonic()
+    for i in range(4):
+        await loop.bus.publish_inbound(InboundMessage("telegram", "u", f"chat{i}", f"m{i}"))
+    replies = await _collect(loop.bus, 4)
+    elapsed = time.monotonic() - start
+    await loop.stop()
+    await runner
+
+    assert sorted(replies) == [f"echo m{i}" for i in range(4)]
+    assert elapsed < 0.6
+
+
+async def test_same_session_stays_ordered(make_loop):
+    loop = make_loop(max_concurrency=4, delay=0.05)
+    runner = asyncio.create_task(loop.run())
+    for i in range(3):
+        await loop.bus.publish_inbound(InboundMessage("telegram", "u", "chat", f"m{i}"))
+    replies = await _collect(loop.bus, 3)
+    await loop.stop()
+    await runner
+
+    assert replies == ["echo m0", "echo m1", "echo m2"]
+    assert not loop._session_locks
+
+
+async def test_message_tool_context_is_task_local():
+    tool = MessageTool()
+
+    async def route(channel: str, chat_id: str) -> tuple[str, str]:
+        tool.set_context(channel, chat_id)
+        await asyncio.sleep(0.01)
+        return tool._context.get()
+
+    results = await asyncio.gather(
+        asyncio.create_task(route("telegram", "1")),
+        asyncio.create_task(route("discord", "2")),
+    )
+    assert results == [("telegram", "1"), ("discord", "2")]
+
+
+async def test_stop_cancels_in_flight_turns(make_loop):
+    loop = make_loop(delay=10)
+    runner = asyncio.create_task(loop.run())
+    await loop.bus.publish_inbound(InboundMessage("telegram", "u", "chat", "slow"))
+    while not loop._active_tasks:
+        await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(loop.stop(), 2)
+    await runner
+
+    assert not loop._active_tasks
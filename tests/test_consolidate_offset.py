@@ -1,8 +1,11 @@
 """Test session management with cache-friendly message handling."""
 
+import time
+
 import pytest
 from pathlib import Path
 from nanobot.session.manager import Session, SessionManager
+from nanobot.session import JsonlSessionStore
 
 # Test constants
 MEMORY_WINDOW = 50
@@ -142,7 +145,8 @@ class TestSessionPersistence:
     """Test Session persistence and reload."""
 
     @pytest.fixture
-    def temp_manager(self, tmp_path):
+    def temp_manager(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
         return SessionManager(Path(tmp_path))
 
     def test_persistence_roundtrip(self, temp_manager):
@@ -175,6 +179,166 @@ class TestSessionPersistence:
         assert len(session.messages) == 0
 
 
+    def test_save_appends_only_new_messages(self, temp_manager):
+        """Test that repeated saves append instead of rewriting the file."""
+        session = create_session_with_messages("test:append", 10)
+        temp_manager.save(session)
+        path = temp_manager.store._get_session_path("test:append")
+        inode = path.stat().st_ino
+
+        session.add_message("user", "msg10")
+        session.last_consolidated = 4
+        temp_manager.save(session)
+
+        assert path.stat().st_ino == inode
+        assert len(path.read_text().splitlines()) == 11
+        temp_manager.invalidate("test:append")
+        reloaded = temp_manager.get_or_create("test:append")
+        assert len(reloaded.messages) == 11
+        assert reloaded.last_consolidated == 4
+
+    def test_save_after_clear_compacts_file(self, temp_manager):
+        """Test that clear() forces an atomic rewrite rather than an append."""
+        session = create_session_with_messages("test:compact", 10)
+        temp_manager.save(session)
+        session.clear()
+        for i in range(12):
+            session.add_message("user", f"new{i}")
+        temp_manager.save(session)
+
+        temp_manager.invalidate("test:compact")
+        reloaded = temp_manager.get_or_create("test:compact")
+        assert [m["content"] for m in reloaded.messages] == [f"new{i}" for i in range(12)]
+
+    def test_legacy_metadata_line_is_loaded(self, temp_manager):
+        """Test loading a session file written in the old metadata-first format."""
+        path = temp_manager.store._get_session_path("test:legacy")
+        path.write_text(
+            '{"_type": "metadata", "created_at": "2025-01-01T00:00:00", "metadata": {}, "last_consolidated": 3}\n'
+            '{"role": "user", "content": "hello"}\n'
+        )
+        session = temp_manager.get_or_create("test:legacy")
+        assert session.last_consolidated == 3
+        assert [m["content"] for m in session.messages] == ["hello"]
+
+        session.add_message("assistant", "hi")
+        temp_manager.save(session)
+        assert '"_type"' not in path.read_text()
+        assert temp_manager.list_sessions()[0]["key"] == "test:legacy"
+
+
+class TestSessionCache:
+    """Test the bounded session cache and tail-window loading."""
+
+    @pytest.fixture
+    def make_manager(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        return lambda **kwargs: SessionManager(Path(tmp_path), **kwargs)
+
+    def test_lru_eviction_flushes_dirty_sessions(self, make_manager):
+        """Test that evicting a session over the count limit saves unsaved changes."""
+        manager = make_manager(max_sessions=2)
+        first = manager.get_or_create("test:a")
+        first.add_message("user", "unsaved")
+        manager.get_or_create("test:b")
+        manager.get_or_create("test:c")
+
+        stats = manager.cache_stats()
+        assert stats["sessions"] == 2
+        assert stats["evictions"] == 1
+        assert stats["flushes"] == 1
+        reloaded = manager.get_or_create("test:a")
+        assert reloaded is not first
+        assert [m["content"] for m in reloaded.messages] == ["unsaved"]
+
+    def test_hits_refresh_lru_order(self, make_manager):
+        """Test that a cache hit protects a session from being the next eviction."""
+        manager = make_manager(max_sessions=2)
+        a = manager.get_or_create("test:a")
+        manager.get_or_create("test:b")
+        assert manager.get_or_create("test:a") is a
+        manager.get_or_create("test:c")
+
+        assert "test:a" in manager._cache
+        assert "test:b" not in manager._cache
+        assert manager.cache_stats()["hits"] == 1
+
+    def test_idle_sessions_are_evicted(self, make_manager, monkeypatch):
+        """Test that sessions idle longer than idle_ttl are dropped."""
+        manager = make_manager(idle_ttl=10)
+        manager.get_or_create("test:idle")
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        manager.get_or_create("test:other")
+
+        assert list(manager._cache) == ["test:other"]
+
+    def test_byte_limit_evicts_large_sessions(self, make_manager):
+        """Test that the approximate size budget bounds the cache."""
+        manager = make_manager(max_bytes=5_000)
+        big = create_session_with_messages("test:big", 40)
+        manager.save(big)
+        manager.get_or_create("test:small")
+
+        assert list(manager._cache) == ["test:small"]
+
+    def test_tail_window_loads_recent_messages_lazily(self, make_manager):
+        """Test that only the tail is parsed on load and older messages are fetched on demand."""
+        writer = make_manager()
+        writer.save(create_session_with_messages("test:tail", 100))
+
+        manager = make_manager(tail_window=10)
+        session = manager.get_or_create("test:tail")
+        assert len(session.messages) == 10
+        assert session.message_count == 100
+        assert session.messages[0]["content"] == "msg90"
+
+        history = session.get_history(max_messages=30)
+        assert [m["content"] for m in history] == [f"msg{i}" for i in range(70, 100)]
+        assert [m["content"] for m in session.window(5, 8)] == ["msg5", "msg6", "msg7"]
+        assert [m["content"] for m in session.window(95, -2)] == ["msg95", "msg96", "msg97"]
+
+    def test_tail_loaded_session_appends_and_compacts(self, make_manager):
+        """Test saving a tail-loaded session, both appending and after clear()."""
+        make_manager().save(create_session_with_messages("test:tail", 50))
+
+        manager = make_manager(tail_window=5)
+        session = manager.get_or_create("test:tail")
+        session.add_message("user", "msg50")
+        manager.save(session)
+        assert session._offset == 45  # append path does not load the prefix
+
+        manager.invalidate("test:tail")
+        full = make_manager().get_or_create("test:tail")
+        assert [m["content"] for m in full.messages] == [f"msg{i}" for i in range(51)]
+
+
+    def test_read_lines_backward_across_blocks(self, make_manager, tmp_path, monkeypatch):
+        """Test reverse block reads with blank lines and a torn final line."""
+        import nanobot.session.jsonl_store as jsonl_module
+        monkeypatch.setattr(jsonl_module, "_READ_BLOCK", 7)
+        path = tmp_path / "lines.jsonl"
+        path.write_bytes(b"first\nsecond\n\nthird line\nfou")
+
+        lines, cut = JsonlSessionStore._read_lines_backward(path, 2)
+        assert lines == [b"third line\n", b"fou"]
+        more, start = JsonlSessionStore._read_lines_backward(path, 5, cut)
+        assert more == [b"first\n", b"second\n"]
+        assert start == 0
+
+    def test_stale_sidecar_falls_back_to_full_load(self, make_manager):
+        """Test that a file appended after its sidecar was written is fully parsed."""
+        writer = make_manager()
+        writer.save(create_session_with_messages("test:stale", 20))
+        path = writer.store._get_session_path("test:stale")
+        with open(path, "a") as f:
+            f.write('{"role": "user", "content": "msg20"}\n')
+
+        session = make_manager(tail_window=5).get_or_create("test:stale")
+        assert session.message_count == 21
+        assert session._offset == 0
+        assert session.messages[-1]["content"] == "msg20"
+
 class TestConsolidationTriggerConditions:
     """Test consolidation trigger conditions and logic."""
 
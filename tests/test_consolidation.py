@@ -0,0 +1,136 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.consolidation import ConsolidationScheduler
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.memory import MemoryStore
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.session.base import Session
+
+
+class PatchProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.prompts: list[str] = []
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.prompts.append(messages[-1]["content"])
+        return LLMResponse(content=json.dumps({
+            "history_entry": "[2026-01-01 10:00] Talked about coffee.",
+            "memory_patches": [
+                {"op": "replace", "section": "Preferences", "old": "- likes tea", "new": "- likes coffee"},
+                {"op": "add", "section": "Projects", "content": "- building a bot"},
+            ],
+        }))
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def test_patches_edit_sections_in_place(tmp_path):
+    memory = MemoryStore(tmp_path)
+    memory.write_long_term("# Long-term Memory\n\n## User Information\n\n(Important facts about the user)\n\n## Preferences\n\n- likes tea\n")
+
+    applied = memory.apply_patches([
+        {"op": "add", "section": "User Information", "content": "- lives in Lisbon"},
+        {"op": "add", "section": "Preferences", "content": "- likes tea"},  # already known
+        {"op": "remove", "section": "Preferences", "old": "- likes tea"},
+        {"op": "add", "section": "Projects", "content": "- nanobot"},
+        {"section": ""},
+    ])
+
+    assert applied == 3
+    assert memory.read_long_term() == (
+        "# Long-term Memory\n\n## User Information\n\n- lives in Lisbon\n\n## Preferences\n\n## Projects\n\n- nanobot\n"
+    )
+
+
+def test_headings_inside_code_blocks_are_not_sections(tmp_path):
+    memory = MemoryStore(tmp_path)
+    memory.write_long_term("## Snippets\n\n```md\n## not a section\n```\n\n## Preferences\n\n- likes tea\n")
+
+    memory.apply_patches([{"op": "add", "section": "Snippets", "content": "- more"}])
+
+    _, sections = memory.read_sections()
+    assert list(sections) == ["Snippets", "Preferences"]
+    assert sections["Snippets"] == "```md\n## not a section\n```\n- more"
+    assert not list(tmp_path.glob("memory/.MEMORY.md.*"))  # Temp file replaced the original
+
+
+async def test_scheduler_debounces_and_serializes():
+    scheduler = ConsolidationScheduler(debounce=0.05)
+    running, overlaps, calls = 0, 0, []
+
+    def job(tag: str):
+        async def run():
+            nonlocal running, overlaps
+            running += 1
+            overlaps = max(overlaps, running)
+            calls.append(tag)
+            await asyncio.sleep(0.05)
+            running -= 1
+        return run
+
+    for i in range(5):
+        scheduler.request("s", job(f"r{i}"))
+    scheduler.submit("s", job("archive"))
+    await asyncio.sleep(0.07)
+    scheduler.request("s", job("late"))  # arrives while a job is running
+    await scheduler.drain()
+
+    assert calls == ["archive", "r4", "late"]
+    assert overlaps == 1
+    assert not scheduler._locks
+
+
+async def test_consolidation_prompt_does_not_grow_with_memory(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    provider = PatchProvider()
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=Path(workspace), memory_window=4)
+    filler = "\n".join(f"- unrelated fact number {i}" for i in range(2000))
+    loop.memory.write_long_term(f"# Long-term Memory\n\n## Archive\n\n{filler}\n\n## Preferences\n\n- likes tea\n")
+
+    session = Session(key="cli:test")
+    for i in range(6):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"I switched from tea to coffee ({i})")
+    await loop._consolidate_memory(session)
+
+    prompt = provider.prompts[0]
+    assert len(prompt) < 4000
+    assert "- Archive (2000 lines)" in prompt and "- likes tea" in prompt
+    memory = loop.memory.read_long_term()
+    assert "- likes coffee" in memory and "- likes tea" not in memory and "- building a bot" in memory
+    assert "Talked about coffee" in loop.memory.history_file.read_text()
+    assert session.last_consolidated == 4
+
+
+async def test_messages_added_during_consolidation_stay_unconsolidated(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    provider = PatchProvider()
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=Path(workspace), memory_window=4)
+    session = Session(key="cli:test")
+    for i in range(6):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"message {i}")
+
+    chat = provider.chat
+
+    async def slow_chat(messages, **kwargs):
+        for i in range(6, 9):  # A turn finishes while the summary is being written
+            session.add_message("user", f"message {i}")
+        return await chat(messages, **kwargs)
+
+    monkeypatch.setattr(provider, "chat", slow_chat)
+    await loop._consolidate_memory(session)
+
+    assert "message 3" in provider.prompts[0] and "message 4" not in provider.prompts[0]
+    assert session.last_consolidated == 4
+    assert [m["content"] for m in session.window(session.last_consolidated)][-3:] == [
+        "message 6", "message 7", "message 8",
+    ]
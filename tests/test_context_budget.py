@@ -0,0 +1,85 @@
+import copy
+
+from nanobot.agent.budget import ContextBudget
+
+
+def make_budget(**kwargs) -> ContextBudget:
+    budget = ContextBudget("gpt-4o", context_window=2000, reserve_tokens=500, **kwargs)
+    budget.count_text = lambda text: len(text) // 4 if text else 0  # deterministic, tokenizer-free
+    return budget
+
+
+def history(exchanges: int, size: int = 400) -> list[dict]:
+    messages = [{"role": "system", "content": "system prompt"}]
+    for i in range(exchanges):
+        messages.append({"role": "user", "content": f"question {i} " + "q" * size})
+        messages.append({"role": "assistant", "content": f"answer {i} " + "a" * size})
+    return messages
+
+
+def tool_round(name: str, size: int) -> list[dict]:
+    return [
+        {"role": "assistant", "content": None, "tool_calls": [{"id": name, "type": "function",
+                                                               "function": {"name": name, "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": name, "name": name, "content": "x" * size},
+    ]
+
+
+def test_fit_returns_input_when_under_limit():
+    budget = make_budget()
+    messages = history(2)
+    assert budget.fit(messages) is messages
+
+
+def test_old_tool_results_are_replaced_before_history_is_elided():
+    budget = make_budget()
+    messages = history(1) + [{"role": "user", "content": "now"}] + tool_round("read_file", 6000) + tool_round("exec", 400)
+    original = copy.deepcopy(messages)
+
+    fitted = budget.fit(messages, turn_start=3)
+
+    assert messages == original  # caller's list untouched
+    assert budget.count(fitted) <= budget.limit
+    assert fitted[5]["content"] == "[read_file result omitted to fit the context window]"
+    assert fitted[7]["content"] == "x" * 400  # result of the latest tool call is kept
+    assert len(fitted) == len(messages)
+
+
+def test_middle_of_history_is_elided():
+    budget = make_budget()
+    messages = history(10) + [{"role": "user", "content": "latest question"}]
+
+    fitted = budget.fit(messages)
+
+    assert budget.count(fitted) <= budget.limit
+    assert fitted[:3] == messages[:3]  # system prompt and first exchange
+    assert fitted[-1] == messages[-1]
+    assert fitted[3]["role"] == "user"
+    assert "earlier messages omitted to fit the context window" in fitted[3]["content"]
+    roles = [m["role"] for m in fitted[1:]]
+    assert all(a != b for a, b in zip(roles, roles[1:]))
+
+
+def test_clip_tool_result_keeps_head_and_tail():
+    budget = make_budget(max_tool_result_tokens=100)
+    text = "HEAD" + "m" * 2000 + "TAIL"
+
+    clipped = budget.clip_tool_result(text)
+
+    assert clipped.startswith("HEAD") and clipped.endswith("TAIL")
+    assert "tokens truncated" in clipped
+    assert len(clipped) < 500
+    assert budget.clip_tool_result("short") == "short"
+
+
+def test_token_counts_are_cached(monkeypatch):
+    import litellm
+
+    calls = []
+    monkeypatch.setattr(litellm, "token_counter", lambda model, text: calls.append(text) or len(text))
+    budget = ContextBudget("gpt-4o", context_window=2000)
+
+    messages = history(3, size=10)
+    first = budget.count(messages)
+    assert budget.count(messages) == first
+    assert len(calls) == len(messages)
@@ -0,0 +1,86 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.skills import SkillsLoader
+
+
+def write_skill(root: Path, name: str, description: str, metadata: str = "") -> Path:
+    skill_file = root / name / "SKILL.md"
+    skill_file.parent.mkdir(parents=True, exist_ok=True)
+    extra = f"metadata: {metadata}\n" if metadata else ""
+    skill_file.write_text(f"---\ndescription: {description}\n{extra}---\n\n# {name}\n")
+    return skill_file
+
+
+def bump(path: Path, text: str) -> None:
+    """Rewrite a file and move its mtime forward so the change is visible on coarse clocks."""
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def builder(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "AGENTS.md").write_text("agents v1")
+    ctx = ContextBuilder(workspace, MemoryStore(workspace))
+    ctx.skills = SkillsLoader(workspace, builtin_skills_dir=tmp_path / "builtin")
+    write_skill(tmp_path / "builtin", "weather", "Weather lookups", '{"nanobot": {"requires": {"bins": ["curl"]}}}')
+    return ctx
+
+
+async def test_static_workspace_prompt_does_no_file_reads(builder, monkeypatch):
+    first = await builder.build_system_prompt()
+
+    reads = []
+    which_calls = []
+    real_read_text = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self) or real_read_text(self, *a, **k))
+    monkeypatch.setattr(shutil, "which", lambda name, **kw: which_calls.append(name) or "/usr/bin/" + name)
+
+    assert await builder.build_system_prompt() == first
+    assert reads == []
+    assert which_calls == []
+
+
+async def test_changed_fragments_are_rebuilt(builder, tmp_path):
+    await builder.build_system_prompt()
+
+    bump(builder.workspace / "AGENTS.md", "agents v2")
+    bump(tmp_path / "builtin" / "weather" / "SKILL.md", "---\ndescription: Forecasts\n---\n")
+    write_skill(builder.workspace / "skills", "notes", "Take notes")
+    (builder.workspace / "memory" / "MEMORY.md").write_text("user likes tea")
+
+    prompt = await builder.build_system_prompt()
+    assert "agents v2" in prompt
+    assert "Forecasts" in prompt
+    assert "<name>notes</name>" in prompt
+    assert "user likes tea" in prompt
+
+
+def test_requirement_env_changes_invalidate_summary(builder, tmp_path, monkeypatch):
+    write_skill(tmp_path / "builtin", "github", "GitHub", '{"nanobot": {"requires": {"env": ["GH_TOKEN"]}}}')
+    monkeypatch.delenv("GH_TOKEN", raising=False)
+    assert "<requires>ENV: GH_TOKEN</requires>" in builder.skills.build_skills_summary()
+
+    monkeypatch.setenv("GH_TOKEN", "x")
+    assert "GH_TOKEN" not in builder.skills.build_skills_summary()
+
+
+def test_binary_installed_later_becomes_available(builder, monkeypatch):
+    installed = set()
+    monkeypatch.setattr(shutil, "which", lambda name, **kw: f"/usr/bin/{name}" if name in installed else None)
+    assert "<requires>CLI: curl</requires>" in builder.skills.build_skills_summary()
+
+    installed.add("curl")
+    assert "CLI: curl" in builder.skills.build_skills_summary()  # Still within the TTL
+
+    monkeypatch.setattr(builder.skills, "WHICH_TTL", 0.0)
+    assert "CLI: curl" not in builder.skills.build_skills_summary()
@@ -0,0 +1,134 @@
+import os
+import time
+
+import pytest
+
+from nanobot.agent.tools.shell import ExecTool, _HeadTailBuffer
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="uses POSIX shell commands")
+
+
+def _alive(pid: int) -> bool:
+    """True if pid is running (zombies awaiting an absent reaper count as dead)."""
+    if not os.path.isdir("/proc"):
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def test_head_tail_buffer_keeps_both_ends():
+    buf = _HeadTailBuffer(100)
+    for i in range(1000):
+        buf.write(f"{i:04d}\n".encode())
+
+    text = buf.text()
+    assert text.startswith("0000\n0001")
+    assert text.endswith("0998\n0999\n")
+    assert "bytes truncated" in text
+    assert buf.total == 5000
+    assert len(buf.tail) <= 100
+
+
+async def test_large_output_is_bounded():
+    tool = ExecTool(max_output_bytes=2000)
+
+    result = await tool.execute("seq 1 200000")
+
+    assert result.startswith("1\n2\n3\n")
+    assert result.rstrip().endswith("200000")
+    assert "bytes truncated" in result
+    assert len(result) < 2200
+
+
+async def test_runaway_output_kills_the_process():
+    tool = ExecTool(kill_after_bytes=1_000_000, timeout=30)
+
+    started = time.monotonic()
+    result = await tool.execute("yes nanobot")
+
+    assert "Process killed: output exceeded 1000000 bytes" in result
+    assert time.monotonic() - started < 10
+
+
+async def test_timeout_kills_the_process_group(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    tool = ExecTool(timeout=1)
+
+    result = await tool.execute(f"sleep 30 & echo $! > {pid_file}; wait")
+
+    assert "timed out" in result
+    pid = int(pid_file.read_text())
+    time.sleep(0.1)
+    assert not _alive(pid)
+
+
+async def test_live_output_callback():
+    tool = ExecTool()
+    updates: list[str] = []
+
+    async def on_output(text: str) -> None:
+        updates.append(text)
+
+    tool.set_output_callback(on_output)
+    result = await tool.execute("echo first; sleep 1.2; echo second")
+
+    assert result == "first\nsecond\n"
+    assert updates and updates[0].startswith("$ echo first")
+    assert "first" in updates[0]
+
+
+async def test_persistent_shell_keeps_state(tmp_path):
+    (tmp_path / "sub").mkdir()
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True)
+    tool.set_session("cli:a")
+
+    assert await tool.execute("cd sub && export GREETING=hi") == "(no output)"
+    assert (await tool.execute("pwd; echo $GREETING")).splitlines() == [str(tmp_path / "sub"), "hi"]
+    assert await tool.execute("echo 'unterminated") != ""  # syntax error does not wedge the shell
+    assert "Exit code: 3" in await tool.execute("echo out; (exit 3)")
+    assert await tool.execute("printf 'no newline'") == "no newline"
+
+    tool.set_session("cli:b")
+    assert (await tool.execute("pwd")).strip() == str(tmp_path)
+    tool.shells.close()
+
+
+async def test_persistent_shell_recovers_from_exit_and_timeout(tmp_path):
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True, timeout=1)
+    tool.set_session("cli:a")
+
+    assert "Shell exited" in await tool.execute("export X=1; exit 0")
+    assert "timed out" in await tool.execute("sleep 5")
+    assert await tool.execute("echo ${X:-unset}") == "unset\n"
+    tool.shells.close()
+
+
+async def test_persistent_shell_pool_caps_and_reaps(tmp_path):
+    tool = ExecTool(working_dir=str(tmp_path), persistent=True, max_shells=2, shell_idle_timeout=0.5)
+    for key in ("a", "b", "c"):
+        tool.set_session(key)
+        await tool.execute("true")
+    assert len(tool.shells) == 2
+
+    time.sleep(0.6)
+    tool.shells.reap_idle()
+    assert len(tool.shells) == 0
+
+
+async def test_restricted_persistent_shell_cannot_stay_outside_workspace(tmp_path):
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    tool = ExecTool(working_dir=str(workspace), persistent=True, restrict_to_workspace=True)
+    tool.set_session("cli:a")
+
+    assert await tool.execute("cd ..") == "(no output)"
+    assert "shell left the working dir" in await tool.execute("ls")
+    assert (await tool.execute("pwd")).strip() == str(workspace.resolve())
+    tool.shells.close()
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.utils.http import HttpPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/page")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b"<html><head><title>Hello</title></head><body><p>pooled page</p></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+async def test_connections_are_reused(server):
+    pool = HttpPool(http2=False)
+    for _ in range(5):
+        r = await pool.client.get(f"{server}/page")
+        assert r.status_code == 200
+
+    stats = pool.stats()
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["reuse_ratio"] == 0.8
+    assert stats["open_connections"] == 1
+    await pool.aclose()
+
+
+async def test_per_host_limit_caps_connections(server):
+    pool = HttpPool(http2=False, max_connections_per_host=2)
+    results = await asyncio.gather(*(pool.client.get(f"{server}/page") for _ in range(6)))
+
+    assert all(r.status_code == 200 for r in results)
+    assert pool.stats()["connections_opened"] <= 2
+    await pool.aclose()
+
+
+async def test_web_fetch_uses_injected_pool(server):
+    pool = HttpPool(http2=False)
+    tool = WebFetchTool(http=pool)
+
+    result = json.loads(await tool.execute(f"{server}/redirect"))
+    await tool.execute(f"{server}/page")
+
+    assert result["finalUrl"].endswith("/page")
+    assert "pooled page" in result["text"]
+    assert pool.stats()["connections_opened"] == 1
+    await pool.aclose()
@@ -0,0 +1,90 @@
+import asyncio
+
+from nanobot.agent.memory_outbox import MemoryOutbox
+
+
+class FlakyApi:
+    def __init__(self):
+        self.requests: list[list[dict]] = []
+        self.fail = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(self, messages):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail:
+                raise ConnectionError("down")
+            self.requests.append(messages)
+        finally:
+            self.in_flight -= 1
+
+
+def conversation(i: int) -> list[dict]:
+    return [{"role": "user", "content": f"q{i}"}, {"role": "assistant", "content": f"a{i}"}]
+
+
+async def test_backlog_is_batched_with_bounded_concurrency(tmp_path):
+    api = FlakyApi()
+    outbox = MemoryOutbox(tmp_path / "outbox.db", api.send, batch_size=10, concurrency=3)
+    for i in range(100):
+        outbox.put(f"cli:{i}", conversation(i))
+    assert outbox.stats()["pending"] == 100
+
+    while await outbox.drain_once():
+        pass
+
+    assert outbox.stats()["pending"] == 0
+    assert len(api.requests) == 10
+    assert api.max_in_flight <= 3
+    assert api.requests[0][:2] == conversation(0)  # order preserved within a batch
+    assert sum(len(r) for r in api.requests) == 200
+
+
+async def test_failures_back_off_and_survive_restart(tmp_path):
+    api = FlakyApi()
+    api.fail = True
+    outbox = MemoryOutbox(tmp_path / "outbox.db", api.send, base_delay=60)
+    outbox.put("cli:a", conversation(1))
+
+    assert await outbox.drain_once() == 0
+    stats = outbox.stats()
+    assert stats["pending"] == 1 and stats["max_attempts"] == 1
+    assert await outbox.drain_once() == 0  # not due again yet
+    assert outbox.failed_attempts == 1
+
+    api.fail = False
+    reopened = MemoryOutbox(tmp_path / "outbox.db", api.send)
+    reopened._conn.execute("UPDATE outbox SET next_attempt = 0")
+    assert await reopened.drain_once() == 1
+    assert api.requests == [conversation(1)]
+
+
+async def test_queue_is_bounded_and_imports_legacy_files(tmp_path):
+    legacy = tmp_path / "failed_sessions"
+    legacy.mkdir()
+    (legacy / "telegram_1.jsonl").write_text('{"role": "user", "content": "hi"}\n{"_type": "metadata"}\n')
+    outbox = MemoryOutbox(tmp_path / "outbox.db", FlakyApi().send, max_items=3)
+
+    assert outbox.import_jsonl(legacy) == 1
+    assert not list(legacy.iterdir())
+    for i in range(5):
+        outbox.put(f"k{i}", conversation(i))
+    assert outbox.stats()["pending"] == 3 and outbox.dropped == 3
+
+
+async def test_worker_drains_in_background(tmp_path):
+    api = FlakyApi()
+    outbox = MemoryOutbox(tmp_path / "outbox.db", api.send)
+    outbox.start()
+    try:
+        outbox.put("cli:a", conversation(1))
+        for _ in range(100):
+            if api.requests:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await outbox.stop()
+    assert api.requests == [conversation(1)]
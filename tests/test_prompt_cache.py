@@ -0,0 +1,102 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.memory import MemoryStore
+from nanobot.providers.litellm_provider import LiteLLMProvider
+from nanobot.providers.openai_codex_provider import _map_usage, _prompt_cache_key
+
+
+@pytest.fixture
+def builder(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "AGENTS.md").write_text("be nice")
+    return ContextBuilder(workspace, MemoryStore(workspace), prompt_layout="cache")
+
+
+async def test_cache_layout_keeps_volatile_content_out_of_system_prefix(builder, monkeypatch):
+    (builder.workspace / "memory" / "MEMORY.md").write_text("likes tea")
+    first = await builder.build_messages([], "hi", channel="telegram", chat_id="1")
+    monkeypatch.setattr(ContextBuilder, "_current_time", staticmethod(lambda: ("2030-01-01 00:00", "UTC")))
+    second = await builder.build_messages([{"role": "user", "content": "hi"}], "again", channel="slack", chat_id="2")
+
+    system = first[0]["content"]
+    assert [b["text"] for b in system] == [b["text"] for b in second[0]["content"]]
+    assert "Current Time" not in system[0]["text"] and "be nice" in system[0]["text"]
+    assert system[1]["text"] == "# Memory\n\n## Long-term Memory\nlikes tea"
+    assert second[-1]["content"].startswith("again")
+    assert "2030-01-01 00:00" in second[-1]["content"] and "Chat ID: 2" in second[-1]["content"]
+
+
+async def test_classic_layout_is_a_single_string(builder):
+    builder.prompt_layout = "classic"
+    messages = await builder.build_messages([], "hi", channel="cli", chat_id="direct")
+    assert isinstance(messages[0]["content"], str)
+    assert "Current Time" in messages[0]["content"] and messages[-1]["content"] == "hi"
+
+
+def test_cache_control_breakpoints():
+    messages = [
+        {"role": "system", "content": [{"type": "text", "text": "stable"}, {"type": "text", "text": "memory"}]},
+        {"role": "user", "content": "old question"},
+        {"role": "assistant", "content": "old answer"},
+        {"role": "user", "content": "new question"},
+        {"role": "assistant", "content": None, "tool_calls": []},
+        {"role": "tool", "tool_call_id": "1", "content": "result"},
+    ]
+    tools = [{"type": "function", "function": {"name": "a"}}, {"type": "function", "function": {"name": "b"}}]
+    original = json.dumps([messages, tools])
+
+    marked, marked_tools = LiteLLMProvider._apply_cache_control(messages, tools)
+
+    assert json.dumps([messages, tools]) == original  # inputs untouched
+    assert all(b["cache_control"] == {"type": "ephemeral"} for b in marked[0]["content"])
+    assert marked[2]["content"] == [{"type": "text", "text": "old answer", "cache_control": {"type": "ephemeral"}}]
+    assert marked[3]["content"] == "new question"
+    assert "cache_control" in marked_tools[-1] and "cache_control" not in marked_tools[0]
+    breakpoints = json.dumps([marked, marked_tools]).count("cache_control")
+    assert breakpoints <= 4
+
+
+def test_cache_control_only_for_supporting_providers():
+    messages = [{"role": "system", "content": [{"type": "text", "text": "a"}, {"type": "text", "text": "b"}]}]
+    anthropic = LiteLLMProvider(default_model="anthropic/claude-sonnet-4-5")
+    openai = LiteLLMProvider(default_model="gpt-4o")
+
+    assert "cache_control" in json.dumps(anthropic._build_kwargs(messages, None, None, 10, 0.1)["messages"])
+    assert openai._build_kwargs(messages, None, None, 10, 0.1)["messages"][0]["content"] == "a\n\nb"
+
+
+def test_cache_control_on_gateway_only_for_anthropic_models():
+    messages = [{"role": "system", "content": [{"type": "text", "text": "a"}]}]
+    claude = LiteLLMProvider(api_key="sk-or-x", default_model="anthropic/claude-sonnet-4-5")
+    llama = LiteLLMProvider(api_key="sk-or-x", default_model="meta-llama/llama-3.3-70b-instruct")
+
+    assert "cache_control" in json.dumps(claude._build_kwargs(messages, None, None, 10, 0.1)["messages"])
+    assert llama._build_kwargs(messages, None, None, 10, 0.1)["messages"][0]["content"] == "a"
+
+
+def test_usage_reports_cached_tokens():
+    usage = SimpleNamespace(
+        prompt_tokens=1000, completion_tokens=20, total_tokens=1020,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=900), cache_creation_input_tokens=50,
+    )
+    message = SimpleNamespace(content="ok", tool_calls=None)
+    response = SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=usage)
+
+    parsed = LiteLLMProvider()._parse_response(response)
+    assert parsed.usage["cached_tokens"] == 900
+    assert parsed.usage["cache_creation_tokens"] == 50
+    assert _map_usage({"input_tokens": 10, "output_tokens": 2, "total_tokens": 12,
+                       "input_tokens_details": {"cached_tokens": 8}})["cached_tokens"] == 8
+
+
+def test_codex_cache_key_ignores_volatile_suffix():
+    system = {"role": "system", "content": [{"type": "text", "text": "stable"}, {"type": "text", "text": "mem"}]}
+    a = _prompt_cache_key([system, {"role": "user", "content": "one"}])
+    b = _prompt_cache_key([system, {"role": "user", "content": "two"}])
+    assert a == b
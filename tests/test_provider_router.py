@@ -0,0 +1,104 @@
+import asyncio
+
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
+from nanobot.providers.router import RoutingProvider
+
+
+class FakeBackend(LLMProvider):
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.models: list[str] = []
+        self.cancelled = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.models.append(model)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            return LLMResponse(content="Error calling LLM: 503", finish_reason="error", status_code=503)
+        return LLMResponse(content=self.name)
+
+    def get_default_model(self) -> str:
+        return f"{self.name}/model"
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _router(*backends: FakeBackend, **kwargs) -> RoutingProvider:
+    return RoutingProvider([(b.name, b, f"{b.name}/model") for b in backends], **kwargs)
+
+
+async def test_fails_over_and_takes_failing_backend_out_of_rotation():
+    primary, fallback = FakeBackend("a", fail=True), FakeBackend("b")
+    router = _router(primary, fallback, hedge_after=-1, failure_threshold=2)
+
+    for _ in range(3):
+        assert (await router.chat(MESSAGES)).content == "b"
+
+    assert primary.models == ["a/model", "a/model"]  # Circuit open after two failures
+    assert fallback.models == ["b/model"] * 3
+    stats = {b["name"]: b for b in router.stats()}
+    assert stats["a"]["state"] == "open" and stats["b"]["error_rate"] == 0
+
+
+async def test_routes_to_fastest_measured_backend():
+    slow, fast = FakeBackend("slow", delay=0.03), FakeBackend("fast", delay=0.0)
+    router = _router(slow, fast, hedge_after=-1)
+    router.backends[1].latencies.extend([0.001] * 5)
+
+    await router.chat(MESSAGES)
+    await router.chat(MESSAGES)
+
+    assert slow.models == ["slow/model"]
+    assert fast.models == ["fast/model"]
+    assert [b["name"] for b in router.stats()] == ["fast", "slow"]
+
+
+async def test_hedges_slow_request_and_cancels_the_loser():
+    slow, fast = FakeBackend("slow", delay=1.0), FakeBackend("fast")
+    router = _router(slow, fast, hedge_after=0.02)
+
+    response = await router.chat(MESSAGES)
+    await asyncio.sleep(0)
+
+    assert response.content == "fast"
+    assert slow.cancelled == 1
+    assert router.stats()[0]["hedges"] + router.stats()[1]["hedges"] == 1
+
+
+async def test_bad_request_is_not_failed_over():
+    class Rejecting(FakeBackend):
+        async def chat(self, messages, **kwargs):
+            self.models.append(kwargs.get("model"))
+            return LLMResponse(content="Error calling LLM: too long", finish_reason="error", status_code=400)
+
+    primary, fallback = Rejecting("a"), FakeBackend("b")
+    router = _router(primary, fallback, hedge_after=-1)
+
+    response = await router.chat(MESSAGES)
+
+    assert response.status_code == 400
+    assert fallback.models == []
+
+
+async def test_stream_fails_over_before_output():
+    class Streaming(FakeBackend):
+        async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            response = await self.chat(messages, model=model)
+            if response.finish_reason != "error":
+                yield LLMStreamChunk(delta=self.name)
+            yield LLMStreamChunk(response=response)
+
+    router = _router(Streaming("a", fail=True), Streaming("b"))
+
+    chunks = [c async for c in router.chat_stream(MESSAGES)]
+
+    assert [c.delta for c in chunks[:-1]] == ["b"]
+    assert chunks[-1].response.content == "b"
@@ -0,0 +1,159 @@
+import asyncio
+from types import SimpleNamespace
+
+from nanobot.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    LLMStreamChunk,
+    error_response,
+    parse_retry_after,
+)
+from nanobot.providers.scheduler import (
+    Priority,
+    ProviderScheduler,
+    TokenBucket,
+    current_priority,
+    llm_priority,
+)
+
+
+class FakeProvider(LLMProvider):
+    def __init__(self, responses=None, delay=0.0):
+        super().__init__()
+        self.responses = list(responses or [])
+        self.delay = delay
+        self.calls: list[str] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls.append(messages[-1]["content"])
+        await asyncio.sleep(self.delay)
+        return self.responses.pop(0) if self.responses else LLMResponse(content="ok", usage={"total_tokens": 10})
+
+    def get_default_model(self) -> str:
+        return "fake/model"
+
+
+def _msg(text: str) -> list[dict]:
+    return [{"role": "user", "content": text}]
+
+
+async def test_interactive_requests_jump_the_queue():
+    provider = FakeProvider(delay=0.01)
+    sched = ProviderScheduler(provider, max_concurrency=1)
+
+    async def call(text, priority):
+        with llm_priority(priority):
+            await sched.chat(_msg(text))
+
+    first = asyncio.create_task(call("first", Priority.INTERACTIVE))
+    await asyncio.sleep(0)  # "first" holds the only slot
+    waiting = [
+        asyncio.create_task(call("cron", Priority.BACKGROUND)),
+        asyncio.create_task(call("sub", Priority.SUBAGENT)),
+        asyncio.create_task(call("user", Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    assert sched.stats()["queued"] == {"interactive": 1, "subagent": 1, "background": 1}
+    await asyncio.gather(first, *waiting)
+
+    assert provider.calls == ["first", "user", "sub", "cron"]
+    assert current_priority() is Priority.INTERACTIVE
+    stats = sched.stats()
+    assert stats["requests"] == 4 and stats["active"] == 0
+
+
+async def test_retries_rate_limit_honouring_retry_after():
+    limited = LLMResponse(content="Error calling LLM: 429", finish_reason="error", status_code=429, retry_after=0.05)
+    provider = FakeProvider([limited])
+    sched = ProviderScheduler(provider, max_retries=2)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    response = await sched.chat(_msg("hi"))
+
+    assert response.content == "ok"
+    assert loop.time() - started >= 0.05
+    assert provider.calls == ["hi", "hi"]
+    stats = sched.stats()
+    assert stats["retries"] == 1 and stats["rate_limited"] == 1
+
+
+async def test_client_errors_are_not_retried():
+    bad = LLMResponse(content="Error calling LLM: bad request", finish_reason="error", status_code=400)
+    provider = FakeProvider([bad])
+    sched = ProviderScheduler(provider, base_delay=0.01)
+
+    response = await sched.chat(_msg("hi"))
+
+    assert response.finish_reason == "error"
+    assert provider.calls == ["hi"]
+
+
+async def test_identical_requests_in_flight_are_coalesced():
+    provider = FakeProvider(delay=0.05)
+    sched = ProviderScheduler(provider)
+
+    first, second, other = await asyncio.gather(
+        sched.chat(_msg("hi")), sched.chat(_msg("hi")), sched.chat(_msg("hi"), max_tokens=10),
+    )
+
+    assert first is second and first.content == other.content == "ok"
+    assert provider.calls == ["hi", "hi"]
+    assert sched.stats()["coalesced"] == 1
+    await sched.chat(_msg("hi"))  # Nothing in flight any more
+    assert len(provider.calls) == 3
+
+
+async def test_cancelled_leader_does_not_fail_coalesced_callers():
+    provider = FakeProvider(delay=0.05)
+    sched = ProviderScheduler(provider)
+
+    leader = asyncio.create_task(sched.chat(_msg("hi")))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(sched.chat(_msg("hi")))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert (await follower).content == "ok"
+    assert provider.calls == ["hi", "hi"]
+    assert sched.stats()["active"] == 0
+
+
+async def test_stream_is_retried_only_before_any_output():
+    class StreamProvider(FakeProvider):
+        async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+            response = await self.chat(messages)
+            if response.finish_reason != "error":
+                yield LLMStreamChunk(delta="o")
+            yield LLMStreamChunk(response=response)
+
+    overloaded = LLMResponse(content="Error", finish_reason="error", status_code=529)
+    provider = StreamProvider([overloaded])
+    sched = ProviderScheduler(provider, base_delay=0.01)
+
+    chunks = [c async for c in sched.chat_stream(_msg("hi"))]
+
+    assert [c.delta for c in chunks if not c.response] == ["o"]
+    assert chunks[-1].response.content == "ok"
+    assert provider.calls == ["hi", "hi"]
+
+
+def test_token_bucket_delays_when_empty():
+    bucket = TokenBucket(600)  # 10 per second
+    assert bucket.delay(600) == 0
+    bucket.take(600)
+    assert 0.9 < bucket.delay(10) <= 1.0
+    assert TokenBucket(0).delay(10**9) == 0
+
+
+def test_error_response_keeps_status_and_retry_after():
+    error = Exception("rate limited")
+    error.status_code = 429
+    error.response = SimpleNamespace(headers={"Retry-After": "7"})
+
+    response = error_response(error)
+
+    assert response.finish_reason == "error"
+    assert response.status_code == 429 and response.retry_after == 7.0
+    assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+    assert parse_retry_after({"retry-after": "soon"}) is None
@@ -0,0 +1,73 @@
+from nanobot.agent.tools import filesystem
+from nanobot.agent.tools.filesystem import ReadFileTool
+
+
+def write_lines(path, count: int) -> None:
+    path.write_text("".join(f"line {i}\n" for i in range(1, count + 1)))
+
+
+async def test_small_file_is_returned_verbatim(tmp_path):
+    path = tmp_path / "notes.md"
+    path.write_text("# Notes\nhello\n")
+
+    assert await ReadFileTool().execute(str(path)) == "# Notes\nhello\n"
+
+
+async def test_ranged_read_returns_numbered_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(filesystem, "_INDEX_STRIDE", 7)  # exercise checkpoint seeking
+    path = tmp_path / "data.txt"
+    write_lines(path, 100)
+    tool = ReadFileTool()
+
+    result = await tool.execute(str(path), offset=20, limit=3)
+    assert result.splitlines() == [
+        "[Lines 20-22 of 100 in data.txt; continue with offset=23]",
+        "    20\tline 20",
+        "    21\tline 21",
+        "    22\tline 22",
+    ]
+    assert (await tool.execute(str(path), offset=99)).splitlines()[0] == "[Lines 99-100 of 100 in data.txt]"
+    assert "past the end" in await tool.execute(str(path), offset=101)
+
+
+async def test_large_file_is_paged_by_bytes(tmp_path):
+    path = tmp_path / "big.log"
+    write_lines(path, 50_000)
+
+    result = await ReadFileTool(max_bytes=1000).execute(str(path))
+
+    assert result.startswith("[Lines 1-")
+    assert "of 50000 in big.log; continue with offset=" in result.splitlines()[0]
+    assert len(result) < 1200
+
+
+async def test_page_limit_counts_utf8_bytes(tmp_path):
+    path = tmp_path / "cjk.txt"
+    path.write_text("".join(f"第{i}行：你好世界\n" for i in range(5000)), encoding="utf-8")
+
+    result = await ReadFileTool(max_bytes=1000).execute(str(path))
+    body = result.split("\n", 1)[1]
+    assert 800 < len(body.encode("utf-8")) <= 1000
+
+    path.write_text("世" * 2000, encoding="utf-8")
+    line = (await ReadFileTool(max_bytes=1000).execute(str(path), offset=1)).splitlines()[1]
+    assert len(line.removesuffix(" ... (line truncated)").encode("utf-8")) <= 1000
+
+
+async def test_line_index_is_rebuilt_when_file_changes(tmp_path):
+    path = tmp_path / "grow.txt"
+    write_lines(path, 10)
+    tool = ReadFileTool()
+    assert "of 10 in" in await tool.execute(str(path), offset=1, limit=1)
+
+    write_lines(path, 12)
+    assert "of 12 in" in await tool.execute(str(path), offset=1, limit=1)
+
+
+async def test_binary_files_are_refused(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" + bytes(5000))
+
+    result = await ReadFileTool().execute(str(path))
+
+    assert result.startswith("Error:") and "binary file" in result
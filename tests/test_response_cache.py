@@ -0,0 +1,106 @@
+import asyncio
+import sqlite3
+import time
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.cache import CachingProvider, ResponseCache, force_response_cache
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        if messages[-1]["content"] == "fail":
+            return LLMResponse(content="Error calling LLM: boom", finish_reason="error", status_code=500)
+        return LLMResponse(
+            content=f"answer {self.calls}",
+            tool_calls=[ToolCallRequest(id="call_1", name="read_file", arguments={"path": "a.txt"})],
+            usage={"total_tokens": 12},
+        )
+
+    def get_default_model(self) -> str:
+        return "fake/model"
+
+
+def _msg(text: str) -> list[dict]:
+    return [{"role": "user", "content": text}]
+
+
+async def test_caches_deterministic_calls_only(tmp_path):
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "llm.db"))
+
+    first = await provider.chat(_msg("hi"), temperature=0)
+    again = await provider.chat(_msg("hi"), temperature=0)
+    other = await provider.chat(_msg("hi"), temperature=0, max_tokens=10)
+    sampled = await provider.chat(_msg("hi"), temperature=0.7)
+
+    assert again.content == first.content == "answer 1"
+    assert again.tool_calls[0].arguments == {"path": "a.txt"}
+    assert other.content == "answer 2" and sampled.content == "answer 3"
+    assert inner.calls == 3
+    stats = provider.cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+    assert provider.bypassed == 1
+
+
+async def test_forced_task_caches_any_temperature_but_not_errors(tmp_path):
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "llm.db"))
+
+    async def consolidate(text):
+        force_response_cache()
+        return await provider.chat(_msg(text), temperature=0.7)
+
+    assert (await asyncio.create_task(consolidate("hi"))).content == "answer 1"
+    assert (await asyncio.create_task(consolidate("hi"))).content == "answer 1"
+    await asyncio.create_task(consolidate("fail"))
+    await asyncio.create_task(consolidate("fail"))
+    await provider.chat(_msg("hi"), temperature=0.7)  # Not forced outside those tasks
+
+    assert inner.calls == 4
+
+
+async def test_cached_stream_replays_content(tmp_path):
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "llm.db"), force=True)
+
+    await provider.chat(_msg("hi"))
+    chunks = [c async for c in provider.chat_stream(_msg("hi"))]
+
+    assert chunks[0].delta == "answer 1"
+    assert chunks[-1].response.content == "answer 1"
+    assert inner.calls == 1
+
+
+async def test_locked_database_is_a_fast_miss(tmp_path):
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "llm.db", timeout=0.1))
+    other = sqlite3.connect(tmp_path / "llm.db")
+    other.execute("BEGIN EXCLUSIVE")  # What a purge from the CLI holds
+
+    started = time.monotonic()
+    assert (await provider.chat(_msg("hi"), temperature=0)).content == "answer 1"
+    assert time.monotonic() - started < 1
+    other.rollback()
+    other.close()
+
+
+def test_lru_eviction_ttl_and_purge(tmp_path):
+    cache = ResponseCache(tmp_path / "llm.db", ttl=60, max_entries=2)
+    for key in "abc":
+        cache.put(key, "m", LLMResponse(content=key))
+
+    assert cache.get("a") is None
+    assert cache.get("c").content == "c"
+    assert cache.stats()["entries"] == 2
+
+    cache.ttl = 0
+    assert cache.get("c") is None
+    assert cache.purge(expired_only=True) == 2
+    assert cache.stats() == {"entries": 0, "size": 0, "hits": 1, "misses": 2, "hit_rate": 1 / 3}
+    cache.purge()
+    assert cache.stats()["hits"] == 0
@@ -0,0 +1,89 @@
+import os
+
+from nanobot.agent.tools.search import SearchFilesTool, WorkspaceIndex
+
+
+def make_workspace(root):
+    (root / "memory").mkdir()
+    (root / "memory" / "HISTORY.md").write_text(
+        "[2026-01-02 10:00] Planned the launch meeting.\n"
+        "[2026-01-03 09:00] Deadline moved to Friday.\n"
+        "[2026-01-04 12:00] Meeting notes shared with Alice.\n"
+    )
+    (root / "notes.txt").write_text("alpha\nbeta\nmeeting room booked\ngamma\ndelta\n")
+    (root / "blob.bin").write_bytes(b"meeting\x00\x01\x02")
+    (root / ".git").mkdir()
+    (root / ".git" / "config").write_text("meeting")
+
+
+async def test_matches_are_ranked_with_context(tmp_path):
+    make_workspace(tmp_path)
+    tool = SearchFilesTool(workspace=tmp_path)
+
+    result = await tool.execute("meeting", context=1)
+
+    lines = result.splitlines()
+    assert lines[0] == "3 matching lines in 2 files"
+    assert lines[2] == "memory/HISTORY.md (2 shown)"  # most matches first
+    assert "1: [2026-01-02 10:00] Planned the launch meeting." in result
+    assert "2- [2026-01-03 09:00] Deadline moved to Friday." in result
+    assert "3: [2026-01-04 12:00] Meeting notes shared with Alice." in result
+    assert "2- beta\n3: meeting room booked\n4- gamma" in result
+    assert "blob.bin" not in result and ".git" not in result
+
+
+async def test_path_glob_and_regex_filters(tmp_path):
+    make_workspace(tmp_path)
+    tool = SearchFilesTool(workspace=tmp_path)
+
+    result = await tool.execute("meeting|deadline", regex=True, path="memory", context=0)
+    assert result.startswith("3 matching lines in 1 files")
+
+    assert (await tool.execute("meeting", glob="*.txt")).startswith("1 matching lines in 1 files")
+    assert (await tool.execute("nowhere")).startswith("No matches")
+    assert "Invalid regex" in await tool.execute("(", regex=True)
+
+
+async def test_index_follows_file_changes(tmp_path):
+    make_workspace(tmp_path)
+    index = WorkspaceIndex(tmp_path, tmp_path / ".nanobot" / "search_index.db")
+
+    assert index.refresh()["indexed"] == 3  # binary file is recorded but holds no text
+    assert index.refresh()["indexed"] == 0
+
+    notes = tmp_path / "notes.txt"
+    notes.write_text("rewritten without the word\n")
+    os.utime(notes, ns=(1, 1))
+    (tmp_path / "blob.bin").unlink()
+    assert index.refresh() == {"indexed": 1, "removed": 1, "files": 2}
+    assert [path for path, _ in index.candidates("meeting")] == ["memory/HISTORY.md"]
+    index.close()
+
+
+async def test_paths_outside_the_workspace_are_rejected(tmp_path):
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    tool = SearchFilesTool(workspace=workspace, allowed_dir=workspace)
+
+    assert (await tool.execute("x", path="../")).startswith("Error")
+
+
+async def test_regex_prefilter_keeps_optional_characters_out(tmp_path):
+    (tmp_path / "a.txt").write_text("favourite color\n")
+    tool = SearchFilesTool(workspace=tmp_path)
+
+    assert (await tool.execute("colou?r", regex=True)).startswith("1 matching lines in 1 files")
+    assert (await tool.execute("favou?rites? colou*r", regex=True)).startswith("1 matching lines")
+    assert await tool.execute("colou?rs", regex=True) == "No matches for: colou?rs"
+
+
+async def test_symlinks_out_of_the_workspace_are_not_indexed(tmp_path):
+    workspace = tmp_path / "ws"
+    workspace.mkdir()
+    (tmp_path / "secret.txt").write_text("private key material\n")
+    (workspace / "link.txt").symlink_to(tmp_path / "secret.txt")
+    (workspace / "notes.txt").write_text("public key notes\n")
+    tool = SearchFilesTool(workspace=workspace, allowed_dir=workspace)
+
+    result = await tool.execute("key")
+    assert result.startswith("1 matching lines in 1 files") and "private" not in result
@@ -0,0 +1,107 @@
+"""Tests for session storage backends."""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from nanobot.cli.commands import app
+from nanobot.config.schema import Config
+from nanobot.session import JsonlSessionStore, Session, SessionManager, SQLiteSessionStore
+
+
+def make_session(key: str, count: int) -> Session:
+    session = Session(key=key)
+    for i in range(count):
+        session.add_message("user", f"msg{i}")
+    return session
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SQLiteSessionStore(tmp_path / "sessions.db")
+    yield store
+    store.close()
+
+
+def test_sqlite_roundtrip_appends_rows(sqlite_store):
+    session = make_session("telegram:1", 5)
+    session.metadata["lang"] = "en"
+    sqlite_store.save(session)
+    session.add_message("assistant", "msg5")
+    session.last_consolidated = 2
+    sqlite_store.save(session)
+
+    loaded = sqlite_store.load("telegram:1")
+    assert [m["content"] for m in loaded.messages] == [f"msg{i}" for i in range(6)]
+    assert loaded.metadata == {"lang": "en"}
+    assert loaded.last_consolidated == 2
+    assert sqlite_store.load("telegram:missing") is None
+
+
+def test_sqlite_tail_load_and_prefix(sqlite_store):
+    sqlite_store.save(make_session("cli:tail", 100))
+
+    session = sqlite_store.load("cli:tail", tail=10)
+    assert session.message_count == 100
+    assert session.messages[0]["content"] == "msg90"
+    assert [m["content"] for m in session.window(40, 43)] == ["msg40", "msg41", "msg42"]
+
+    session.add_message("user", "msg100")
+    sqlite_store.save(session)
+    assert [m["content"] for m in sqlite_store.load("cli:tail").messages] == [f"msg{i}" for i in range(101)]
+
+
+def test_sqlite_clear_replaces_rows(sqlite_store):
+    session = make_session("cli:clear", 10)
+    sqlite_store.save(session)
+    session.clear()
+    session.add_message("user", "fresh")
+    sqlite_store.save(session)
+
+    assert [m["content"] for m in sqlite_store.load("cli:clear").messages] == ["fresh"]
+
+
+def test_sqlite_list_and_purge(sqlite_store):
+    old = make_session("cli:old", 2)
+    old.updated_at = datetime.now() - timedelta(days=40)
+    sqlite_store.save(old)
+    sqlite_store.save(make_session("cli:new", 2))
+
+    assert [s["key"] for s in sqlite_store.list_sessions()] == ["cli:new", "cli:old"]
+    assert sqlite_store.purge(datetime.now() - timedelta(days=30)) == 1
+    assert [s["key"] for s in sqlite_store.list_sessions()] == ["cli:new"]
+    assert sqlite_store.load("cli:old") is None
+
+
+def test_manager_with_sqlite_store(tmp_path, sqlite_store):
+    manager = SessionManager(tmp_path, store=sqlite_store, tail_window=5)
+    session = manager.get_or_create("slack:C1")
+    for i in range(8):
+        session.add_message("user", f"msg{i}")
+    manager.save(session)
+    manager.invalidate("slack:C1")
+
+    reloaded = manager.get_or_create("slack:C1")
+    assert reloaded.message_count == 8
+    assert len(reloaded.messages) == 5
+
+
+def test_migrate_command_imports_jsonl_sessions(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    jsonl = JsonlSessionStore(tmp_path / ".nanobot" / "sessions")
+    jsonl.save(make_session("telegram:42", 3))
+    db_path = tmp_path / "migrated.db"
+
+    with patch("nanobot.config.loader.load_config", return_value=Config()):
+        result = CliRunner().invoke(app, ["sessions", "migrate", "--db", str(db_path)])
+        again = CliRunner().invoke(app, ["sessions", "migrate", "--db", str(db_path)])
+
+    assert result.exit_code == 0
+    assert "Imported 1 session" in result.stdout
+    assert "Imported 0 session" in again.stdout
+    store = SQLiteSessionStore(Path(db_path))
+    assert [m["content"] for m in store.load("telegram:42").messages] == ["msg0", "msg1", "msg2"]
+    store.close()
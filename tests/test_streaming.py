@@ -0,0 +1,192 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.discord import DiscordChannel
+from nanobot.channels.feishu import FeishuChannel
+from nanobot.channels.slack import SlackChannel
+from nanobot.config.schema import DiscordConfig, FeishuConfig, SlackConfig
+from nanobot.providers.base import LLMProvider, LLMResponse, LLMStreamChunk
+
+
+class StreamingProvider(LLMProvider):
+    """Provider that streams a fixed reply word by word."""
+
+    def __init__(self, words: list[str]):
+        super().__init__()
+        self.words = words
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        return LLMResponse(content="".join(self.words))
+
+    async def chat_stream(self, messages: list[dict[str, Any]], **kwargs: Any) -> AsyncIterator[LLMStreamChunk]:
+        for word in self.words:
+            yield LLMStreamChunk(delta=word)
+        yield LLMStreamChunk(response=LLMResponse(content="".join(self.words)))
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+class PlainProvider(LLMProvider):
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        return LLMResponse(content="whole reply")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+async def test_default_chat_stream_wraps_chat() -> None:
+    chunks = [c async for c in PlainProvider().chat_stream(messages=[])]
+    assert len(chunks) == 1
+    assert chunks[0].delta == "whole reply"
+    assert chunks[0].response.content == "whole reply"
+
+
+async def test_agent_publishes_partials_then_final(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    loop = AgentLoop(
+        bus=MessageBus(),
+        provider=StreamingProvider(["Hel", "lo ", "there"]),
+        workspace=Path(workspace),
+        stream=True,
+        stream_interval=0,
+    )
+    runner = asyncio.create_task(loop.run())
+    await loop.bus.publish_inbound(InboundMessage("telegram", "u", "42", "hi"))
+
+    updates = []
+    while not updates or updates[-1].partial:
+        updates.append(await asyncio.wait_for(loop.bus.consume_outbound(), 5))
+    await loop.stop()
+    await runner
+
+    assert [u.content for u in updates] == ["Hel", "Hello ", "Hello there", "Hello there"]
+    assert [u.partial for u in updates] == [True, True, True, False]
+    assert len({u.stream_id for u in updates}) == 1
+    assert updates[0].stream_id is not None
+
+
+class FailingStreamProvider(StreamingProvider):
+    async def chat_stream(self, messages: list[dict[str, Any]], **kwargs: Any) -> AsyncIterator[LLMStreamChunk]:
+        yield LLMStreamChunk(delta="Hel")
+        raise RuntimeError("connection reset")
+
+
+async def test_error_reply_replaces_the_stream_preview(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    loop = AgentLoop(
+        bus=MessageBus(),
+        provider=FailingStreamProvider([]),
+        workspace=Path(workspace),
+        stream=True,
+        stream_interval=0,
+    )
+    runner = asyncio.create_task(loop.run())
+    await loop.bus.publish_inbound(InboundMessage("telegram", "u", "42", "hi"))
+
+    updates = []
+    while not updates or updates[-1].partial:
+        updates.append(await asyncio.wait_for(loop.bus.consume_outbound(), 5))
+    await loop.stop()
+    await runner
+
+    assert updates[0].partial and updates[-1].content.startswith("Sorry, I encountered an error")
+    assert updates[-1].stream_id == updates[0].stream_id is not None
+
+
+class FakeDiscordHttp:
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+
+    async def _respond(self, method: str, url: str, status: int = 200) -> SimpleNamespace:
+        self.calls.append((method, url.rsplit("/", 1)[-1]))
+        return SimpleNamespace(status_code=status, raise_for_status=lambda: None, json=lambda: {"id": "p1"})
+
+    async def post(self, url, **kwargs):
+        return await self._respond("post", url)
+
+    async def patch(self, url, **kwargs):
+        return await self._respond("patch", url)
+
+    async def delete(self, url, **kwargs):
+        return await self._respond("delete", url)
+
+
+async def test_discord_replaces_preview_when_final_reply_is_too_long() -> None:
+    channel = DiscordChannel(DiscordConfig(token="t"), MessageBus())
+    channel._http = http = FakeDiscordHttp()
+
+    await channel.send(OutboundMessage("discord", "c1", "partial", stream_id="s", partial=True))
+    await channel.send(OutboundMessage("discord", "c1", "x" * 2500, stream_id="s"))
+
+    assert http.calls == [("post", "messages"), ("delete", "p1"), ("post", "messages")]
+
+
+class FakeSlackClient:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    async def chat_postMessage(self, **kwargs):  # noqa: N802 - mirrors the Slack SDK
+        self.calls.append("post")
+        return {"ts": "1.0"}
+
+    async def chat_update(self, **kwargs):
+        self.calls.append("update")
+        if not kwargs["text"].startswith("partial"):
+            raise RuntimeError("msg_too_long")
+
+    async def chat_delete(self, **kwargs):
+        self.calls.append(f"delete {kwargs['ts']}")
+
+
+async def test_slack_deletes_preview_when_final_update_fails() -> None:
+    channel = SlackChannel(SlackConfig(), MessageBus())
+    channel._web_client = client = FakeSlackClient()
+
+    await channel.send(OutboundMessage("slack", "C1", "partial", stream_id="s", partial=True))
+    await channel.send(OutboundMessage("slack", "C1", "final", stream_id="s"))
+
+    assert client.calls == ["post", "update", "delete 1.0", "post"]
+
+
+class FakeFeishuMessages:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def _response(self, ok: bool = True) -> SimpleNamespace:
+        return SimpleNamespace(
+            success=lambda: ok, code=0 if ok else 230001, msg="", get_log_id=lambda: "",
+            data=SimpleNamespace(message_id="om_1"),
+        )
+
+    def create(self, request):
+        self.calls.append("create")
+        return self._response()
+
+    def patch(self, request):
+        self.calls.append("patch")
+        return self._response(ok=False)
+
+    def delete(self, request):
+        self.calls.append(f"delete {request.message_id}")
+        return self._response()
+
+
+async def test_feishu_deletes_preview_when_final_patch_fails() -> None:
+    channel = FeishuChannel(FeishuConfig(), MessageBus())
+    messages = FakeFeishuMessages()
+    channel._client = SimpleNamespace(im=SimpleNamespace(v1=SimpleNamespace(message=messages)))
+
+    await channel.send(OutboundMessage("feishu", "oc_1", "partial", stream_id="s", partial=True))
+    await channel.send(OutboundMessage("feishu", "oc_1", "final", stream_id="s"))
+
+    assert messages.calls == ["create", "patch", "delete om_1", "create"]
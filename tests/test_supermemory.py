@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("supermemory")
+
+from nanobot.agent.super_memory import SupermemoryStore
+from nanobot.config.schema import SupermemoryConfig
+from nanobot.utils.breaker import CircuitBreaker
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls: list[dict] = []
+        self.fail = False
+        self.delay = 0.0
+
+    async def profile(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("api down")
+        return SimpleNamespace(
+            profile=SimpleNamespace(static=["Likes tea"], dynamic=["Planning a trip"]),
+            search_results=SimpleNamespace(results=[{"memory": [f"about {kwargs.get('q')}"]}]),
+        )
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    config = SupermemoryConfig(api_key="k", timeout=0.2, profile_ttl=60, cache_size=2, failure_threshold=2)
+    store = SupermemoryStore(workspace, config=config)
+    store.supermemory_client = FakeClient()
+    (workspace / "memory" / "MEMORY.md").write_text("local facts")
+    return store
+
+
+async def test_query_results_and_profile_are_cached(store):
+    first = await store.get_context("flights")
+    assert "about flights" in first and "Likes tea" in first
+    assert await store.get_context("flights") == first
+    assert "Planning a trip" in await store.get_user_long_term_memory()
+    assert len(store.supermemory_client.calls) == 1  # profile reused from the query response
+
+    await store.get_context("hotels")
+    await store.get_context("trains")
+    await store.get_context("flights")  # evicted from the 2-entry LRU
+    assert len(store.supermemory_client.calls) == 4
+
+
+async def test_breaker_fails_fast_to_local_memory(store):
+    client = store.supermemory_client
+    client.delay = 1.0  # slower than the timeout
+
+    assert await store.get_context("a") == "## Long-term Memory\nlocal facts"
+    client.fail, client.delay = True, 0.0
+    assert await store.get_context("b") == "## Long-term Memory\nlocal facts"
+    assert store.breaker.state == "open"
+
+    client.fail = False
+    assert await store.get_context("c") == "## Long-term Memory\nlocal facts"
+    assert len(client.calls) == 2  # open circuit: no API call
+
+
+def test_circuit_breaker_half_open_trial(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("nanobot.utils.breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] += 10
+    assert breaker.allow() and not breaker.allow()  # one trial call at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+    now[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+async def test_cancelled_trial_call_releases_the_breaker(store, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("nanobot.utils.breaker.time.monotonic", lambda: now[0])
+    store.breaker.record_failure()
+    store.breaker.record_failure()
+    now[0] += store.breaker.reset_timeout
+
+    task = asyncio.create_task(store._call("profile", lambda: asyncio.sleep(10)))
+    await asyncio.sleep(0)
+    assert store.breaker.state == "half-open"
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert await store._call("profile", lambda: asyncio.sleep(0, "ok")) == "ok"
+    assert store.breaker.state == "closed"
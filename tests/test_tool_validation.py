@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
@@ -86,3 +87,51 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+class SleepTool(Tool):
+    def __init__(self, name: str, parallel_safe: bool, log: list[str]):
+        self._name = name
+        self.parallel_safe = parallel_safe
+        self._log = log
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "sleeps"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"tag": {"type": "string"}}}
+
+    async def execute(self, tag: str = "", **kwargs: Any) -> str:
+        self._log.append(f"start {tag}")
+        await asyncio.sleep(0.05)
+        self._log.append(f"end {tag}")
+        return f"{self._name}:{tag}"
+
+
+async def test_execute_many_runs_parallel_safe_calls_concurrently() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(SleepTool("read", True, log))
+    results = await reg.execute_many([("read", {"tag": "a"}), ("read", {"tag": "b"})])
+    assert results == ["read:a", "read:b"]
+    assert log[:2] == ["start a", "start b"]
+
+
+async def test_execute_many_keeps_serial_tools_ordered() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(SleepTool("read", True, log))
+    reg.register(SleepTool("write", False, log))
+    results = await reg.execute_many([
+        ("read", {"tag": "a"}),
+        ("write", {"tag": "b"}),
+        ("read", {"tag": "c"}),
+    ])
+    assert results == ["read:a", "write:b", "read:c"]
+    assert log == ["start a", "end a", "start b", "end b", "start c", "end c"]
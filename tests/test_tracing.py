@@ -0,0 +1,131 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.utils.tracing import (
+    JsonlSpanExporter,
+    Span,
+    Tracer,
+    current_span,
+    get_tracer,
+    set_tracer,
+)
+
+
+class MemorySink:
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def close(self) -> None:
+        pass
+
+    def by_name(self, name: str) -> list[Span]:
+        return [s for s in self.spans if s.name == name]
+
+
+class ToolThenAnswer(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages: list[dict[str, Any]], **kwargs: Any) -> LLMResponse:
+        self.calls += 1
+        usage = {"prompt_tokens": 100, "completion_tokens": 10, "total_tokens": 110}
+        if self.calls == 1:
+            call = ToolCallRequest(id="c1", name="list_dir", arguments={"path": "."})
+            return LLMResponse(content=None, tool_calls=[call], usage=usage)
+        return LLMResponse(content="done", usage=usage)
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+@pytest.fixture
+def sink():
+    previous = get_tracer()
+    sink = MemorySink()
+    set_tracer(Tracer([sink]))
+    yield sink
+    set_tracer(previous)
+
+
+async def test_spans_nest_across_tasks(sink):
+    tracer = get_tracer()
+    with tracer.span("turn", session="s") as turn:
+        async def child():
+            with tracer.span("memory_fetch"):
+                await asyncio.sleep(0)
+
+        await asyncio.create_task(child())
+        tracer.record("queue_wait", turn.start - 0.5)
+        assert current_span() is turn
+
+    memory, wait, root = sink.spans
+    assert root.name == "turn" and root.parent_id is None
+    assert memory.parent_id == wait.parent_id == root.span_id
+    assert {memory.trace_id, wait.trace_id} == {root.trace_id}
+    assert wait.duration >= 0.5
+    assert current_span() is None
+
+
+def test_failed_span_is_marked_and_disabled_tracer_is_noop(sink):
+    with pytest.raises(ValueError):
+        with get_tracer().span("tool"):
+            raise ValueError("boom")
+    assert sink.spans[0].status == "error"
+
+    with Tracer().span("ignored") as span:
+        span.set(anything=1)
+    assert span.attributes == {}
+
+
+def test_jsonl_exporter_writes_one_line_per_span(tmp_path):
+    tracer = Tracer([JsonlSpanExporter(tmp_path / "logs")])
+    with tracer.span("turn"):
+        with tracer.span("llm", model="m") as span:
+            span.set(prompt_tokens=5)
+    tracer.close()
+
+    (log,) = (tmp_path / "logs").glob("spans-*.jsonl")
+    llm, turn = [json.loads(line) for line in log.read_text().splitlines()]
+    assert llm["attributes"] == {"model": "m", "prompt_tokens": 5}
+    assert llm["parent_id"] == turn["span_id"]
+
+
+async def test_agent_turn_is_instrumented(sink, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    loop = AgentLoop(bus=MessageBus(), provider=ToolThenAnswer(), workspace=Path(workspace))
+
+    assert await loop.process_direct("hi", session_key="cli:t") == "done"
+
+    (turn,) = sink.by_name("turn")
+    names = {s.name for s in sink.spans if s.trace_id == turn.trace_id}
+    assert {"queue_wait", "session_load", "prompt_build", "memory_fetch", "llm", "tool", "session_save"} <= names
+    first, second = sink.by_name("llm")
+    assert first.attributes["tool_calls"] == 1 and second.attributes["prompt_tokens"] == 100
+    assert sink.by_name("tool")[0].attributes["tool"] == "list_dir"
+    assert turn.attributes["iterations"] == 2 and turn.attributes["total_tokens"] == 220
+
+
+def test_otel_exporter_replays_a_trace():
+    pytest.importorskip("opentelemetry")
+    from nanobot.utils.tracing import OTelSpanExporter
+
+    exporter = OTelSpanExporter()
+    tracer = Tracer([exporter])
+    with tracer.span("turn"):
+        with tracer.span("llm"):
+            pass
+        assert exporter._count == 1
+    assert exporter._pending == {} and exporter._count == 0
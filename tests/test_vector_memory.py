@@ -0,0 +1,83 @@
+import numpy as np
+
+from nanobot.agent.vector_memory import (
+    HashingEmbedder,
+    VectorMemoryStore,
+    chunk_history,
+    chunk_memory,
+)
+
+MEMORY = """# Long-term Memory
+
+## Preferences
+User prefers green tea and dark mode.
+
+## Projects
+The billing service uses Postgres and OAuth2.
+"""
+
+
+def make_store(workspace, **kwargs) -> VectorMemoryStore:
+    store = VectorMemoryStore(workspace, **kwargs)
+    store.write_long_term(MEMORY)
+    store.append_history("[2026-01-02 10:00] Booked flights to Lisbon for the conference.")
+    store.append_history("[2026-01-05 16:30] Fixed the Postgres migration in billing.")
+    store.append_history("[2026-01-09 08:15] Discussed the garden redesign with Alice.")
+    return store
+
+
+def test_chunking_splits_sections_and_entries():
+    assert chunk_memory(MEMORY, 800) == [
+        "# Long-term Memory\n## Preferences\nUser prefers green tea and dark mode.",
+        "## Projects\nThe billing service uses Postgres and OAuth2.",
+    ]
+    assert chunk_history("a\n\nb\n\n\n\nc\n\n", 800) == ["a", "b", "c"]
+    assert all(len(c) <= 20 for c in chunk_history("x" * 50, 20))
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    vectors = HashingEmbedder(256)(["green tea", "green tea", ""])
+    assert np.allclose(vectors[0], vectors[1])
+    assert np.isclose(np.linalg.norm(vectors[0]), 1.0)
+    assert not vectors[2].any()
+
+
+async def test_context_contains_only_relevant_chunks(tmp_path):
+    store = make_store(tmp_path, top_k=2)
+
+    context = await store.get_context("any news on the billing Postgres setup?")
+
+    assert "Postgres and OAuth2" in context
+    assert "Postgres migration" in context
+    assert "green tea" not in context and "Lisbon" not in context
+    assert context.index("Long-term Memory") < context.index("Related History")
+
+
+async def test_context_without_query_is_bounded(tmp_path):
+    store = make_store(tmp_path, top_k=1)
+    context = await store.get_context(None)
+    assert context.startswith("## Long-term Memory\n# Long-term Memory\n## Preferences")
+    assert "Projects" not in context
+
+
+def test_only_new_entries_are_embedded(tmp_path):
+    calls: list[int] = []
+    embedder = HashingEmbedder(128)
+
+    def counting(texts):
+        calls.append(len(texts))
+        return embedder(texts)
+
+    counting.name = embedder.name
+    store = make_store(tmp_path, embedder=counting)
+    store.refresh()
+    assert calls == [5]
+
+    store.append_history("[2026-01-10 09:00] Renewed the passport.")
+    assert store.search("passport")[0][1]["text"].endswith("Renewed the passport.")
+    assert calls == [5, 1, 1]  # one new chunk, then the query
+
+    reloaded = VectorMemoryStore(tmp_path, embedder=counting)
+    reloaded.refresh()
+    assert calls == [5, 1, 1]  # vectors loaded from memory/.index
+    assert (tmp_path / "memory" / ".index" / "vectors.npy").exists()
@@ -0,0 +1,99 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.agent.tools.web_cache import WebCache, cache_ttl, normalize_url
+from nanobot.utils.http import HttpPool
+
+PAGE = b"<html><head><title>Doc</title></head><body><article><p>" + b"cached body " * 50 + b"</p></article></body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits: list[str] = []
+    cache_control = "max-age=60"
+
+    def do_GET(self):
+        type(self).hits.append(self.headers.get("If-None-Match") or "full")
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Cache-Control", type(self).cache_control)
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.hits = []
+    _Handler.cache_control = "max-age=60"
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_cache_ttl_honours_cache_control():
+    assert cache_ttl({}, 100) == 100
+    assert cache_ttl({"cache-control": "public, max-age=30"}, 100) == 30
+    assert cache_ttl({"cache-control": "no-cache"}, 100) == 0
+    assert cache_ttl({"cache-control": "no-store"}, 100) is None
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.COM:443/a?b=1#frag") == "https://example.com/a?b=1"
+    assert normalize_url("http://example.com:8080") == "http://example.com:8080/"
+
+
+async def test_disk_tier_survives_restart_and_prunes(tmp_path):
+    cache = WebCache(tmp_path, max_entries=2, max_disk_bytes=2000)
+    await cache.put("a", {"text": "x" * 600})
+    await cache.put("b", {"text": "y" * 600})
+
+    reopened = WebCache(tmp_path)
+    assert (await reopened.get("a")).value == {"text": "x" * 600}
+
+    time.sleep(0.01)
+    await cache.put("c", {"text": "z" * 600})  # over the cap: oldest file goes
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert await WebCache(tmp_path).get("a") is None
+
+
+async def test_fetch_is_served_from_cache_across_max_chars(server, tmp_path):
+    cache = WebCache(tmp_path)
+    tool = WebFetchTool(http=HttpPool(http2=False), cache=cache)
+
+    first = json.loads(await tool.execute(f"{server}/doc#intro"))
+    second = json.loads(await tool.execute(f"{server}/doc", maxChars=100))
+
+    assert _Handler.hits == ["full"]
+    assert second["truncated"] and second["text"] == first["text"][:100]
+    assert cache.stats["hits"] == 1
+
+
+async def test_stale_entry_is_revalidated_with_etag(server, tmp_path):
+    _Handler.cache_control = "no-cache"
+    cache = WebCache(tmp_path)
+    tool = WebFetchTool(http=HttpPool(http2=False), cache=cache)
+
+    first = json.loads(await tool.execute(f"{server}/doc"))
+    second = json.loads(await tool.execute(f"{server}/doc"))
+
+    assert _Handler.hits == ["full", '"v1"']
+    assert second["text"] == first["text"] and "cached body" in second["text"]
+    assert cache.stats["revalidated"] == 1
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from nanobot.agent.tools import web
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.utils.html_extract import extract_html
+from nanobot.utils.http import HttpPool
+
+PARAGRAPH = b"<p>Readable paragraph with enough words to count as content for readability scoring.</p>\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    paragraphs = 10
+
+    def do_GET(self):
+        body = (b"<html><head><title>Big</title></head><body><article>"
+                + PARAGRAPH * type(self).paragraphs + b"</article></body></html>")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client stopped reading at its byte limit
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+async def test_download_stops_at_byte_limit(server):
+    _Handler.paragraphs = 20_000  # ~1.7MB
+    tool = WebFetchTool(http=HttpPool(http2=False), max_bytes=50_000)
+
+    result = json.loads(await tool.execute(f"{server}/big", extractMode="text"))
+
+    assert result["truncated"] is True
+    assert result["extractor"] == "readability"
+    assert "Readable paragraph" in result["text"]
+    assert result["length"] < 50_000
+
+
+async def test_large_pages_are_extracted_off_the_event_loop(server, monkeypatch):
+    _Handler.paragraphs = 2_000
+    monkeypatch.setattr(web, "_INLINE_EXTRACT_CHARS", 1024)
+    tool = WebFetchTool(http=HttpPool(http2=False))
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    try:
+        result = json.loads(await tool.execute(f"{server}/big", maxChars=1_000_000))
+    finally:
+        task.cancel()
+        web._reset_extract_pool()
+
+    assert result["text"].startswith("# Big")
+    assert result["text"].count("Readable paragraph") == 2_000
+    assert ticks > 1
+
+
+def test_extract_html_matches_markdown_output():
+    html = "<html><head><title>T</title></head><body><article><h2>Head</h2>" + PARAGRAPH.decode() * 5 + "</article></body></html>"
+    text = extract_html(html, "markdown")
+    assert text.startswith("# T\n\n")
+    assert "## Head" in text